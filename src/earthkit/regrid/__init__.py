@@ -17,18 +17,44 @@ except ImportError:  # pragma: no cover
 
 
 from .interpolate import interpolate
+from .prefetch import prefetch
+from .regrid import aregrid
 from .regrid import regrid
-from .utils.caching import CACHE as cache
-from .utils.config import CONFIG as config
-from .utils.memcache import clear_memory_cache
-from .utils.memcache import memory_cache_info
+
+# these objects are only created on first access. Creating them reads the
+# config file and starts the cache, which would slow down the import.
+_LAZY = {
+    "cache": (".utils.caching", "CACHE"),
+    "config": (".utils.config", "CONFIG"),
+    "clear_memory_cache": (".utils.memcache", "clear_memory_cache"),
+    "memory_cache_info": (".utils.memcache", "memory_cache_info"),
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        from importlib import import_module
+
+        module, attr = _LAZY[name]
+        value = getattr(import_module(module, package=__name__), attr)
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
+
 
 __all__ = [
+    "aregrid",
     "cache",
     "clear_memory_cache",
     "config",
     "interpolate",
     "memory_cache_info",
+    "prefetch",
     "regrid",
     "__version__",
 ]
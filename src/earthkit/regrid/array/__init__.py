@@ -8,4 +8,5 @@
 #
 #
 
+from .regrid import aregrid
 from .regrid import regrid
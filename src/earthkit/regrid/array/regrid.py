@@ -21,3 +21,25 @@ def regrid(values, in_grid=None, out_grid=None, *, interpolation="linear", backe
     return h.regrid(
         values, in_grid=in_grid, out_grid=out_grid, interpolation=interpolation, backend=backend, **kwargs
     )
+
+
+async def aregrid(
+    values, in_grid=None, out_grid=None, *, interpolation="linear", backend="mir", executor=None, **kwargs
+):
+    r"""
+    Coroutine version of the array interface.
+
+    """
+    from earthkit.regrid.data.numpy import handler
+
+    h = handler()
+    kwargs = kwargs.copy()
+    return await h.aregrid(
+        values,
+        in_grid=in_grid,
+        out_grid=out_grid,
+        interpolation=interpolation,
+        backend=backend,
+        executor=executor,
+        **kwargs,
+    )
@@ -9,13 +9,14 @@
 
 import logging
 import os
+import threading
 from abc import ABCMeta
 from abc import abstractmethod
 
 # from collections import namedtuple
 from importlib import import_module
 
-from earthkit.regrid.utils.config import CONFIG
+from earthkit.regrid.utils.hash import freeze
 
 LOG = logging.getLogger(__name__)
 
@@ -24,6 +25,10 @@ class Backend(metaclass=ABCMeta):
     name = None
     path_config_key = None
     enabled = True
+    # True if regrid() can write the result into a preallocated ``out`` array
+    accepts_out = False
+    # True if the result of supports() can change, e.g. when an inventory is updated
+    supports_may_change = False
 
     def __init__(self, *args, **kwargs):
         pass
@@ -32,6 +37,146 @@ class Backend(metaclass=ABCMeta):
     def regrid(self, values, in_grid, out_grid, method, **kwargs):
         pass
 
+    async def aregrid(self, values, in_grid, out_grid, executor=None, **kwargs):
+        """Coroutine version of :meth:`regrid`.
+
+        By default :meth:`regrid` runs in ``executor``. None means the default
+        executor of the running loop.
+        """
+        from earthkit.regrid.utils.aio import run_in_executor
+
+        return await run_in_executor(executor, self.regrid, values, in_grid, out_grid, **kwargs)
+
+    def supports(self, in_grid, out_grid, interpolation):
+        """Return True if the backend can interpolate between the given grids.
+
+        Used to select the backend in a :class:`BackendChain`. By default all the
+        grids are assumed to be supported. Backends whose answer can change must
+        set ``supports_may_change`` to True.
+        """
+        return True
+
+
+class BackendChain(Backend):
+    """Use the first backend of ``backends`` supporting the input and output grids.
+
+    The backend selected for a given input grid, output grid and interpolation
+    is remembered, so the next calls are dispatched to it directly. When the
+    selection depends on a backend whose :meth:`Backend.supports` can change,
+    e.g. ``precomputed`` whose inventory can be updated, the backend is
+    selected on every call.
+    """
+
+    # the maximum number of routes remembered
+    ROUTES_SIZE = 1024
+
+    def __init__(self, backends):
+        from collections import OrderedDict
+
+        if not backends:
+            raise ValueError("At least one backend must be specified")
+        self.backends = list(backends)
+        self.name = [b.name for b in self.backends]
+        self._routes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def regrid(self, values, in_grid, out_grid, interpolation="linear", out=None, **kwargs):
+        """Interpolate with the first backend supporting the grids.
+
+        Only the backends with ``accepts_out`` set, e.g. ``precomputed``, write
+        the result directly into ``out``. For the others, e.g. ``mir``, the
+        result is computed into a new array and copied into ``out``.
+        """
+        backend = self.select(in_grid, out_grid, interpolation)
+        if out is None or backend.accepts_out:
+            if out is not None:
+                kwargs["out"] = out
+            return backend.regrid(values, in_grid, out_grid, interpolation=interpolation, **kwargs)
+
+        values, grid = backend.regrid(values, in_grid, out_grid, interpolation=interpolation, **kwargs)
+        return self._copy_into(out, values), grid
+
+    async def aregrid(
+        self, values, in_grid, out_grid, interpolation="linear", executor=None, out=None, **kwargs
+    ):
+        backend = self.select(in_grid, out_grid, interpolation)
+        if out is None or backend.accepts_out:
+            if out is not None:
+                kwargs["out"] = out
+            return await backend.aregrid(
+                values, in_grid, out_grid, interpolation=interpolation, executor=executor, **kwargs
+            )
+
+        values, grid = await backend.aregrid(
+            values, in_grid, out_grid, interpolation=interpolation, executor=executor, **kwargs
+        )
+        return self._copy_into(out, values), grid
+
+    @staticmethod
+    def _copy_into(out, values):
+        import numpy as np
+
+        if out.shape != values.shape:
+            raise ValueError(f"Invalid out shape={out.shape}, expected {values.shape}")
+        np.copyto(out, values, casting="same_kind")
+        return out
+
+    def supports(self, in_grid, out_grid, interpolation):
+        try:
+            self.select(in_grid, out_grid, interpolation)
+            return True
+        except ValueError:
+            return False
+
+    def select(self, in_grid, out_grid, interpolation):
+        """Return the first backend supporting the given grids and interpolation."""
+        try:
+            key = freeze((in_grid, out_grid, interpolation))
+            with self._lock:
+                backend = self._routes.get(key)
+                if backend is not None:
+                    self._routes.move_to_end(key)
+                    return backend
+        except TypeError:
+            key = None
+
+        backend, static = self._select(in_grid, out_grid, interpolation)
+        if static and key is not None:
+            with self._lock:
+                self._routes[key] = backend
+                if len(self._routes) > self.ROUTES_SIZE:
+                    self._routes.popitem(last=False)
+        return backend
+
+    def _select(self, in_grid, out_grid, interpolation):
+        # the selection can only be remembered when none of the backends
+        # asked can change their answer
+        static = True
+        for backend in self.backends:
+            static = static and not backend.supports_may_change
+            if backend.supports(in_grid, out_grid, interpolation):
+                LOG.debug(f"BackendChain: selected backend={backend.name} for {in_grid=} {out_grid=}")
+                return backend, static
+
+        raise ValueError(f"No backend in {self.name} supports {in_grid=} {out_grid=} {interpolation=}")
+
+
+def leading_shape(values, size):
+    """Split off the non-geographic (leading) dimensions of ``values``.
+
+    The geographic part is formed by the trailing dimensions whose product
+    matches ``size``, the number of points in the input grid.
+    """
+    n = 1
+    for i in range(values.ndim - 1, -1, -1):
+        n *= values.shape[i]
+        if n == size:
+            return values.shape[:i]
+        if n > size:
+            break
+
+    raise ValueError(f"Input shape={values.shape} is not compatible with the number of grid points={size}")
+
 
 class BackendLoader:
     kind = "backend"
@@ -54,7 +199,10 @@ class BackendMaker:
     BACKEND_OBJECTS = {}
 
     def __init__(self):
-        self.BACKENDS = self._builtins()
+        self.BACKENDS = {}
+        # the modules are only imported when a backend is first requested
+        self._modules = self._builtins()
+        self._lock = threading.Lock()
 
     def _make_key(self, name, *args, **kwargs):
         if args or kwargs:
@@ -66,13 +214,15 @@ class BackendMaker:
     def __call__(self, name, *args, **kwargs):
         loader = BackendLoader()
 
+        if isinstance(name, (list, tuple)):
+            return self._make_chain(tuple(name), *args, **kwargs)
+
         key = self._make_key(name, *args, **kwargs)
         if key in self.BACKEND_OBJECTS:
             return self.BACKEND_OBJECTS[key]
 
-        if name in self.BACKENDS:
-            klass = self.BACKENDS[name]
-        else:
+        klass = self._find(name)
+        if klass is None:
             # TODO: implement a plugin loader
             raise ValueError(f"Unknown backend: {name}")
 
@@ -81,8 +231,44 @@ class BackendMaker:
 
         return backend
 
+    def _make_chain(self, names, *args, **kwargs):
+        key = self._make_key(names, *args, **kwargs)
+        if key in self.BACKEND_OBJECTS:
+            return self.BACKEND_OBJECTS[key]
+
+        # the backends are shared with the ones used on their own
+        chain = BackendChain([self(name, *args, **kwargs) for name in names])
+        self.BACKEND_OBJECTS[key] = chain
+        return chain
+
+    def _find(self, name):
+        with self._lock:
+            if name not in self.BACKENDS:
+                # a backend is normally defined in the module with the same name
+                if name in self._modules:
+                    self._load(name, self._modules.pop(name))
+
+                # the other modules can define backends with any name
+                while name not in self.BACKENDS and self._modules:
+                    self._load(*self._modules.popitem())
+
+            return self.BACKENDS.get(name)
+
+    def _load(self, name, module):
+        try:
+            module = import_module(module, package=__name__)
+            if hasattr(module, "backend"):
+                w = getattr(module, "backend")
+                if isinstance(w, dict):
+                    for k, v in w.items():
+                        self.BACKENDS[k] = v
+                else:
+                    self.BACKENDS[name] = w
+        except Exception:
+            LOG.exception("Error loading backend %s", name)
+
     def _builtins(self):
-        """Scan for built-in backend classes."""
+        """Scan for built-in backend modules without importing them."""
         r = {}
         here = os.path.dirname(__file__)
         for path in sorted(os.listdir(here)):
@@ -91,19 +277,9 @@ class BackendMaker:
 
             if path.endswith(".py") or os.path.isdir(os.path.join(here, path)):
                 name, _ = os.path.splitext(path)
-                try:
-                    module = import_module(f".{name}", package=__name__)
-                    if hasattr(module, "backend"):
-                        w = getattr(module, "backend")
-                        if isinstance(w, dict):
-                            for k, v in w.items():
-                                r[k] = v
-                        else:
-                            r[name] = w
-                except Exception:
-                    LOG.exception("Error loading backend %s", name)
-
-        LOG.debug(f"built-in backend classes: {r}")
+                r[name] = f".{name}"
+
+        LOG.debug(f"built-in backend modules: {r}")
         return r
 
 
@@ -111,5 +287,8 @@ MAKER = BackendMaker()
 
 
 def get_backend(name, *args, **kwargs):
-    """Get a backend by name."""
+    """Get a backend by name.
+
+    When ``name`` is a list of names a :class:`BackendChain` is returned.
+    """
     return MAKER(name, *args, **kwargs)
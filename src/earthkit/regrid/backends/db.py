@@ -10,14 +10,17 @@
 import json
 import logging
 import os
+import threading
+import time
 from abc import ABCMeta
 from abc import abstractmethod
 
-from scipy.sparse import load_npz
-
 from earthkit.regrid.gridspec import GridSpec
 from earthkit.regrid.utils import no_progress_bar
 from earthkit.regrid.utils.download import download_and_cache
+from earthkit.regrid.utils.download import download_many
+from earthkit.regrid.utils.matrix import DEFAULT_MATRIX_FORMAT
+from earthkit.regrid.utils.matrix import matrix_file_extension
 
 LOG = logging.getLogger(__name__)
 
@@ -83,6 +86,10 @@ class MatrixAccessor(metaclass=ABCMeta):
     def matrix_path(self, name):
         pass
 
+    def matrix_paths(self, names):
+        """Return the local paths to the matrix files ``names``"""
+        return [self.matrix_path(name) for name in names]
+
     @abstractmethod
     def reload(self, strict=False):
         pass
@@ -90,16 +97,32 @@ class MatrixAccessor(metaclass=ABCMeta):
     def checked_remote(self):
         return False
 
+    def index_sidecar_path(self, index_path):
+        """Return the path to the sidecar index file. None means no sidecar is used."""
+        return index_path + ".sqlite"
+
     @abstractmethod
     def reset(self):
         pass
 
 
 class UrlAccessor(MatrixAccessor):
+    _MATRIX_DOWNLOAD_KWARGS = dict(
+        owner="url",
+        verify=True,
+        force=None,
+        chunk_size=1024 * 1024,
+        http_headers=None,
+        update_if_out_of_date=False,
+        maximum_retries=5,
+        retry_after=10,
+    )
+
     def __init__(self, url):
         self._url = url
         self._index_path = None
-        self._checked_remote = False
+        # the time of the last check of the remote index file
+        self._checked_remote = None
 
     def path(self):
         return self._url
@@ -107,14 +130,49 @@ class UrlAccessor(MatrixAccessor):
     def is_local(self):
         False
 
+    @staticmethod
+    def _check_interval():
+        from earthkit.regrid.utils.config import CONFIG
+
+        return CONFIG.get("remote-index-check-interval")
+
     def checked_remote(self):
-        return self._checked_remote
+        """Return True if the remote index file was checked for updates within
+        the ``remote-index-check-interval``.
+        """
+        return (
+            self._checked_remote is not None and time.time() - self._checked_remote < self._check_interval()
+        )
 
     def reset(self):
         self._index_path = None
-        self._checked_remote = False
+        self._checked_remote = None
+
+    def _checked_path(self):
+        # the modification time of this file is the time of the last remote check,
+        # so it is shared by all the processes using the same cache
+        return self.index_path() + ".checked"
+
+    def _mark_checked(self):
+        self._checked_remote = time.time()
+        try:
+            with open(self._checked_path(), "w"):
+                pass
+        except OSError as e:
+            LOG.debug(f"UrlAccessor: could not record remote check. {e}")
 
     def reload(self, force=False):
+        if not force:
+            # another process may have checked the remote index file recently
+            try:
+                checked = os.path.getmtime(self._checked_path())
+                if time.time() - checked < self._check_interval():
+                    LOG.info("UrlAccessor: remote index file checked recently, use cached index file")
+                    self._checked_remote = checked
+                    return
+            except OSError:
+                pass
+
         self._index_path = self._get_index(check_remote=True, force=force)
 
     def index_path(self):
@@ -139,7 +197,7 @@ class UrlAccessor(MatrixAccessor):
                 return True
 
             remote_sha = self._remote_sha()
-            self._checked_remote = True
+            self._mark_checked()
 
             if local_sha != remote_sha:
                 LOG.info(
@@ -162,7 +220,7 @@ class UrlAccessor(MatrixAccessor):
             """Decide if the index file should be downloaded and cached again."""
             LOG.info("UrlAccessor: forcefully download remote checksum and new index file")
             self._remote_sha()
-            self._checked_remote = True
+            self._mark_checked()
             return True
 
         def _create(target, args):
@@ -253,23 +311,21 @@ class UrlAccessor(MatrixAccessor):
     def matrix_path(self, name):
         try:
             url = os.path.join(self._url, name)
-            path = download_and_cache(
-                url,
-                owner="url",
-                verify=True,
-                force=None,
-                chunk_size=1024 * 1024,
-                http_headers=None,
-                update_if_out_of_date=False,
-                maximum_retries=5,
-                retry_after=10,
-            )
+            path = download_and_cache(url, **self._MATRIX_DOWNLOAD_KWARGS)
         except Exception:
             LOG.error(f"Could not download matrix file={url}")
             raise
 
         return path
 
+    def matrix_paths(self, names):
+        urls = [os.path.join(self._url, name) for name in names]
+        try:
+            return download_many(urls, **self._MATRIX_DOWNLOAD_KWARGS)
+        except Exception:
+            LOG.error(f"Could not download matrix files from {self._url}")
+            raise
+
 
 class LocalAccessor(MatrixAccessor):
     def __init__(self, path):
@@ -287,6 +343,10 @@ class LocalAccessor(MatrixAccessor):
     def matrix_path(self, name):
         return os.path.join(self._path, name)
 
+    def index_sidecar_path(self, index_path):
+        # local inventories can be read-only and are not modified
+        return None
+
     def reload(self, strict=False):
         pass
 
@@ -300,6 +360,44 @@ class SystemAccessor(UrlAccessor):
 
 
 class MatrixIndex(dict):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # hash table: (method, input key, output key) -> list of entries
+        self._lookup = None
+
+    # the lookup table is rebuilt on the next find() after any modification
+    def __setitem__(self, name, entry):
+        super().__setitem__(name, entry)
+        self._lookup = None
+
+    def __delitem__(self, name):
+        super().__delitem__(name)
+        self._lookup = None
+
+    def __ior__(self, other):
+        self._lookup = None
+        return super().__ior__(other)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._lookup = None
+
+    def setdefault(self, name, entry=None):
+        self._lookup = None
+        return super().setdefault(name, entry)
+
+    def pop(self, *args):
+        self._lookup = None
+        return super().pop(*args)
+
+    def popitem(self):
+        self._lookup = None
+        return super().popitem()
+
+    def clear(self):
+        super().clear()
+        self._lookup = None
+
     def load(self, path):
         with open(path, "r") as f:
             index = json.load(f)
@@ -312,20 +410,22 @@ class MatrixIndex(dict):
                 # gridspecs type, but a given earthkit-regrid version is not
                 # yet supporting it. In this case loading the index should not crash.
                 try:
-                    in_gs = GridSpec.from_dict(entry["input"])
-                    out_gs = GridSpec.from_dict(entry["output"])
-                    raw = entry
-                    entry = dict(**entry)
-                    entry["input"] = in_gs
-                    entry["output"] = out_gs
-                    entry["_name"] = name
-                    entry["_raw"] = raw
-                    # print(f"{in_gs=}")
-                    # print(f"{out_gs=}")
-                    self[name] = entry
+                    self[name] = self.make_entry(name, entry)
                 except Exception:
                     pass
 
+    @staticmethod
+    def make_entry(name, raw):
+        """Create an index entry from the ``raw`` item of the index file"""
+        in_gs = GridSpec.from_dict(raw["input"])
+        out_gs = GridSpec.from_dict(raw["output"])
+        entry = dict(**raw)
+        entry["input"] = in_gs
+        entry["output"] = out_gs
+        entry["_name"] = name
+        entry["_raw"] = raw
+        return entry
+
     @staticmethod
     def interpolation_method_name(item):
         inter = item["interpolation"]
@@ -368,9 +468,28 @@ class MatrixIndex(dict):
         # uid = inter.get("_uid", inter["method"])
         return f"{engine}_{version}_{method_name}"
 
+    @staticmethod
+    def matrix_format(item):
+        return item.get("format", DEFAULT_MATRIX_FORMAT)
+
     @staticmethod
     def matrix_path(item):
-        return os.path.join(MatrixIndex.matrix_dir_name(item), item["_name"] + ".npz")
+        return os.path.join(MatrixIndex.matrix_dir_name(item), MatrixIndex.matrix_filename(item))
+
+    @staticmethod
+    def lookup_key(item):
+        return (
+            MatrixIndex.interpolation_method_name(item),
+            item["input"].index_key(),
+            item["output"].index_key(),
+        )
+
+    def _build_lookup(self):
+        lookup = {}
+        for entry in self.values():
+            lookup.setdefault(self.lookup_key(entry), []).append(entry)
+        self._lookup = lookup
+        return lookup
 
     def find(self, gridspec_in, gridspec_out, method):
         gridspec_in = GridSpec.from_dict(gridspec_in)
@@ -379,9 +498,32 @@ class MatrixIndex(dict):
         if gridspec_in is None or gridspec_out is None:
             return None
 
-        for _, entry in self.items():
-            if MatrixIndex.match(entry, gridspec_in, gridspec_out, method):
-                return entry
+        lookup = self._lookup
+        if lookup is None:
+            lookup = self._build_lookup()
+
+        # only the entries in the matching buckets have to be compared
+        key = (method, gridspec_in.index_key(), gridspec_out.index_key())
+        entry = self._find_in_bucket(lookup.get(key), gridspec_in, gridspec_out, method)
+        if entry is not None:
+            return entry
+
+        # equal gridspecs can be in adjacent buckets
+        for key_in in gridspec_in.index_keys():
+            for key_out in gridspec_out.index_keys():
+                if (method, key_in, key_out) != key:
+                    bucket = lookup.get((method, key_in, key_out))
+                    entry = self._find_in_bucket(bucket, gridspec_in, gridspec_out, method)
+                    if entry is not None:
+                        return entry
+        return None
+
+    @staticmethod
+    def _find_in_bucket(bucket, gs_in, gs_out, method):
+        if bucket:
+            for entry in bucket:
+                if MatrixIndex.match(entry, gs_in, gs_out, method):
+                    return entry
         return None
 
     @staticmethod
@@ -396,7 +538,7 @@ class MatrixIndex(dict):
 
     @staticmethod
     def matrix_filename(item):
-        return item["_name"] + ".npz"
+        return item["_name"] + matrix_file_extension(MatrixIndex.matrix_format(item))
 
     def subset(self, filters, fail_on_missing=True, raw=False):
         res = MatrixIndex()
@@ -427,10 +569,237 @@ class MatrixIndex(dict):
         return res
 
 
+class MatrixIndexSidecar:
+    """Compact SQLite index of the entries of an index file.
+
+    The sidecar file is written alongside the index file and stores the raw
+    entries under their lookup keys. A lookup only has to read and create the
+    gridspecs of the entries in the matching buckets, so the whole index file
+    does not have to be loaded. The sidecar is rebuilt when the checksum of the
+    index file changes. Only the entries added or changed since the previous
+    sidecar was built have to be parsed again.
+    """
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, index_path, path=None):
+        self.index_path = index_path
+        self.path = index_path + ".sqlite" if path is None else path
+        self._connection = None
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def encode_key(key):
+        return json.dumps(key)
+
+    @staticmethod
+    def _file_sha(path):
+        import hashlib
+
+        m = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(1024 * 1024):
+                m.update(chunk)
+        return m.hexdigest()
+
+    def _connect(self):
+        import sqlite3
+
+        return sqlite3.connect(self.path, check_same_thread=False)
+
+    def open(self):
+        """Open the sidecar file. It is (re)built when missing or out of date."""
+        import sqlite3
+
+        with self._lock:
+            if self._connection is not None:
+                return
+
+            stat = os.stat(self.index_path)
+            if os.path.exists(self.path):
+                try:
+                    connection = self._connect()
+                    if self._is_valid(connection, stat):
+                        self._connection = connection
+                        return
+                    connection.close()
+                except sqlite3.Error as e:
+                    LOG.warning(f"Cannot use index sidecar file={self.path}. {e}")
+
+            self._build(stat)
+            self._connection = self._connect()
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+            self._entries = {}
+
+    def _is_valid(self, connection, stat):
+        meta = dict(connection.execute("SELECT key, value FROM meta"))
+        if meta.get("schema") != str(self.SCHEMA_VERSION):
+            return False
+
+        # the checksum is only computed when the index file was touched
+        if meta.get("size") == str(stat.st_size) and meta.get("mtime") == str(stat.st_mtime_ns):
+            return True
+
+        if meta.get("sha256") != self._file_sha(self.index_path):
+            return False
+
+        try:
+            with connection:
+                connection.executemany(
+                    "UPDATE meta SET value=? WHERE key=?",
+                    [(str(stat.st_size), "size"), (str(stat.st_mtime_ns), "mtime")],
+                )
+        except Exception:
+            pass
+        return True
+
+    def _build(self, stat):
+        import sqlite3
+
+        LOG.info(f"Build index sidecar file={self.path}")
+        with open(self.index_path, "rb") as f:
+            data = f.read()
+
+        import hashlib
+
+        sha = hashlib.sha256(data).hexdigest()
+        index = json.loads(data)
+        version = index.get("version", None)
+        if version != VERSION:
+            raise ValueError(f"Invalid index file version: expected {VERSION}, got {version}")
+
+        previous = self._previous_rows()
+
+        rows = []
+        changed = 0
+        for name, raw in index["matrix"].items():
+            raw_json = json.dumps(raw)
+            row = previous.get(name)
+            if row is not None and row[4] == raw_json:
+                rows.append(row)
+                continue
+
+            # entries with unsupported gridspecs are never found as in MatrixIndex.load(),
+            # they are only stored so they are not parsed again on the next build
+            changed += 1
+            try:
+                method, key_in, key_out = MatrixIndex.lookup_key(MatrixIndex.make_entry(name, raw))
+                rows.append((method, self.encode_key(key_in), self.encode_key(key_out), name, raw_json))
+            except Exception:
+                rows.append((None, None, None, name, raw_json))
+
+        LOG.debug(f"Index sidecar: {changed} new or changed entries, {len(rows)} entries")
+
+        # the file is built under a temporary name so other processes never see
+        # a partially written sidecar
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            connection = sqlite3.connect(tmp)
+            try:
+                with connection:
+                    connection.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+                    connection.execute(
+                        "CREATE TABLE entry (method TEXT, input TEXT, output TEXT, name TEXT, raw TEXT)"
+                    )
+                    connection.executemany("INSERT INTO entry VALUES (?, ?, ?, ?, ?)", rows)
+                    connection.execute("CREATE INDEX entry_key ON entry (method, input, output)")
+                    connection.executemany(
+                        "INSERT INTO meta VALUES (?, ?)",
+                        [
+                            ("schema", str(self.SCHEMA_VERSION)),
+                            ("sha256", sha),
+                            ("size", str(stat.st_size)),
+                            ("mtime", str(stat.st_mtime_ns)),
+                        ],
+                    )
+            finally:
+                connection.close()
+            os.replace(tmp, self.path)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+
+    def _previous_rows(self):
+        """Return the rows of the existing sidecar file by entry name.
+
+        Returns an empty dict when there is no usable sidecar file.
+        """
+        import sqlite3
+
+        if not os.path.exists(self.path):
+            return {}
+
+        try:
+            connection = self._connect()
+            try:
+                meta = dict(connection.execute("SELECT key, value FROM meta"))
+                if meta.get("schema") != str(self.SCHEMA_VERSION):
+                    return {}
+                return {
+                    row[3]: row
+                    for row in connection.execute("SELECT method, input, output, name, raw FROM entry")
+                }
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            LOG.debug(f"Cannot read previous index sidecar file={self.path}. {e}")
+            return {}
+
+    def _bucket(self, method, key_in, key_out):
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT name, raw FROM entry WHERE method=? AND input=? AND output=?",
+                (method, self.encode_key(key_in), self.encode_key(key_out)),
+            ).fetchall()
+
+            # the entries are only created once
+            bucket = []
+            for name, raw in rows:
+                entry = self._entries.get(name)
+                if entry is None:
+                    try:
+                        entry = MatrixIndex.make_entry(name, json.loads(raw))
+                    except Exception:
+                        continue
+                    self._entries[name] = entry
+                bucket.append(entry)
+            return bucket
+
+    def find(self, gridspec_in, gridspec_out, method):
+        self.open()
+
+        gridspec_in = GridSpec.from_dict(gridspec_in)
+        gridspec_out = GridSpec.from_dict(gridspec_out)
+
+        if gridspec_in is None or gridspec_out is None:
+            return None
+
+        # the canonical keys come first, see MatrixIndex.find()
+        for key_in in gridspec_in.index_keys():
+            for key_out in gridspec_out.index_keys():
+                bucket = self._bucket(method, key_in, key_out)
+                entry = MatrixIndex._find_in_bucket(bucket, gridspec_in, gridspec_out, method)
+                if entry is not None:
+                    return entry
+        return None
+
+
 class MatrixDb:
+    # the maximum number of missing grid pairs remembered
+    MISSING_SIZE = 1024
+
     def __init__(self, accessor):
         self._index = None
+        self._sidecar = None
         self._accessor = accessor
+        # grid pairs not found in the index, see find_entry()
+        self._missing = {}
 
     @property
     def index(self):
@@ -443,6 +812,39 @@ class MatrixDb:
         path = self._accessor.index_path()
         self._index.load(path)
 
+    def _get_sidecar(self):
+        if self._sidecar is None:
+            self._sidecar = False
+            path = self._accessor.index_path()
+            sidecar_path = self._accessor.index_sidecar_path(path)
+            if sidecar_path is not None:
+                sidecar = MatrixIndexSidecar(path, sidecar_path)
+                try:
+                    sidecar.open()
+                    self._sidecar = sidecar
+                except Exception as e:
+                    LOG.warning(f"Cannot use index sidecar file={sidecar_path}, load the whole index. {e}")
+        return self._sidecar
+
+    def open_index(self):
+        """Make the index ready for lookups"""
+        if self._index is None and not self._get_sidecar():
+            self._load_index()
+
+    def _find_in_index(self, gridspec_in, gridspec_out, method):
+        # when the whole index is not loaded yet the sidecar is used
+        if self._index is None:
+            sidecar = self._get_sidecar()
+            if sidecar:
+                return sidecar.find(gridspec_in, gridspec_out, method)
+        return self.index.find(gridspec_in, gridspec_out, method)
+
+    def _reset_index(self):
+        self._index = None
+        if self._sidecar:
+            self._sidecar.close()
+        self._sidecar = None
+
     def _method_alias(self, method):
         for k, v in _METHOD_ALIAS.items():
             if method in v:
@@ -462,51 +864,166 @@ class MatrixDb:
         if gridspec_in is None or gridspec_out is None:
             return None, None
 
+        # a known miss does not go through the memory cache
+        if self._is_missing(self._missing_key(gridspec_in, gridspec_out, self._method_alias(method))):
+            return None, None
+
         # return self._create_matrix(gridspec_in, gridspec_out, method)
 
+        from earthkit.regrid.utils.config import CONFIG
         from earthkit.regrid.utils.memcache import MEMORY_CACHE
 
+        # the weights converted to different types are cached separately
+        dtype = CONFIG.get("weights-dtype")
+
         return MEMORY_CACHE.get(
             gridspec_in,
             gridspec_out,
             method,
+            dtype,
             create=self._create_matrix,
-            find_entry=self.find_entry,
-            create_from_entry=self._create_matrix_from_entry,
+            find_entry=self._find_entry,
+            create_from_entry=lambda entry: self._create_matrix_from_entry(entry, dtype),
             **kwargs,
         )
 
-    def _create_matrix(self, gridspec_in, gridspec_out, method):
-        return self._create_matrix_from_entry(self.find_entry(gridspec_in, gridspec_out, method))
+    def _find_entry(self, gridspec_in, gridspec_out, method, dtype):
+        return self.find_entry(gridspec_in, gridspec_out, method)
+
+    def _create_matrix(self, gridspec_in, gridspec_out, method, dtype):
+        return self._create_matrix_from_entry(self.find_entry(gridspec_in, gridspec_out, method), dtype)
 
-    def _create_matrix_from_entry(self, entry):
+    def _create_matrix_from_entry(self, entry, dtype=None):
         if entry is not None:
-            z = self.load_matrix(entry)
+            z = self.load_matrix(entry, dtype=dtype)
             return z, entry["output"]["shape"]
         return None, None
 
     def find_entry(self, gridspec_in, gridspec_out, method):
         method = self._method_alias(method)
-        entry = self.index.find(gridspec_in, gridspec_out, method)
+        key = self._missing_key(gridspec_in, gridspec_out, method)
+        if key is not None and self._is_missing(key):
+            return None
+
+        entry = self._find_in_index(gridspec_in, gridspec_out, method)
         if entry is None and not self._accessor.is_local() and not self._accessor.checked_remote():
             LOG.info(f"Matrix not found in DB for {gridspec_in=} {gridspec_out=} {method=}")
             LOG.info("Try to fetch remote index file to check for updates")
             self._accessor.reload()
-            self._load_index()
-            entry = self.index.find(gridspec_in, gridspec_out, method)
+            self._reset_index()
+            entry = self._find_in_index(gridspec_in, gridspec_out, method)
+
+        if entry is None and key is not None:
+            self._add_missing(key)
 
         return entry
 
-    def load_matrix(self, entry):
+    def has_matrix(self, gridspec_in, gridspec_out, method):
+        """Return True if the index has a matrix for the given grids and method.
+
+        Nothing is downloaded or loaded. A grid pair not found is remembered,
+        so asking again is cheap.
+        """
+        return self.find_entry(gridspec_in, gridspec_out, method) is not None
+
+    @staticmethod
+    def _missing_key(gridspec_in, gridspec_out, method):
+        try:
+            gridspec_in = GridSpec.from_dict(gridspec_in)
+            gridspec_out = GridSpec.from_dict(gridspec_out)
+        except Exception:
+            return None
+
+        if gridspec_in is None or gridspec_out is None:
+            return None
+        return (gridspec_in.key(), gridspec_out.key(), method)
+
+    def _index_version(self):
+        """Identify the current contents of the index file."""
+        try:
+            path = self._accessor.index_path()
+            st = os.stat(path)
+            return (path, st.st_size, st.st_mtime_ns)
+        except OSError:
+            return None
+
+    @staticmethod
+    def _missing_ttl():
+        from earthkit.regrid.utils.config import CONFIG
+
+        return CONFIG.get("remote-index-check-interval")
+
+    def _is_missing(self, key):
+        # a miss is only valid for the same index file and within the
+        # remote-index-check-interval, after that the remote index may be checked again
+        item = self._missing.get(key)
+        if item is None:
+            return False
+
+        version, added = item
+        if time.monotonic() - added < self._missing_ttl() and version == self._index_version():
+            return True
+
+        self._missing.pop(key, None)
+        return False
+
+    def _add_missing(self, key):
+        if not self._missing_ttl():
+            return
+
+        if len(self._missing) >= self.MISSING_SIZE:
+            self._missing.clear()
+        self._missing[key] = (self._index_version(), time.monotonic())
+
+    def prefetch(self, gridspec_in, gridspec_out, method, load=False):
+        """Make the matrix file for the given grids and method available locally.
+
+        Returns the path to the matrix file. When ``load`` is True the matrix is
+        also loaded into the in-memory weights cache.
+        """
+        gs_in = GridSpec.from_dict(gridspec_in)
+        gs_out = GridSpec.from_dict(gridspec_out)
+        entry = None
+        if gs_in is not None and gs_out is not None:
+            entry = self.find_entry(gs_in, gs_out, method)
+
+        if entry is None:
+            raise ValueError(f"No precomputed weights found! {gridspec_in=} {gridspec_out=} {method=}")
+
+        # for remote inventories this downloads the file into the cache
+        path = self._matrix_fs_path(entry)
+
+        if load:
+            self.find(gridspec_in, gridspec_out, method)
+
+        return path
+
+    def load_matrix(self, entry, dtype=None):
+        """Load the matrix of ``entry``.
+
+        The matrix is converted into the compact CSR layout of :func:`compact_matrix`.
+        When ``dtype`` is not None the weights are converted to it. For "mmap"
+        matrices this creates an in-memory copy of the weights.
+        """
+        from earthkit.regrid.utils.matrix import compact_matrix
+
         path = self._matrix_fs_path(entry)
-        z = load_npz(path)
-        return z
+        if MatrixIndex.matrix_format(entry) == "mmap":
+            from earthkit.regrid.utils.matrix import load_matrix_mmap
+
+            z = load_matrix_mmap(path)
+        else:
+            from scipy.sparse import load_npz
+
+            z = load_npz(path)
+
+        return compact_matrix(z, dtype=dtype)
 
     def _matrix_index_filename(self, entry):
-        return self.index.matrix_filename(entry)
+        return MatrixIndex.matrix_filename(entry)
 
     def _matrix_index_path(self, entry):
-        return self.index.matrix_path(entry)
+        return MatrixIndex.matrix_path(entry)
 
     def _matrix_fs_path(self, entry):
         return self._accessor.matrix_path(self._matrix_index_path(entry))
@@ -514,11 +1031,45 @@ class MatrixDb:
     def subset_index(self, filters, **kwargs):
         return self.index.subset(filters, **kwargs)
 
-    def copy_matrix_file(self, entry, out_dir, exist_ok=False, dry_run=False):
+    def matrix_paths(self, entries):
+        """Return the local paths to the matrix files of ``entries``.
+
+        For remote inventories the missing files are downloaded concurrently.
+        """
+        return self._accessor.matrix_paths([self._matrix_index_path(e) for e in entries])
+
+    def copy_matrix_files(self, entries, out_dir, **kwargs):
+        """Copy the matrix files of ``entries`` into the inventory at ``out_dir``.
+
+        The files are first fetched concurrently, then copied as in
+        :meth:`copy_matrix_file`. Returns the target paths.
+        """
+        entries = list(entries)
+        src_files = self.matrix_paths(entries)
+        return [
+            self.copy_matrix_file(entry, out_dir, src_file=src_file, **kwargs)
+            for entry, src_file in zip(entries, src_files)
+        ]
+
+    def copy_matrix_file(
+        self, entry, out_dir, exist_ok=False, dry_run=False, matrix_format=None, src_file=None
+    ):
+        """Copy the matrix file of ``entry`` into the inventory at ``out_dir``.
+
+        When ``matrix_format`` differs from the format of the entry the matrix is
+        converted. In this case the ``"format"`` of the raw entry has to be updated
+        accordingly in the target index, see :meth:`converted_entry`.
+        """
         import shutil
 
-        matrix_index_path = self._matrix_index_path(entry)
-        src_file = self._matrix_fs_path(entry)
+        src_format = MatrixIndex.matrix_format(entry)
+        if matrix_format is None:
+            matrix_format = src_format
+
+        target_entry = self.converted_entry(entry, matrix_format)
+        matrix_index_path = MatrixIndex.matrix_path(target_entry)
+        if src_file is None:
+            src_file = self._matrix_fs_path(entry)
         target_file = os.path.join(out_dir, matrix_index_path)
 
         if not exist_ok and os.path.exists(target_file):
@@ -531,10 +1082,34 @@ class MatrixDb:
 
         if not dry_run:
             os.makedirs(target_dir, exist_ok=True)
-            shutil.copyfile(src_file, target_file)
+            if matrix_format == src_format:
+                shutil.copyfile(src_file, target_file)
+            elif matrix_format == "mmap":
+                from earthkit.regrid.utils.matrix import save_matrix_mmap
+
+                save_matrix_mmap(target_file, self.load_matrix(entry))
+            else:
+                from scipy.sparse import save_npz
+
+                save_npz(target_file, self.load_matrix(entry))
 
         return target_file
 
+    @staticmethod
+    def converted_entry(entry, matrix_format):
+        """Return a copy of ``entry`` using ``matrix_format`` for the matrix file."""
+        matrix_file_extension(matrix_format)
+        entry = dict(**entry)
+        raw = dict(**entry["_raw"])
+        if matrix_format == DEFAULT_MATRIX_FORMAT:
+            raw.pop("format", None)
+            entry.pop("format", None)
+        else:
+            raw["format"] = matrix_format
+            entry["format"] = matrix_format
+        entry["_raw"] = raw
+        return entry
+
     def index_file_path(self):
         return self._accessor.index_path()
 
@@ -554,11 +1129,12 @@ class MatrixDb:
 
     def _clear_index(self):
         """For testing only"""
-        self._index = None
+        self._reset_index()
 
     def _reset(self):
         """For testing only"""
-        self._index = None
+        self._reset_index()
+        self._missing.clear()
         self._accessor.reset()
 
 
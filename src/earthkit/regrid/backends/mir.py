@@ -7,9 +7,18 @@
 # nor does it submit to any jurisdiction.
 #
 
+import logging
+import math
 from warnings import warn
 
 from . import Backend
+from . import leading_shape
+
+LOG = logging.getLogger(__name__)
+
+# the number of points of the input grids, see MirBackend.grid_size()
+_GRID_SIZES = {}
+GRID_SIZES_SIZE = 1024
 
 
 class MirBackend(Backend):
@@ -50,6 +59,7 @@ class MirBackend(Backend):
         distance=1,
         distance_tolerance=1,
         nclosest=4,
+        cache_weights=False,
     ):
         import mir
 
@@ -61,19 +71,124 @@ class MirBackend(Backend):
             "nclosest": nclosest,
         }
 
-        out_grid, kwargs = self.adjust_options(out_grid, {})
+        grid, kwargs = self.adjust_options(out_grid, {})
+        # NOTE: needs generalisation
+        options = {"interpolation": interpolation, **kwargs}
 
-        input = mir.ArrayInput(values, in_grid)
-        out = mir.ArrayOutput()
+        if cache_weights:
+            return self._regrid_with_weights(values, in_grid, out_grid, grid, options)
 
         job = mir.Job()
-        job.set("grid", out_grid)
-        job.set("interpolation", interpolation)  # NOTE: needs generalisation
-        for k, v in kwargs.items():
+        job.set("grid", grid)
+        for k, v in options.items():
             job.set(k, v)
 
-        job.execute(input, out)
+        leading = self.leading_shape(values, in_grid)
+        if not leading:
+            return self._execute(job, values, in_grid)
+
+        import numpy as np
+
+        # the fields are interpolated in one go with the weights generated by mir.
+        # Missing values need the interpolation of mir, which is done per field.
+        if not np.isnan(values).any():
+            try:
+                return self._regrid_with_weights(values, in_grid, out_grid, grid, options)
+            except Exception as e:
+                LOG.debug(f"Cannot generate the weights with mir, interpolating per field. {e}")
+
+        fields = values.reshape(math.prod(leading), -1)
+        result = []
+        for v in fields:
+            v, spec = self._execute(job, v, in_grid)
+            result.append(v)
+
+        result = np.stack(result)
+        return result.reshape(*leading, *result.shape[1:]), spec
+
+    def _regrid_with_weights(self, values, in_grid, out_grid, grid, options):
+        """Interpolate with the weights generated by mir.
+
+        The weights are only generated for the first call with a given input grid,
+        output grid and options and are kept in the in-memory weights cache.
+        """
+        import mir
+
+        from earthkit.regrid.utils.memcache import MEMORY_CACHE
+
+        from .precomputed import MatrixBackend
+
+        out = mir.Grid(**out_grid)
+
+        def _create(name, in_grid, grid, options):
+            from earthkit.regrid.utils.matrix import compact_matrix
+            from earthkit.regrid.utils.mir import mir_make_matrix
 
+            z = mir_make_matrix(in_grid=in_grid, out_grid=grid, **options)
+            return compact_matrix(z), list(out.shape)
+
+        z, shape = MEMORY_CACHE.get(self.name, in_grid, grid, options, create=_create)
+        return MatrixBackend.apply_matrix(z, values, shape), out.spec
+
+    @staticmethod
+    def leading_shape(values, in_grid):
+        """Return the non-geographic (leading) dimensions of ``values``"""
+        if values.ndim < 2:
+            return ()
+
+        size = MirBackend.grid_size(in_grid)
+        if size is None:
+            if values.ndim == 2:
+                # e.g. a 2D regular_ll field, mir checks the number of values
+                return ()
+
+            # without the number of grid points the fields cannot be split off
+            raise ValueError(
+                f"Cannot determine the number of points of {in_grid=} to interpret "
+                f"the input shape={values.shape}. Pass the fields as a 2D array."
+            )
+
+        return leading_shape(values, size)
+
+    @staticmethod
+    def grid_size(in_grid):
+        """Return the number of points of ``in_grid`` or None if mir cannot create it."""
+        from earthkit.regrid.utils.hash import freeze
+
+        try:
+            key = freeze(in_grid)
+            hash(key)
+        except TypeError:
+            return MirBackend._grid_size(in_grid)
+
+        try:
+            return _GRID_SIZES[key]
+        except KeyError:
+            pass
+
+        size = MirBackend._grid_size(in_grid)
+        if len(_GRID_SIZES) >= GRID_SIZES_SIZE:
+            _GRID_SIZES.clear()
+        _GRID_SIZES[key] = size
+        return size
+
+    @staticmethod
+    def _grid_size(in_grid):
+        import mir
+
+        try:
+            return math.prod(mir.Grid(**in_grid).shape)
+        except Exception as e:
+            LOG.debug(f"Cannot create mir.Grid for {in_grid=}. {e}")
+            return None
+
+    @staticmethod
+    def _execute(job, values, in_grid):
+        import mir
+
+        input = mir.ArrayInput(values, in_grid)
+        out = mir.ArrayOutput()
+        job.execute(input, out)
         return out.values(), out.spec
 
     # TODO: remove this once the gridspec can be written into the GRIB message
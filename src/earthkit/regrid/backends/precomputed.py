@@ -7,31 +7,92 @@
 # nor does it submit to any jurisdiction.
 #
 
+import math
 
 from . import Backend
+from . import leading_shape
 
 
 class MatrixBackend(Backend):
     name = "precomputed"
     system_inventory_id = "ecmwf"
+    accepts_out = True
+    # the inventory can be updated
+    supports_may_change = True
 
     def __init__(self, inventory=None):
         self.path_or_url = inventory
         self.db = self.get_db(inventory)
 
-    def regrid(self, values, in_grid, out_grid, interpolation):
+    def regrid(self, values, in_grid, out_grid, interpolation, out=None):
         z, shape = self.db.find(in_grid, out_grid, interpolation)
 
         if z is None:
             raise ValueError(f"No precomputed weights found! {in_grid=} {out_grid=} {interpolation=}")
 
-        # This should check for 1D (GG) and 2D (LL) matrices
-        values = values.reshape(-1, 1)
+        return self.apply_matrix(z, values, shape, out=out), out_grid
 
-        values = z @ values
-        values = values.reshape(shape)
+    async def aregrid(self, values, in_grid, out_grid, interpolation, executor=None, out=None):
+        from earthkit.regrid.gridspec import GridSpec
+        from earthkit.regrid.utils.aio import MATRIX_LOADS
+        from earthkit.regrid.utils.aio import run_in_executor
 
-        return values, out_grid
+        # finding, downloading and loading the matrix is I/O bound. It runs in the
+        # default executor and the concurrent calls for the same matrix share it.
+        key = (self.db, GridSpec.from_dict(in_grid).key(), GridSpec.from_dict(out_grid).key(), interpolation)
+        z, shape = await MATRIX_LOADS.run(key, self.db.find, in_grid, out_grid, interpolation)
+
+        if z is None:
+            raise ValueError(f"No precomputed weights found! {in_grid=} {out_grid=} {interpolation=}")
+
+        return await run_in_executor(executor, self.apply_matrix, z, values, shape, out=out), out_grid
+
+    def supports(self, in_grid, out_grid, interpolation):
+        """Return True if the inventory has weights for the given grids and interpolation.
+
+        The weights are not downloaded or loaded.
+        """
+        try:
+            return self.db.has_matrix(in_grid, out_grid, interpolation)
+        except (ValueError, KeyError):
+            # the gridspecs are not supported
+            return False
+
+    @staticmethod
+    def apply_matrix(z, values, shape, out=None):
+        """Multiply ``values`` by the sparse matrix ``z``.
+
+        ``values`` can have leading (non-geographic) dimensions. In this case all
+        the fields are multiplied in one go as the columns of a dense matrix and the
+        result has the shape ``(*leading, *shape)``.
+
+        When ``out`` is given the result is copied into it and ``out`` is returned.
+        Without ``out`` the result has the floating point type of ``values``.
+        """
+        leading = leading_shape(values, z.shape[1])
+        dtype = values.dtype
+
+        if out is not None and out.shape != (*leading, *shape):
+            raise ValueError(f"Invalid out shape={out.shape}, expected {(*leading, *shape)}")
+
+        if not leading:
+            values = z @ values.reshape(-1)
+            values = values.reshape(shape)
+        else:
+            count = math.prod(leading)
+            values = z @ values.reshape(count, -1).T
+            values = values.T.reshape(*leading, *shape)
+
+        import numpy as np
+
+        if out is None:
+            # keep the floating point type of the input when the weights have a different one
+            if np.issubdtype(dtype, np.floating) and values.dtype != dtype:
+                values = values.astype(dtype)
+            return values
+
+        np.copyto(out, values, casting="same_kind")
+        return out
 
     # TODO: will be removed
     def interpolate(self, values, in_grid, out_grid, method, **kwargs):
@@ -40,12 +101,7 @@ class MatrixBackend(Backend):
         if z is None:
             raise ValueError(f"No matrix found! {in_grid=} {out_grid=} {method=}")
 
-        # This should check for 1D (GG) and 2D (LL) matrices
-        values = values.reshape(-1, 1)
-
-        values = z @ values
-
-        return values.reshape(shape)
+        return self.apply_matrix(z, values, shape)
 
     def get_db(self, path_or_url):
         if path_or_url is None or path_or_url == self.system_inventory_id:
@@ -15,6 +15,9 @@ LOG = logging.getLogger(__name__)
 
 
 class FieldListDataHandler(DataHandler):
+    # the maximum number of fields stacked into one array by default
+    CHUNK_SIZE = 64
+
     @staticmethod
     def match(values):
         from earthkit.regrid.utils import is_module_loaded
@@ -41,23 +44,92 @@ class FieldListDataHandler(DataHandler):
 
         return in_grid
 
-    def regrid(self, values, **kwargs):
+    def _parse_kwargs(self, kwargs):
         backend = self.backend_from_kwargs(kwargs)
 
         grid = kwargs.pop("grid", None)
         if grid is None:
             raise ValueError("Missing 'grid' argument")
 
-        if hasattr(backend, "regrid_grib"):
-            # TODO: remove this when ecCodes supports setting the gridSpec on a GRIB handle
-            return self._regrid_grib(values, backend, grid, **kwargs)
+        # the cached weights can only be applied to the field values
+        # TODO: remove this when ecCodes supports setting the gridSpec on a GRIB handle
+        cache_weights = kwargs.pop("cache_weights", False)
+        grib = hasattr(backend, "regrid_grib") and not cache_weights
+        if cache_weights:
+            # only passed on when enabled, the default is not supported by all the backends
+            kwargs["cache_weights"] = cache_weights
+        return backend, grid, grib
+
+    def regrid(self, values, **kwargs):
+        backend, grid, grib = self._parse_kwargs(kwargs)
+
+        workers = kwargs.pop("workers", None)
+        chunk_size = kwargs.pop("chunk_size", None)
+
+        if grib:
+            return self._regrid_grib(values, backend, grid, workers=workers, chunk_size=chunk_size, **kwargs)
         else:
-            return self._regrid_array(values, backend, grid, **kwargs)
+            return self._regrid_array(values, backend, grid, chunk_size=chunk_size, **kwargs)
 
-    def _regrid_array(self, values, backend, grid, **kwargs):
-        import earthkit.data
+    async def aregrid(self, values, executor=None, **kwargs):
+        import asyncio
+
+        from earthkit.regrid.utils.aio import run_in_executor
+
+        backend, grid, grib = self._parse_kwargs(kwargs)
+
+        workers = kwargs.pop("workers", None)
+        chunk_size = kwargs.pop("chunk_size", None)
+
+        if grib:
+            return await run_in_executor(
+                executor,
+                self._regrid_grib,
+                values,
+                backend,
+                grid,
+                workers=workers,
+                chunk_size=chunk_size,
+                **kwargs,
+            )
+
+        # reading the metadata and the values of the fields is I/O bound
+        fields, groups = await run_in_executor(None, self._group_fields, values, grid, chunk_size)
+
+        async def _regrid(in_grid, indices):
+            vv = await run_in_executor(None, self._stack, fields, indices)
+            return await backend.aregrid(vv, in_grid, grid, executor=executor, **kwargs)
+
+        # the groups are interpolated concurrently
+        results = await asyncio.gather(*[_regrid(in_grid, indices) for in_grid, indices in groups])
+        return self._to_fieldlist(values, fields, groups, results)
+
+    def _regrid_array(self, values, backend, grid, chunk_size=None, **kwargs):
+        fields, groups = self._group_fields(values, grid, chunk_size)
+
+        results = []
+        for in_grid, indices in groups:
+            vv = self._stack(fields, indices)
+            results.append(backend.regrid(vv, in_grid, grid, **kwargs))
+
+        return self._to_fieldlist(values, fields, groups, results)
+
+    def _group_fields(self, ds, grid, chunk_size=None):
+        """Group the fields on the same input grid.
+
+        Returns the fields and the list of groups. Each group is a tuple of
+        the input grid and the indices of at most ``chunk_size`` fields, so
+        only ``chunk_size`` fields are stacked into an array at once. The output
+        ``grid`` is only checked, it is passed to the backends as specified by
+        the user.
+        """
+        from earthkit.regrid.utils.hash import freeze
+
+        if chunk_size is None:
+            chunk_size = self.CHUNK_SIZE
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
 
-        ds = values
         assert grid is not None
 
         # TODO: refactor this when this limitation is removed
@@ -69,26 +141,50 @@ class FieldListDataHandler(DataHandler):
                 "Fieldlists can only be regridded to global regular lat-lon target grids. Target grid is {out_grid}"
             )
 
-        r = earthkit.data.FieldList()
+        # fields on the same input grid are interpolated together in one call
+        fields = []
+        groups = {}
         for i, f in enumerate(ds):
-            vv = f.to_numpy(flatten=True)
-
             in_grid = self.input_gridspec(f, i)
+            try:
+                key = freeze(in_grid)
+                hash(key)
+            except TypeError:
+                # kept in a group of its own
+                key = i
+            groups.setdefault(key, (in_grid, []))[1].append(i)
+            fields.append(f)
+
+        return fields, [
+            (in_grid, indices[j : j + chunk_size])
+            for in_grid, indices in groups.values()
+            for j in range(0, len(indices), chunk_size)
+        ]
 
-            v_res, out_grid = backend.regrid(
-                vv,
-                in_grid,
-                out_grid,
-                **kwargs,
-            )
-            md_res = f.metadata().override(gridspec=out_grid)
+    @staticmethod
+    def _stack(fields, indices):
+        import numpy as np
+
+        return np.stack([fields[i].to_numpy(flatten=True) for i in indices])
+
+    @staticmethod
+    def _to_fieldlist(ds, fields, groups, results):
+        import earthkit.data
+
+        values = [None] * len(fields)
+        for (_, indices), (v_res, grid_res) in zip(groups, results):
+            for i, v in zip(indices, v_res):
+                values[i] = (v, grid_res)
+
+        r = earthkit.data.FieldList()
+        for f, (v_res, grid_res) in zip(fields, values):
+            md_res = f.metadata().override(gridspec=grid_res)
             r += ds.from_numpy(v_res, md_res)
 
         return r
 
-    def _regrid_grib(self, values, backend, grid, **kwargs):
+    def _regrid_grib(self, values, backend, grid, workers=None, chunk_size=None, **kwargs):
         # TODO: remove this when ecCodes supports setting the gridSpec on a GRIB handle
-        from earthkit.data.readers.grib.codes import GribField
         from earthkit.data.readers.grib.memory import GribFieldInMemory
 
         assert hasattr(backend, "regrid_grib")
@@ -96,23 +192,47 @@ class FieldListDataHandler(DataHandler):
         ds = values
         assert grid is not None
 
-        r = []
-        for i, f in enumerate(ds):
-            if isinstance(f, GribField):
-                message = f.message()
-            elif hasattr(f, "handle"):
-                from earthkit.data import create_encoder
+        def _regrid(message):
+            v_res = backend.regrid_grib(message, grid, **kwargs)
+            return GribFieldInMemory.from_buffer(v_res)
 
-                encoder = create_encoder("grib")
-                message = encoder.encode(f).to_bytes()
-            else:
-                raise ValueError(f"field type={type(f)} is not supported in regrid!")
+        if workers is None or workers <= 1:
+            r = [_regrid(self._grib_message(f)) for f in ds]
+            return ds.from_fields(r)
 
-            v_res = backend.regrid_grib(message, grid, **kwargs)
-            r.append(GribFieldInMemory.from_buffer(v_res))
+        # mir releases the GIL during the interpolation so threads are enough.
+        # Only chunk_size encoded messages are held in memory at once.
+        if chunk_size is None:
+            chunk_size = 4 * workers
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+
+        from concurrent.futures import ThreadPoolExecutor
+        from itertools import islice
+
+        r = []
+        fields = iter(ds)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while chunk := list(islice(fields, chunk_size)):
+                messages = [self._grib_message(f) for f in chunk]
+                r.extend(executor.map(_regrid, messages))
 
         return ds.from_fields(r)
 
+    @staticmethod
+    def _grib_message(field):
+        from earthkit.data.readers.grib.codes import GribField
+
+        if isinstance(field, GribField):
+            return field.message()
+        elif hasattr(field, "handle"):
+            from earthkit.data import create_encoder
+
+            encoder = create_encoder("grib")
+            return encoder.encode(field).to_bytes()
+        else:
+            raise ValueError(f"field type={type(field)} is not supported in regrid!")
+
 
 class FieldDataHandler(DataHandler):
     @staticmethod
@@ -135,5 +255,11 @@ class FieldDataHandler(DataHandler):
         ds = FieldList.from_fields([values])
         return FieldListDataHandler().regrid(ds, **kwargs)[0]
 
+    async def aregrid(self, values, executor=None, **kwargs):
+        from earthkit.data import FieldList
+
+        ds = FieldList.from_fields([values])
+        return (await FieldListDataHandler().aregrid(ds, executor=executor, **kwargs))[0]
+
 
 handler = [FieldListDataHandler, FieldDataHandler]
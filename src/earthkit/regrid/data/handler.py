@@ -22,6 +22,12 @@ class DataHandler(metaclass=ABCMeta):
     def regrid(self, values, **kwargs):
         pass
 
+    async def aregrid(self, values, executor=None, **kwargs):
+        """Coroutine version of :meth:`regrid`. By default it runs in ``executor``."""
+        from earthkit.regrid.utils.aio import run_in_executor
+
+        return await run_in_executor(executor, self.regrid, values, **kwargs)
+
     def backend_from_kwargs(self, kwargs):
         backend = kwargs.pop("backend", None)
         if backend is None:
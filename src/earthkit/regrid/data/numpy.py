@@ -27,5 +27,11 @@ class NumpyDataHandler(DataHandler):
         backend = self.backend_from_kwargs(kwargs)
         return backend.regrid(values, in_grid, out_grid, **kwargs)
 
+    async def aregrid(self, values, executor=None, **kwargs):
+        in_grid = kwargs.pop("in_grid")
+        out_grid = kwargs.pop("out_grid")
+        backend = self.backend_from_kwargs(kwargs)
+        return await backend.aregrid(values, in_grid, out_grid, executor=executor, **kwargs)
+
 
 handler = NumpyDataHandler
@@ -9,6 +9,7 @@
 
 import functools
 import logging
+import math
 
 from earthkit.regrid.utils import ensure_list
 
@@ -287,6 +288,7 @@ class XarrayDataHandler(DataHandler):
         in_dims = ensure_list(in_dims)
         out_dims = ensure_list(out_dims)
 
+        import numpy as np
         import xarray as xr
 
         exclude_dims = set()
@@ -306,9 +308,17 @@ class XarrayDataHandler(DataHandler):
                 )
 
             def __call__(self, vals):
+                # the geographic dimensions are the last ones. All the other dimensions
+                # are flattened so the whole block is interpolated in one call.
+                leading = vals.shape[: vals.ndim - len(in_dims)]
+                count = math.prod(leading)
+                if count == 0:
+                    return np.empty((*leading, *out_geo.shape), dtype=vals.dtype)
+
+                block = vals.reshape(count, *vals.shape[len(leading) :])
                 # TODO: ensure it is thread safe
-                vals, self.out_grid = self.method(vals)
-                return vals
+                block, self.out_grid = self.method(block)
+                return block.reshape(*leading, *block.shape[1:])
 
         method = _RegridMethod(in_grid.grid_spec, out_geo.grid_spec, **kwargs)
 
@@ -319,7 +329,6 @@ class XarrayDataHandler(DataHandler):
                 input_core_dims=[in_dims],
                 output_core_dims=[out_dims],
                 exclude_dims=exclude_dims,
-                vectorize=True,
                 dask="parallelized",
                 dask_gufunc_kwargs={
                     "output_sizes": {dim: out_geo.shape[i] for i, dim in enumerate(out_dims)},
@@ -7,6 +7,7 @@
 # nor does it submit to any jurisdiction.
 #
 
+import functools
 import logging
 import re
 
@@ -18,6 +19,14 @@ FULL_GLOBE = 360.0
 FULL_GLOBE_EPS = 1e-8
 DEGREE_EPS = 1e-8
 
+# tolerances used when comparing the "grid" of two gridspecs (see np.allclose)
+GRID_ATOL = 1e-6
+GRID_RTOL = 1e-5
+# number of decimals the "grid" values are rounded to in the index keys
+GRID_KEY_DECIMALS = 3
+# maximum number of distinct gridspecs interned by GridSpec.from_dict()
+INTERN_SIZE = 1024
+
 HEALPIX_PATTERN = re.compile(r"[Hh]\d+")
 RGG_PATTERN = re.compile(r"[OoNn]\d+")
 ORCA_PATTERN = re.compile(r"^e?ORCA\d+_[FTUV]$")
@@ -60,6 +69,37 @@ class GridSpec(dict):
 
     @staticmethod
     def from_dict(d):
+        """Create a gridspec from a dict.
+
+        Identical dicts are interned so they are only parsed once. A copy is
+        always returned, so it can be modified without affecting ``d`` or the
+        interned gridspec.
+        """
+        if isinstance(d, GridSpec):
+            return d.copy()
+
+        if not isinstance(d, dict):
+            return GridSpec._from_dict(d)
+
+        try:
+            key = GridSpec._freeze(d)
+            hash(key)
+        except TypeError:
+            # not hashable, e.g. contains a dict or a nested list
+            return GridSpec._from_dict(d)
+        return GridSpec._interned(key).copy()
+
+    @staticmethod
+    def _freeze(d):
+        return tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in d.items()))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=INTERN_SIZE)
+    def _interned(key):
+        return GridSpec._from_dict(dict(key))
+
+    @staticmethod
+    def _from_dict(d):
         gs = dict(GridSpec.DEFAULTS)
         gs.update(d)
         GridSpec._normalise(gs)
@@ -84,6 +124,10 @@ class GridSpec(dict):
 
     def __eq__(self, o):
         # print(f"__eq__ self={self} o={o}")
+        if self is o:
+            return True
+        if not isinstance(o, dict):
+            return False
         if self.get("type", "") != o.get("type", ""):
             return False
 
@@ -104,7 +148,10 @@ class GridSpec(dict):
             else:
                 return v1 == v2
         elif key == "grid" and isinstance(v1, list) and isinstance(v2, list):
-            return np.allclose(np.array(v1), np.array(v2), atol=1e-6)
+            if len(v1) == len(v2):
+                # same as np.allclose() but much faster for short lists
+                return all(abs(x - y) <= GRID_ATOL + GRID_RTOL * abs(y) for x, y in zip(v1, v2))
+            return np.allclose(np.array(v1), np.array(v2), atol=GRID_ATOL)
         elif isinstance(v1, list) and isinstance(v2, list):
             return v1 == v2
         elif isinstance(v1, float) and isinstance(v2, float):
@@ -114,6 +161,70 @@ class GridSpec(dict):
         else:
             return str(v1) == str(v2)
 
+    def copy(self):
+        gs = type(self).__new__(type(self))
+        dict.update(gs, {k: list(v) if isinstance(v, list) else v for k, v in self.items()})
+        gs.__dict__.update(self.__dict__)
+        return gs
+
+    def key(self):
+        """Return an immutable key identifying the gridspec in caches and dicts.
+
+        The gridspec itself is not hashable. Gridspecs with the same key are
+        equal, but gridspecs only equal within the comparison tolerance can have
+        different keys. The key is computed from the current contents, so it
+        follows any modification of the gridspec.
+        """
+        from earthkit.regrid.utils.hash import freeze
+
+        return freeze(self)
+
+    def index_key(self):
+        """Return a hashable key identifying the gridspec in a lookup table.
+
+        The key only contains the type and the rounded grid so gridspecs
+        which are equal according to ``__eq__`` normally have the same key. The
+        remaining keys must be compared with ``__eq__``. Like :meth:`key`, it is
+        computed from the current contents of the gridspec.
+        """
+        return self._index_key(self.get("grid"))
+
+    def index_keys(self):
+        """Return all the keys an equal gridspec can be stored under in a lookup table.
+
+        Rounding the grid values can put gridspecs equal within the comparison
+        tolerance to adjacent keys. This method generates all of them with the
+        canonical key, as returned by :meth:`index_key`, first.
+        """
+        grid = self["grid"]
+        if not isinstance(grid, list):
+            return [self._index_key(grid)]
+
+        import itertools
+
+        values = []
+        for v in grid:
+            tol = GRID_ATOL + GRID_RTOL * abs(v)
+            r = [self._round_grid(v)]
+            for x in (v - tol, v + tol):
+                x = self._round_grid(x)
+                if x not in r:
+                    r.append(x)
+            values.append(r)
+
+        return [(self.get("type"), tuple(x)) for x in itertools.product(*values)]
+
+    def _index_key(self, grid):
+        if isinstance(grid, str):
+            grid = grid.lower()
+        elif isinstance(grid, list):
+            grid = tuple(self._round_grid(v) for v in grid)
+        return (self.get("type"), grid)
+
+    @staticmethod
+    def _round_grid(v):
+        return round(float(v), GRID_KEY_DECIMALS)
+
     @staticmethod
     def same_area(area1, area2, eps=DEGREE_EPS):
         if len(area1) == len(area2):
@@ -0,0 +1,145 @@
+# (C) Copyright 2023 ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+#
+
+import logging
+import threading
+from collections import namedtuple
+
+LOG = logging.getLogger(__name__)
+
+_Progress = namedtuple("Progress", ["done", "total", "failed"])
+
+
+class PrefetchHandle:
+    """Handle to wait on the weights being prefetched by :func:`prefetch`."""
+
+    def __init__(self, pairs, futures, executor):
+        self.pairs = pairs
+        self._futures = futures
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._done = 0
+        self._failed = 0
+        for f in futures:
+            f.add_done_callback(self._on_done)
+
+    def _on_done(self, future):
+        with self._lock:
+            self._done += 1
+            if future.cancelled() or future.exception() is not None:
+                self._failed += 1
+
+    def done(self):
+        """Return True when all the weights have been processed."""
+        return all(f.done() for f in self._futures)
+
+    def progress(self):
+        """Return the number of processed, total and failed items."""
+        with self._lock:
+            return _Progress(self._done, len(self._futures), self._failed)
+
+    def wait(self, timeout=None):
+        """Wait until all the weights have been prefetched.
+
+        Parameters
+        ----------
+        timeout: float, None
+            Maximum number of seconds to wait. None means no limit.
+
+        Returns
+        -------
+        list
+            The paths of the matrix files in the same order as the pairs.
+
+        Raises
+        ------
+        ValueError
+            When no weights are available for a pair.
+        concurrent.futures.TimeoutError
+            When the weights are not ready before ``timeout``.
+        """
+        from concurrent.futures import wait
+
+        _, not_done = wait(self._futures, timeout=timeout)
+        if not_done:
+            from concurrent.futures import TimeoutError
+
+            raise TimeoutError(f"{len(not_done)} of {len(self._futures)} weights not ready in {timeout}s")
+
+        return [f.result() for f in self._futures]
+
+    def cancel(self):
+        """Cancel the weights not yet being prefetched."""
+        for f in self._futures:
+            f.cancel()
+        self._executor.shutdown(wait=False)
+
+
+def _normalise_pair(pair):
+    if isinstance(pair, dict):
+        return pair["in_grid"], pair["out_grid"], pair.get("interpolation", "linear")
+    if len(pair) == 2:
+        return pair[0], pair[1], "linear"
+    if len(pair) == 3:
+        return tuple(pair)
+    raise ValueError(f"Invalid prefetch item={pair}")
+
+
+def prefetch(pairs, *, backend="precomputed", inventory=None, load=False, workers=None):
+    """Prefetch the precomputed weights for a known workload.
+
+    The weights are downloaded into the cache concurrently in background
+    threads. When ``load`` is True they are also loaded into the in-memory
+    weights cache, so subsequent :func:`regrid` calls do not stall on I/O.
+
+    Parameters
+    ----------
+    pairs: list
+        The ``(in_grid, out_grid)`` or ``(in_grid, out_grid, interpolation)``
+        items to prefetch. The default interpolation is "linear".
+    backend: str
+        The backend. Only "precomputed" is supported.
+    inventory: str, None
+        The inventory of the precomputed weights, as in :func:`regrid`.
+    load: bool
+        Load the weights into the in-memory weights cache.
+    workers: int, None
+        The number of concurrent downloads. When None the
+        ``maximum-concurrent-downloads`` config option is used. The downloads
+        from the same host are also limited by ``maximum-connections-per-host``.
+
+    Returns
+    -------
+    PrefetchHandle
+        Handle to check the progress or wait for the weights.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from earthkit.regrid.backends import get_backend
+
+    b_kwargs = {} if inventory is None else {"inventory": inventory}
+    b = get_backend(backend, **b_kwargs)
+    db = getattr(b, "db", None)
+    if db is None:
+        raise ValueError(f"prefetch is not supported for backend={backend}")
+
+    pairs = [_normalise_pair(p) for p in pairs]
+
+    if workers is None:
+        from earthkit.regrid.utils.config import CONFIG
+
+        workers = CONFIG.get("maximum-concurrent-downloads")
+
+    # resolve the index first so the workers do not all load it at once
+    db.open_index()
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="earthkit-regrid-prefetch")
+    futures = [executor.submit(db.prefetch, *p, load=load) for p in pairs]
+    executor.shutdown(wait=False)
+    return PrefetchHandle(pairs, futures, executor)
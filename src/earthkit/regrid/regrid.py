@@ -14,7 +14,7 @@ def _is_array(values):  # IGNORE
     return isinstance(values, np.ndarray)  # IGNORE
 
 
-def regrid(values, grid=None, *, interpolation="linear", backend="mir", **kwargs):
+def _get_data_handler(values):
     from earthkit.regrid.data import get_data_handler
 
     h = get_data_handler(values)
@@ -26,6 +26,25 @@ def regrid(values, grid=None, *, interpolation="linear", backend="mir", **kwargs
         else:
             txt = f"Unsupported type={type(values)}"
         raise ValueError(txt)
+    return h
+
 
+def regrid(values, grid=None, *, interpolation="linear", backend="mir", **kwargs):
+    h = _get_data_handler(values)
     kwargs = kwargs.copy()
     return h.regrid(values, grid=grid, interpolation=interpolation, backend=backend, **kwargs)
+
+
+async def aregrid(values, grid=None, *, interpolation="linear", backend="mir", executor=None, **kwargs):
+    """Coroutine version of :func:`regrid`.
+
+    Finding, downloading and loading the weights does not block the event loop,
+    and the concurrent calls needing the same weights share a single load. The
+    interpolation itself runs in ``executor``. None means the default executor
+    of the running loop.
+    """
+    h = _get_data_handler(values)
+    kwargs = kwargs.copy()
+    return await h.aregrid(
+        values, grid=grid, interpolation=interpolation, backend=backend, executor=executor, **kwargs
+    )
@@ -8,16 +8,21 @@
 #
 import sys
 
-try:
-    # There is a bug in tqdm that expects ipywidgets
-    # to be installed if running in a notebook
-    import ipywidgets  # noqa F401
-    from tqdm.auto import tqdm  # noqa F401
-except ImportError:
-    from tqdm import tqdm  # noqa F401
+
+def _tqdm():
+    # tqdm is only imported when a progress bar is first created
+    try:
+        # There is a bug in tqdm that expects ipywidgets
+        # to be installed if running in a notebook
+        import ipywidgets  # noqa F401
+        from tqdm.auto import tqdm
+    except ImportError:
+        from tqdm import tqdm
+    return tqdm
 
 
 def progress_bar(*, total=None, iterable=None, initial=0, desc=None):
+    tqdm = _tqdm()
     return tqdm(
         iterable=iterable,
         total=total,
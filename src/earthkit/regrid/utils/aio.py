@@ -0,0 +1,45 @@
+# (C) Copyright 2023 ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+#
+
+import asyncio
+import functools
+
+
+async def run_in_executor(executor, func, *args, **kwargs):
+    """Run ``func`` in ``executor`` without blocking the event loop.
+
+    When ``executor`` is None the default executor of the running loop is used.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
+class SharedCalls:
+    """Run blocking calls in the default executor, once per key.
+
+    The coroutines awaiting the same key while a call is in progress share its
+    result. Cancelling one of them does not cancel the call for the others.
+    """
+
+    def __init__(self):
+        self._pending = {}
+
+    async def run(self, key, func, *args):
+        loop = asyncio.get_running_loop()
+        key = (loop, key)
+        future = self._pending.get(key)
+        if future is None:
+            future = loop.run_in_executor(None, func, *args)
+            self._pending[key] = future
+            future.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(future)
+
+
+# matrix lookups shared by the concurrent aregrid() calls
+MATRIX_LOADS = SharedCalls()
@@ -16,7 +16,12 @@ from scipy.sparse import load_npz
 from earthkit.regrid.backends.db import VERSION
 from earthkit.regrid.backends.db import MatrixIndex
 
+from .matrix import DEFAULT_MATRIX_FORMAT
+from .matrix import compact_matrix
+from .matrix import matrix_file_extension
 from .matrix import matrix_memory_size
+from .matrix import save_matrix_mmap
+from .mir import mir_cached_matrix_to_array
 from .mir import mir_cached_matrix_to_file
 
 
@@ -73,7 +78,14 @@ def get_method_name(entry):
     return method
 
 
-def make_matrix(input_path, output_path, index_file=None, global_input=None, global_output=None):
+def make_matrix(
+    input_path,
+    output_path,
+    index_file=None,
+    global_input=None,
+    global_output=None,
+    matrix_format=DEFAULT_MATRIX_FORMAT,
+):
 
     with open(input_path) as f:
         entry = json.load(f)
@@ -106,8 +118,11 @@ def make_matrix(input_path, output_path, index_file=None, global_input=None, glo
     name = key
 
     print(f"entry={entry}")
-    npz_file = os.path.join(matrix_output_path, f"{name}.npz")
-    mir_cached_matrix_to_file(cache_file, npz_file)
+    matrix_file = os.path.join(matrix_output_path, name + matrix_file_extension(matrix_format))
+    if matrix_format == "mmap":
+        save_matrix_mmap(matrix_file, mir_cached_matrix_to_array(cache_file))
+    else:
+        mir_cached_matrix_to_file(cache_file, matrix_file)
 
     if index_file is None:
         index_file = os.path.join(output_path, "index.json")
@@ -133,8 +148,14 @@ def make_matrix(input_path, output_path, index_file=None, global_input=None, glo
         entry["output"]["global"] = 1 if global_output else 0
 
     # get matrix size
-    z = load_npz(npz_file)
-    mem_size = matrix_memory_size(z)
+    if matrix_format == "mmap":
+        from .matrix import load_matrix_mmap
+
+        z = load_matrix_mmap(matrix_file)
+    else:
+        z = load_npz(matrix_file)
+    # the size of the matrix as loaded for the interpolation
+    mem_size = matrix_memory_size(compact_matrix(z))
     z = None
 
     index["matrix"][key] = dict(
@@ -144,9 +165,11 @@ def make_matrix(input_path, output_path, index_file=None, global_input=None, glo
         nnz=entry["matrix"]["nnz"],
         memory=mem_size,
     )
+    if matrix_format != DEFAULT_MATRIX_FORMAT:
+        index["matrix"][key]["format"] = matrix_format
 
     with open(index_file, "w") as f:
         json.dump(index, f, indent=4)
 
-    print("Written", npz_file)
+    print("Written", matrix_file)
     print("Written", index_file)
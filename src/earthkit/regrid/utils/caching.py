@@ -25,6 +25,7 @@ from random import randrange
 
 from earthkit.regrid.utils import humanize
 from earthkit.regrid.utils.config import CONFIG
+from earthkit.regrid.utils.hash import freeze
 from earthkit.regrid.utils.html import css
 from earthkit.regrid.utils.temporary import temp_directory
 
@@ -123,6 +124,9 @@ class CacheManager(threading.Thread):
         self._queue = []
         self._condition = threading.Condition()
         self._policy = EmptyCachePolicy()
+        # accesses of existing cache files not yet written into the database
+        self._accesses = {}
+        self._accesses_lock = threading.Lock()
 
     def run(self):
         while True:
@@ -149,6 +153,11 @@ class CacheManager(threading.Thread):
         # So we can use rows as dictionaries
         connection.row_factory = sqlite3.Row
 
+        # With WAL journaling the readers in other processes do not block the
+        # writer and vice versa. Filesystems not supporting it keep the default mode.
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+
         # If you change the schema, change VERSION above
         connection.execute(
             """
@@ -168,6 +177,49 @@ class CacheManager(threading.Thread):
                     accesses      INTEGER,
                     size          INTEGER);"""
         )
+
+        # The total size of the cache is maintained by triggers, so it is kept
+        # up to date by all the processes sharing the database
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_size (
+                        id            INTEGER PRIMARY KEY CHECK (id = 0),
+                        size          INTEGER NOT NULL);"""
+            )
+            connection.execute(
+                "INSERT OR IGNORE INTO cache_size(id, size) SELECT 0, COALESCE(SUM(size), 0) FROM cache"
+            )
+            connection.execute(
+                """
+                CREATE TRIGGER IF NOT EXISTS cache_size_insert AFTER INSERT ON cache
+                WHEN NEW.size IS NOT NULL
+                BEGIN
+                    UPDATE cache_size SET size = size + NEW.size WHERE id = 0;
+                END;"""
+            )
+            connection.execute(
+                """
+                CREATE TRIGGER IF NOT EXISTS cache_size_update AFTER UPDATE OF size ON cache
+                BEGIN
+                    UPDATE cache_size SET size = size + COALESCE(NEW.size, 0) - COALESCE(OLD.size, 0)
+                    WHERE id = 0;
+                END;"""
+            )
+            connection.execute(
+                """
+                CREATE TRIGGER IF NOT EXISTS cache_size_delete AFTER DELETE ON cache
+                WHEN OLD.size IS NOT NULL
+                BEGIN
+                    UPDATE cache_size SET size = size - OLD.size WHERE id = 0;
+                END;"""
+            )
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+
         return connection
 
     def enqueue(self, func, *args, **kwargs):
@@ -177,11 +229,58 @@ class CacheManager(threading.Thread):
             self._condition.notify_all()
             return s
 
+    def touch(self, path, owner, args, parent=None):
+        """Record an access of an existing cache file without waiting for the database.
+
+        Can be called from any thread. The accesses are written into the database
+        in one batch by the manager thread.
+        """
+        now = datetime.datetime.now()
+        with self._accesses_lock:
+            flush = len(self._accesses) == 0
+            count = self._accesses[path][0] + 1 if path in self._accesses else 1
+            self._accesses[path] = (count, now, owner, args, parent)
+
+        # a flush is already queued when there were pending accesses
+        if flush:
+            self.enqueue(self._flush_accesses)
+
+    def _flush_accesses(self):
+        with self._accesses_lock:
+            accesses, self._accesses = self._accesses, {}
+
+        rows = []
+        for path, (count, now, owner, args, parent) in accesses.items():
+            # the file may have been deleted in the meantime
+            if self._policy.file_in_cache_directory(path) and os.path.exists(path):
+                args = json.dumps(args, default=default_serialiser)
+                rows.append((path, owner, args, now, now, count, parent))
+
+        if rows and self.connection is not None:
+            with self.connection as db:
+                db.executemany(
+                    """
+                    INSERT INTO cache(
+                                    path,
+                                    owner,
+                                    args,
+                                    creation_date,
+                                    last_access,
+                                    accesses,
+                                    parent)
+                    VALUES(?,?,?,?,?,?,?)
+                    ON CONFLICT(path) DO UPDATE
+                    SET accesses    = accesses + excluded.accesses,
+                        last_access = excluded.last_access""",
+                    rows,
+                )
+
     def _ensure_in_cache(self, path):
         assert self._policy.file_in_cache_directory(path), f"File not in cache {path}"
 
     def _config_changed(self, policy):
         LOG.debug("Config changed")
+        self._flush_accesses()
         self._policy = policy
         self._connection = None  # The user may have changed the cache directory
         self._check_cache_size()
@@ -212,6 +311,7 @@ class CacheManager(threading.Thread):
             self._delete_entry(entry)
 
     def _cache_entries(self):
+        self._flush_accesses()
         result = []
         with self.connection as db:
             for n in db.execute("SELECT * FROM cache").fetchall():
@@ -282,7 +382,8 @@ class CacheManager(threading.Thread):
         top = self._policy.directory()
         with self.connection as db:
             for name in os.listdir(top):
-                if name == CACHE_DB:
+                # the database and its -wal, -shm and -journal files
+                if name.startswith(CACHE_DB):
                     continue
 
                 full = os.path.join(top, name)
@@ -406,6 +507,8 @@ class CacheManager(threading.Thread):
 
         LOG.warning("earthkit-regrid cache: trying to free %s", humanize.bytes(bytes))
 
+        # the recently used files must not be selected
+        self._flush_accesses()
         total = 0
 
         with self.connection as db:
@@ -450,16 +553,14 @@ class CacheManager(threading.Thread):
 
             args = json.dumps(args, default=default_serialiser)
 
-            db.execute(
+            changes = db.execute(
                 """
                 UPDATE cache
                 SET accesses    = accesses + 1,
                     last_access = ?
                 WHERE path=?""",
                 (now, path),
-            )
-
-            changes = db.execute("SELECT changes()").fetchone()[0]
+            ).rowcount
 
             if not changes:
                 db.execute(
@@ -481,10 +582,14 @@ class CacheManager(threading.Thread):
     def _cache_size(self):
         LOG.debug("cache_size")
         with self.connection as db:
-            size = db.execute("SELECT SUM(size) FROM cache").fetchone()[0]
-            if size is None:
-                size = 0
-            return size
+            size = db.execute("SELECT size FROM cache_size WHERE id = 0").fetchone()
+            return 0 if size is None else size[0]
+
+    def _cache_entry(self, path):
+        """Return the database entry of ``path`` or None if it is not registered."""
+        with self.connection as db:
+            entry = db.execute("SELECT * FROM cache WHERE path=?", (path,)).fetchone()
+            return None if entry is None else dict(entry)
 
     def _decache_file(self, path):
         self._delete_entry(path)
@@ -539,6 +644,7 @@ class CacheManager(threading.Thread):
         return "".join(html)
 
     def _dump_cache_database(self, matcher=lambda x: True):
+        self._flush_accesses()
         result = []
         with self.connection as db:
             for d in db.execute("SELECT * FROM cache"):
@@ -838,6 +944,13 @@ class Cache:
     def _register_cache_file(self, *args, **kwargs):
         return self._call_manager(False, "register_cache_file", *args, **kwargs)
 
+    def _touch_cache_file(self, *args, **kwargs):
+        if self.policy.managed() and self._manager is not None:
+            self._manager.touch(*args, **kwargs)
+
+    def _cache_entry(self, *args, **kwargs):
+        return self._call_manager(False, "cache_entry", *args, **kwargs)
+
     def _update_entry(self, *args, **kwargs):
         return self._call_manager(False, "update_entry", *args, **kwargs)
 
@@ -930,6 +1043,21 @@ class Cache:
 
 CACHE = Cache()
 
+# The paths of the files found in the cache by cache_file(). Allows to return a
+# cached file without hashing the arguments and without waiting for the database.
+_CACHE_FILE_PATHS = {}
+_CACHE_FILE_PATHS_SIZE = 4096
+
+
+def _cache_file_key(*args):
+    """Return a hashable key made of ``args`` or None if it cannot be created."""
+    try:
+        key = freeze(args)
+        hash(key)
+        return key
+    except TypeError:
+        return None
+
 
 def cache_file(
     owner: str,
@@ -979,6 +1107,14 @@ def cache_file(
     managed = CACHE.policy.managed() and CACHE.directory() is not None
 
     if managed:
+        key = None
+        if not force and replace is None:
+            key = _cache_file_key(CACHE.directory(), owner, args, hash_extra, extension)
+            path = _CACHE_FILE_PATHS.get(key) if key is not None else None
+            if path is not None and os.path.exists(path):
+                CACHE._touch_cache_file(path, owner, args)
+                return path
+
         m = hashlib.sha256()
         m.update(owner.encode("utf-8"))
 
@@ -1000,9 +1136,11 @@ def cache_file(
             ),
         )
 
-        record = CACHE._register_cache_file(path, owner, args)
         if os.path.exists(path):
+            # a cache hit does not wait for the database to be updated
+            CACHE._touch_cache_file(path, owner, args)
             if callable(force):
+                record = CACHE._cache_entry(path) or CACHE._register_cache_file(path, owner, args)
                 owner_data = record["owner_data"]
                 if owner_data is not None:
                     owner_data = json.loads(owner_data)
@@ -1011,9 +1149,10 @@ def cache_file(
             if force:
                 LOG.info(f"decache file by force: {path=}")
                 CACHE._decache_file(path)
-                record = CACHE._register_cache_file(path, owner, args)
 
         if not os.path.exists(path):
+            CACHE._register_cache_file(path, owner, args)
+
             from filelock import FileLock
 
             lock = path + ".lock"
@@ -1030,6 +1169,11 @@ def cache_file(
             except OSError:
                 pass
 
+        if key is not None:
+            if len(_CACHE_FILE_PATHS) >= _CACHE_FILE_PATHS_SIZE:
+                _CACHE_FILE_PATHS.clear()
+            _CACHE_FILE_PATHS[key] = path
+
     else:
         # path can be a file or a directory. We have to make the name unique.
         m = hashlib.sha256()
@@ -190,6 +190,25 @@ CONFIG_AND_HELP = {
         """Timeout when downloading from an url.""",
         getter="_as_seconds",
     ),
+    "maximum-concurrent-downloads": _(
+        8,
+        """Maximum number of files downloaded at the same time when several files
+        are needed at once, e.g. when prefetching weights.""",
+        getter="_as_int",
+    ),
+    "maximum-connections-per-host": _(
+        4,
+        """Maximum number of simultaneous downloads from the same host.""",
+        getter="_as_int",
+    ),
+    "remote-index-check-interval": _(
+        "1h",
+        """The minimum time between two checks of the remote index file for updates.
+        A check is made when no precomputed weights are found in the cached index file.
+        Within this interval such lookups fail without accessing the remote inventory,
+        and a grid pair not found is remembered as long as the index file does not change.""",
+        getter="_as_seconds",
+    ),
     "check-out-of-date-urls": _(
         False,
         "Perform a HTTP request to check if the remote version of a cache file has changed",
@@ -201,8 +220,8 @@ CONFIG_AND_HELP = {
     "maximum-weights-memory-cache-size": _(
         "500MB",
         """The maximum memory size of the in-memory precomputed weight cache in bytes.
-        Only used when ``weights-memory-cache-policy`` is ``"largest"`` or ``"lru"``. Can be
-        set to None.
+        Only used when ``weights-memory-cache-policy`` is ``"largest"``, ``"lru"`` or ``"shared"``.
+        Can be set to None.
         See :ref:`mem_cache` for more information.""",
         getter="_as_bytes",
         none_ok=True,
@@ -211,14 +230,20 @@ CONFIG_AND_HELP = {
         "largest",
         """The in-memory precomputed weights cache policy. {validator}
         See :ref:`mem_cache` for more information.""",
-        validator=ValuesValidator(["off", "unlimited", "largest", "lru"]),
+        validator=ValuesValidator(["off", "unlimited", "largest", "lru", "shared"]),
     ),
     "weights-memory-cache-strict-mode": _(
         False,
         """Raise exception if the weights cannot be fitted into the in-memory cache.
-        Only used when ``weights-memory-cache-policy`` is ``"largest"`` or ``"lru"``.
+        Only used when ``weights-memory-cache-policy`` is ``"largest"``, ``"lru"`` or ``"shared"``.
         See :ref:`mem_cache` for more information.""",
     ),
+    "weights-dtype": _(
+        "float64",
+        """The floating point type the precomputed weights are converted to when loaded. {validator}
+        See :ref:`weights_dtype` for more information.""",
+        validator=ValuesValidator(["float32", "float64"]),
+    ),
 }
 
 
@@ -9,8 +9,8 @@
 
 
 import logging
-
-from multiurl import Downloader
+import threading
+from contextlib import contextmanager
 
 from earthkit.regrid.utils import progress_bar
 from earthkit.regrid.utils.caching import cache_file
@@ -41,6 +41,8 @@ def download_and_cache(
 
     LOG.debug("URL %s", url)
 
+    from multiurl import Downloader
+
     downloader = Downloader(
         url,
         chunk_size=chunk_size,
@@ -74,7 +76,10 @@ def download_and_cache(
         if CONFIG.get("check-out-of-date-urls") is False:
             return False
 
-        if downloader.out_of_date(path, cache_data):
+        with host_slot(url):
+            changed = downloader.out_of_date(path, cache_data)
+
+        if changed:
             if CONFIG.get("download-out-of-date-urls") or update_if_out_of_date:
                 LOG.warning(
                     "Invalidating cache version and re-downloading %s",
@@ -88,11 +93,15 @@ def download_and_cache(
                 )
         return False
 
-    if force is None:
+    # without the check cache_file() can return the cached file straight away
+    if force is None and CONFIG.get("check-out-of-date-urls") is not False:
         force = out_of_date
 
+    # the number of connections to a host is only limited for the actual
+    # downloads, cached files are returned without waiting for a slot
     def download(target, _):
-        downloader.download(target)
+        with host_slot(url):
+            downloader.download(target)
         return downloader.cache_data()
 
     path = cache_file(
@@ -104,3 +113,121 @@ def download_and_cache(
     )
 
     return path
+
+
+_HOST_SLOTS = {}
+_HOST_SLOTS_LOCK = threading.Lock()
+
+
+@contextmanager
+def host_slot(url):
+    """Limit the number of simultaneous downloads from the host of ``url``.
+
+    The limit is defined by the ``maximum-connections-per-host`` config option.
+    """
+    from urllib.parse import urlparse
+
+    host = urlparse(url).netloc
+    with _HOST_SLOTS_LOCK:
+        limit = max(1, CONFIG.get("maximum-connections-per-host"))
+        slot = _HOST_SLOTS.get(host)
+        if slot is None or slot[0] != limit:
+            slot = (limit, threading.BoundedSemaphore(limit))
+            _HOST_SLOTS[host] = slot
+
+    with slot[1]:
+        yield
+
+
+class _AggregatedProgressBar:
+    """Progress bar factory collecting the progress of concurrent downloads
+    into a single bar."""
+
+    def __init__(self, progress_bar, desc=None):
+        self.bar = progress_bar(total=0, desc=desc)
+        self.lock = threading.Lock()
+
+    def __call__(self, *, total=None, initial=0, desc=None, **kwargs):
+        with self.lock:
+            if total is not None and hasattr(self.bar, "total"):
+                self.bar.total += total
+                if hasattr(self.bar, "refresh"):
+                    self.bar.refresh()
+            if initial:
+                self.bar.update(initial)
+        return _ProgressProxy(self)
+
+    def close(self):
+        if hasattr(self.bar, "close"):
+            self.bar.close()
+
+
+class _ProgressProxy:
+    def __init__(self, owner):
+        self.owner = owner
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def close(self):
+        pass
+
+    def update(self, n):
+        with self.owner.lock:
+            self.owner.bar.update(n)
+
+
+def download_many(
+    urls,
+    *,
+    workers=None,
+    progress_bar=progress_bar,
+    maximum_retries=5,
+    retry_after=10,
+    **kwargs,
+):
+    """Download and cache ``urls`` concurrently.
+
+    The downloads run on a thread pool of ``workers`` threads (default: the
+    ``maximum-concurrent-downloads`` config option) and the number of
+    simultaneous downloads from a given host is limited by
+    ``maximum-connections-per-host``. The progress of all the downloads is
+    shown in a single progress bar. Each download is retried as in
+    :func:`download_and_cache`.
+
+    Returns
+    -------
+    list
+        The paths of the cached files in the same order as ``urls``.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    urls = list(urls)
+    if not urls:
+        return []
+
+    if workers is None:
+        workers = CONFIG.get("maximum-concurrent-downloads")
+    workers = max(1, min(workers, len(urls)))
+
+    bar = _AggregatedProgressBar(progress_bar, desc=f"Downloading {len(urls)} files")
+
+    def _download(url):
+        return download_and_cache(
+            url,
+            progress_bar=bar,
+            maximum_retries=maximum_retries,
+            retry_after=retry_after,
+            **kwargs,
+        )
+
+    try:
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="earthkit-regrid-download"
+        ) as executor:
+            return list(executor.map(_download, urls))
+    finally:
+        bar.close()
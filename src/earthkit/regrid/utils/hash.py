@@ -18,3 +18,17 @@ def make_sha(data):
     else:
         m.update(json.dumps(data, sort_keys=True).encode("utf-8"))
     return m.hexdigest()
+
+
+def freeze(data):
+    """Convert ``data`` into a hashable key.
+
+    Dicts are converted into sorted tuples of their items and lists into tuples,
+    recursively. The result is not hashable when ``data`` contains other
+    unhashable values.
+    """
+    if isinstance(data, dict):
+        return (dict, tuple(sorted((k, freeze(v)) for k, v in data.items())))
+    if isinstance(data, (list, tuple)):
+        return tuple(freeze(v) for v in data)
+    return data
@@ -7,6 +7,18 @@
 # nor does it submit to any jurisdiction.
 #
 
+import json
+import struct
+
+# on-disk matrix formats and their file extensions
+MATRIX_FORMATS = {"npz": ".npz", "mmap": ".mmap"}
+DEFAULT_MATRIX_FORMAT = "npz"
+
+MMAP_MAGIC = b"EKRCSR\x00\x01"
+MMAP_VERSION = 1
+MMAP_ALIGNMENT = 64
+_MMAP_ARRAYS = ("indptr", "indices", "data")
+
 
 def matrix_memory_size(m):
     # see: https://stackoverflow.com/questions/11173019/determining-the-byte-size-of-a-scipy-sparse-matrix
@@ -17,3 +29,138 @@ def matrix_memory_size(m):
     except Exception as e:
         print(e)
         return 0
+
+
+def compact_matrix(z, dtype=None):
+    """Return ``z`` as a CSR matrix in the compact layout used for the interpolation.
+
+    The indices are native int32 arrays whenever the shape and the number of
+    non-zeros allow it, they are sorted and contain no duplicates. When ``dtype``
+    is not None the weights are converted to it. Only the arrays that have to
+    change are copied, so a matrix already in this layout is returned as is.
+    """
+    import numpy as np
+    from scipy.sparse import csr_array
+    from scipy.sparse import issparse
+
+    if not issparse(z) or z.format != "csr":
+        z = csr_array(z)
+
+    if max(*z.shape, z.nnz) <= np.iinfo(np.int32).max:
+        index_dtype = np.dtype(np.int32)
+    else:
+        index_dtype = np.dtype(np.int64)
+    data_dtype = np.dtype(z.dtype if dtype is None else dtype).newbyteorder("=")
+
+    arrays = [
+        a if a.dtype == t else a.astype(t)
+        for a, t in zip((z.data, z.indices, z.indptr), (data_dtype, index_dtype, index_dtype))
+    ]
+    if any(a is not b for a, b in zip(arrays, (z.data, z.indices, z.indptr))):
+        canonical = getattr(z, "_has_canonical_format", False)
+        z = csr_array(tuple(arrays), shape=z.shape, copy=False)
+        if canonical:
+            z.has_canonical_format = True
+
+    if not z.has_canonical_format:
+        # the arrays can be read-only views e.g. of a memory map
+        if not (z.indices.flags.writeable and z.data.flags.writeable):
+            z = z.copy()
+        z.sum_duplicates()
+
+    return z
+
+
+def matrix_file_extension(matrix_format):
+    if matrix_format not in MATRIX_FORMATS:
+        raise ValueError(f"Unsupported matrix format={matrix_format}. Must be one of {list(MATRIX_FORMATS)}")
+    return MATRIX_FORMATS[matrix_format]
+
+
+def _align(n):
+    return (n + MMAP_ALIGNMENT - 1) // MMAP_ALIGNMENT * MMAP_ALIGNMENT
+
+
+def save_matrix_mmap(path, z):
+    """Write a CSR matrix in the uncompressed, memory-mappable format.
+
+    The file starts with a magic string and a JSON header followed by the
+    ``indptr``, ``indices`` and ``data`` arrays in little-endian byte order.
+    Each array starts at an offset aligned to 64 bytes so they can be mapped
+    directly by :func:`load_matrix_mmap`.
+    """
+    import numpy as np
+
+    z = compact_matrix(z)
+
+    arrays = {}
+    header = {
+        "version": MMAP_VERSION,
+        "format": "csr",
+        "shape": [int(x) for x in z.shape],
+        "arrays": {},
+    }
+
+    offset = 0
+    for name in _MMAP_ARRAYS:
+        a = getattr(z, name)
+        a = np.ascontiguousarray(a, dtype=a.dtype.newbyteorder("<"))
+        arrays[name] = a
+        header["arrays"][name] = {"dtype": a.dtype.str, "count": int(a.size), "offset": offset}
+        offset = _align(offset + a.nbytes)
+
+    offsets = {k: v["offset"] for k, v in header["arrays"].items()}
+    header = json.dumps(header).encode("utf-8")
+
+    with open(path, "wb") as f:
+        f.write(MMAP_MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        start = _align(f.tell())
+        for name in _MMAP_ARRAYS:
+            f.seek(start + offsets[name])
+            f.write(memoryview(arrays[name]).cast("B"))
+
+
+def _read_mmap_header(f):
+    magic = f.read(len(MMAP_MAGIC))
+    if magic != MMAP_MAGIC:
+        raise ValueError(f"Invalid matrix file, magic={magic}")
+    (size,) = struct.unpack("<Q", f.read(8))
+    header = json.loads(f.read(size).decode("utf-8"))
+    if header.get("version") != MMAP_VERSION:
+        raise ValueError(f"Unsupported matrix file version={header.get('version')}")
+    return header, _align(f.tell())
+
+
+def load_matrix_mmap(path):
+    """Open a matrix written by :func:`save_matrix_mmap` without copying it.
+
+    The arrays of the returned ``csr_array`` are read-only views into a memory
+    map of the file, so the operating system page cache can share them between
+    processes.
+    """
+    import numpy as np
+    from scipy.sparse import csr_array
+
+    with open(path, "rb") as f:
+        header, start = _read_mmap_header(f)
+
+    buf = np.memmap(path, dtype=np.uint8, mode="r")
+
+    arrays = {}
+    for name in _MMAP_ARRAYS:
+        item = header["arrays"][name]
+        dtype = np.dtype(item["dtype"])
+        offset = start + item["offset"]
+        arrays[name] = buf[offset : offset + item["count"] * dtype.itemsize].view(dtype)
+
+    z = csr_array(
+        (arrays["data"], arrays["indices"], arrays["indptr"]),
+        shape=tuple(header["shape"]),
+        copy=False,
+    )
+    # the writer ensures the canonical format, this also prevents scipy from
+    # trying to sort the read-only arrays in place
+    z.has_canonical_format = True
+    return z
@@ -6,22 +6,45 @@
 # granted to it by virtue of its status as an intergovernmental organisation
 # nor does it submit to any jurisdiction.
 #
+import itertools
 import logging
 import threading
-import time
 from abc import ABCMeta
 from abc import abstractmethod
 from collections import OrderedDict
 from collections import namedtuple
+from concurrent.futures import Future
 
 from earthkit.regrid.utils.config import CONFIG
+from earthkit.regrid.utils.hash import freeze
 from earthkit.regrid.utils.hash import make_sha
 from earthkit.regrid.utils.matrix import matrix_memory_size
 
 LOG = logging.getLogger(__name__)
 
 
-_MemoryItem = namedtuple("MemoryItem", ["data", "size", "last"])
+class _MemoryItem:
+    __slots__ = ("data", "size", "last")
+
+    def __init__(self, data, size, last):
+        self.data = data
+        self.size = size
+        self.last = last
+
+
+class _Shard:
+    """Part of the cache with its own lock. Hits only lock the shard of the key."""
+
+    __slots__ = ("lock", "items", "pending", "hits")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.items = OrderedDict()
+        # items being loaded: key -> Future
+        self.pending = {}
+        self.hits = 0
+
+
 _CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize", "count", "policy"])
 
 
@@ -36,14 +59,25 @@ def matrix_size(m):
         return 0
 
 
-def estimate_matrix_size(entry):
-    """Estimate the size of a matrix entry"""
+def estimate_matrix_size(entry, dtype=None):
+    """Estimate the size of a matrix entry.
+
+    The size in the entry is for float64 weights. When ``dtype`` is not None it
+    is adjusted for the weights converted to ``dtype``.
+    """
     try:
-        return entry["_raw"]["memory"]
+        size = entry["_raw"]["memory"]
     except Exception as e:
         LOG.warning(f"Could not estimate weights memory size from entry={entry}. {e}")
         return 0
 
+    nnz = entry["_raw"].get("nnz")
+    if dtype is not None and nnz:
+        import numpy as np
+
+        size -= nnz * max(0, 8 - np.dtype(dtype).itemsize)
+    return size
+
 
 class MemoryCachePolicy(metaclass=ABCMeta):
     name = None
@@ -74,6 +108,14 @@ class MemoryCachePolicy(metaclass=ABCMeta):
     def has_limit(self):
         pass
 
+    def attach(self, key):
+        """Return the item with ``key`` when it is available outside the cache"""
+        return None
+
+    def publish(self, key, data):
+        """Make a newly loaded item available outside the cache"""
+        return data
+
 
 class NoPolicy(MemoryCachePolicy):
     name = "off"
@@ -121,14 +163,8 @@ class LRUPolicy(MemoryCachePolicy):
 
     def reduce(self, target_size):
         # must be called within a lock
-        if not self.cache.items:
-            return
-
         while self.cache.curr_mem >= target_size:
-            _, item = self.cache.items.popitem(0)
-            self.cache.curr_mem -= item.size
-            del item
-            if not self.cache.items:
+            if not self.cache._evict(self.cache._oldest()):
                 break
 
     def has_cache(self):
@@ -149,17 +185,8 @@ class LargestPolicy(MemoryCachePolicy):
 
     def reduce(self, target_size):
         # must be called within a lock
-        if not self.cache.items:
-            return
-
         while self.cache.curr_mem >= target_size:
-            _, largest = max((v.size, k) for k, v in self.cache.items.items())
-            self.cache.curr_mem -= self.cache.items[largest].size
-            if self.cache.curr_mem < 0:
-                self.cache.curr_mem = 0
-            # LOG.debug(f"evicting={self.cache.items[largest]} curr_mem={self.cache.curr_mem}")
-            del self.cache.items[largest]
-            if not self.cache.items:
+            if not self.cache._evict(self.cache._largest()):
                 break
 
     def has_cache(self):
@@ -169,7 +196,45 @@ class LargestPolicy(MemoryCachePolicy):
         return True
 
 
-CACHE_POLICIES = {p.name: p for p in [NoPolicy, UnlimitedPolicy, LRUPolicy, LargestPolicy]}
+class SharedPolicy(LRUPolicy):
+    """LRU policy with the matrices shared between processes.
+
+    The matrices are published in shared memory so other processes using the
+    same policy can attach to them without loading them from disk. The maximum
+    memory size limits both the local cache and the total size of the shared
+    matrices.
+    """
+
+    name = "shared"
+    _store = None
+
+    @property
+    def store(self):
+        if SharedPolicy._store is None:
+            from earthkit.regrid.utils.shm import SharedMatrixStore
+
+            SharedPolicy._store = SharedMatrixStore()
+        return SharedPolicy._store
+
+    def attach(self, key):
+        try:
+            return self.store.attach(key)
+        except Exception as e:
+            LOG.warning(f"Could not attach to shared weights. {e}")
+            return None
+
+    def publish(self, key, data):
+        if data[0] is None:
+            return data
+        try:
+            shared = self.store.publish(key, data[0], data[1], self.cache.max_mem)
+        except Exception as e:
+            LOG.warning(f"Could not publish weights to shared memory. {e}")
+            shared = None
+        return data if shared is None else shared
+
+
+CACHE_POLICIES = {p.name: p for p in [NoPolicy, UnlimitedPolicy, LRUPolicy, LargestPolicy, SharedPolicy]}
 
 
 class MemoryCache:
@@ -183,25 +248,35 @@ class MemoryCache:
         size_fn=None,
         policy="largest",
         strict=False,
+        shards=16,
     ):
         """
         Memory bound in-memory cache for interpolation matrices.
 
+        The items are distributed into ``shards`` by their key, each shard having
+        its own lock, so concurrent hits on different keys do not contend. The
+        global lock is only taken when an item is added or evicted.
+
         Parameters
         ----------
         max_mem: int
             Maximum memory size in bytes. 0 means no cache. None means no limit.
         size_fn: callable
             Function that returns the size of an item in the cache.
-        size_settings_key: str
-            Key in the settings that holds the maximum memory size.
-        policy_settings_key: str
-            Key in the settings that holds the cache policy.
+        policy: str
+            The cache policy.
+        strict: bool
+            Raise an exception if an item cannot be fitted into the cache.
+        shards: int
+            Number of shards.
         """
-        self.items = OrderedDict()
+        if shards < 1:
+            raise ValueError(f"shards must be positive, got {shards}")
+        self.shards = [_Shard() for _ in range(shards)]
+        # logical clock for the access times
+        self._clock = itertools.count()
         self.max_mem = max_mem
         self.curr_mem = 0
-        self.hits = 0
         self.misses = 0
 
         if size_fn is None:
@@ -220,35 +295,95 @@ class MemoryCache:
         self.lock = threading.Lock()
         self.update()
 
+    @property
+    def hits(self):
+        return sum(shard.hits for shard in self.shards)
+
+    def _shard(self, key):
+        return self.shards[hash(key) % len(self.shards)]
+
     def get(self, *args, create=None, find_entry=None, create_from_entry=None):
         if not self.policy.has_cache():
             return create(*args)
 
-        with self.lock:
-            if not self.policy.has_cache():
-                return create(*args)
-
-            key = make_sha(args)
-            if key in self.items:
-                item = self.items[key]
-                # TODO: move_to_end is only required for the "lru" policy
-                self.items.move_to_end(key)
-                self.hits += 1
-                return item.data
-
-            if self.policy.has_limit():
-                data = self._create_with_pre_check(find_entry, create_from_entry, *args)
+        key = self._key(args)
+        shard = self._shard(key)
+        with shard.lock:
+            if self.policy.has_cache():
+                item = shard.items.get(key)
+                if item is not None:
+                    # TODO: move_to_end is only required for the "lru" policy
+                    shard.items.move_to_end(key)
+                    item.last = next(self._clock)
+                    shard.hits += 1
+                    return item.data
+
+                # only one thread loads a given item, the others wait for the result
+                future = shard.pending.get(key)
+                loading = future is None
+                if loading:
+                    future = Future()
+                    shard.pending[key] = future
+                else:
+                    shard.hits += 1
             else:
-                data = self._create(create, *args)
+                future = None
 
+        if future is None:
+            return create(*args)
+
+        if not loading:
+            return future.result()
+
+        # the item is loaded without holding any lock so other threads
+        # can still access the cache
+        try:
+            data = self.policy.attach(self._store_key(key, args))
+            if data is None:
+                if self.policy.has_limit() and find_entry is not None:
+                    data = self._create_with_pre_check(find_entry, create_from_entry, *args)
+                else:
+                    data = self._create(create, *args)
+                data = self.policy.publish(self._store_key(key, args), data)
+        except BaseException as e:
+            with shard.lock:
+                shard.pending.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self.lock:
             self.misses += 1
 
-            if data[0] is not None:
-                self.items[key] = _MemoryItem(data, self.size_fn(data[0]), time.time())
-                self.curr_mem += self.items[key].size
+            if data[0] is not None and self.policy.has_cache():
+                size = self.size_fn(data[0])
+                with shard.lock:
+                    old = shard.items.pop(key, None)
+                    shard.items[key] = _MemoryItem(data, size, next(self._clock))
+                    shard.pending.pop(key, None)
+                self.curr_mem += size - (old.size if old is not None else 0)
                 self._reduce()
+            else:
+                with shard.lock:
+                    shard.pending.pop(key, None)
 
-            return data
+        future.set_result(data)
+        return data
+
+    @staticmethod
+    def _key(args):
+        # the arguments, e.g. gridspecs, are converted into a hashable key when
+        # possible. Hashing it is much cheaper than serialising them into a sha.
+        try:
+            key = freeze(args)
+            hash(key)
+            return key
+        except TypeError:
+            return make_sha(args)
+
+    @staticmethod
+    def _store_key(key, args):
+        # the policies storing the items outside the process need a string key
+        return key if isinstance(key, str) else make_sha(args)
 
     def _create(self, create, *args):
         if create is None:
@@ -263,21 +398,22 @@ class MemoryCache:
 
         entry = find_entry(*args)
         if entry is not None:
-            capacity = self._capacity()
-            estimated_memory = estimate_matrix_size(entry)
-            target_size = self.max_mem - estimated_memory
-            # LOG.debug(f"{capacity=} {estimated_memory=} {target_size=}")
-            if estimated_memory > capacity and estimated_memory <= self.max_mem:
-                assert target_size >= 0
-                self._reduce(target_size=target_size)
-
-            if self.strict and self._capacity() < estimated_memory:
-                raise ValueError(
-                    (
-                        "Weights too large to fit in memory cache. "
-                        f"Estimated size: {estimated_memory} bytes > capacity: {self._capacity()} bytes"
+            with self.lock:
+                capacity = self._capacity()
+                estimated_memory = estimate_matrix_size(entry, CONFIG.get("weights-dtype"))
+                target_size = self.max_mem - estimated_memory
+                # LOG.debug(f"{capacity=} {estimated_memory=} {target_size=}")
+                if estimated_memory > capacity and estimated_memory <= self.max_mem:
+                    assert target_size >= 0
+                    self._reduce(target_size=target_size)
+
+                if self.strict and self._capacity() < estimated_memory:
+                    raise ValueError(
+                        (
+                            "Weights too large to fit in memory cache. "
+                            f"Estimated size: {estimated_memory} bytes > capacity: {self._capacity()} bytes"
+                        )
                     )
-                )
 
         return create_from_entry(entry)
 
@@ -325,6 +461,41 @@ class MemoryCache:
             self.curr_mem = self._curr_mem()
             self.policy.reduce(target_size=target_size)
 
+    def _oldest(self):
+        # must be called within a lock
+        oldest = None
+        for shard in self.shards:
+            with shard.lock:
+                if shard.items:
+                    # the items are ordered by access time within a shard
+                    key, item = next(iter(shard.items.items()))
+                    if oldest is None or item.last < oldest[2]:
+                        oldest = (shard, key, item.last)
+        return oldest
+
+    def _largest(self):
+        # must be called within a lock
+        largest = None
+        for shard in self.shards:
+            with shard.lock:
+                for key, item in shard.items.items():
+                    # on equal sizes the least recently used item is selected. The keys
+                    # are never compared since they are not necessarily orderable.
+                    if largest is None or (item.size, -item.last) > largest[2]:
+                        largest = (shard, key, (item.size, -item.last))
+        return largest
+
+    def _evict(self, selected):
+        # must be called within a lock
+        if selected is None:
+            return False
+        shard, key, _ = selected
+        with shard.lock:
+            item = shard.items.pop(key, None)
+        if item is not None:
+            self.curr_mem = max(0, self.curr_mem - item.size)
+        return True
+
     def clear(self):
         """Clear the cache"""
         with self.lock:
@@ -332,14 +503,28 @@ class MemoryCache:
 
     def _clear(self):
         # must be called within a lock
-        self.items.clear()
-        self.hits = 0
+        for shard in self.shards:
+            with shard.lock:
+                shard.items.clear()
+                shard.hits = 0
         self.misses = 0
         self.curr_mem = 0
 
     def _curr_mem(self):
         # must be called within a lock
-        return sum(v.size for v in self.items.values())
+        total = 0
+        for shard in self.shards:
+            with shard.lock:
+                total += sum(v.size for v in shard.items.values())
+        return total
+
+    def _count(self):
+        # must be called within a lock
+        count = 0
+        for shard in self.shards:
+            with shard.lock:
+                count += len(shard.items)
+        return count
 
     def info(self):
         """Report cache statistics"""
@@ -349,7 +534,7 @@ class MemoryCache:
                 self.misses,
                 self.max_mem,
                 self.curr_mem,
-                len(self.items),
+                self._count(),
                 self.policy.name,
             )
 
@@ -9,6 +9,7 @@
 # nor does it submit to any jurisdiction.
 #
 
+import tempfile
 from pathlib import Path
 from typing import Dict
 from typing import List
@@ -23,7 +24,7 @@ from .stream import Stream
 
 def dtype_uint(little_endian, size):
     order = "<" if little_endian else ">"
-    return np.dtype({4: np.uint32}[size]).newbyteorder(order)
+    return np.dtype({4: np.uint32, 8: np.uint64}[size]).newbyteorder(order)
 
 
 def dtype_float(little_endian, size):
@@ -31,6 +32,30 @@ def dtype_float(little_endian, size):
     return np.dtype({4: np.float32, 8: np.float64}[size]).newbyteorder(order)
 
 
+def _read_blob_array(s, dtype):
+    """Read a large blob straight into a native-endian array of ``dtype``.
+
+    The bytes are swapped in place when the blob is not in native byte order.
+    """
+    size = s.read_large_blob_size()
+    if size % dtype.itemsize != 0:
+        raise ValueError(f"Blob size={size} is not a multiple of the item size={dtype.itemsize}")
+
+    a = np.empty(size // dtype.itemsize, dtype=dtype.newbyteorder("="))
+    s.read_into(a)
+    if not dtype.isnative:
+        a.byteswap(inplace=True)
+    return a
+
+
+def _as_index_array(a):
+    # scipy needs signed indices. Unsigned 32-bit indices are reinterpreted as
+    # int32 without copying when all the values fit, otherwise scipy converts them.
+    if a.dtype == np.uint32 and (a.size == 0 or a.max() < 2**31):
+        return a.view(np.int32)
+    return a
+
+
 def mir_cached_matrix_to_array(path):
     with open(path, "rb") as f:
         s = Stream(f)
@@ -43,24 +68,9 @@ def mir_cached_matrix_to_array(path):
         scalar_item_size = s.read_unsigned_long()  # sizeof(scalar)
         s.read_unsigned_long()  # sizeof(size), ignored
 
-        outer = s.read_large_blob()  # outer
-        inner = s.read_large_blob()  # inner
-        data = s.read_large_blob()  # data
-
-        outer = np.frombuffer(
-            outer,
-            dtype=dtype_uint(little_endian, index_item_size),
-        )
-
-        inner = np.frombuffer(
-            inner,
-            dtype=dtype_uint(little_endian, index_item_size),
-        )
-
-        data = np.frombuffer(
-            data,
-            dtype=dtype_float(little_endian, scalar_item_size),
-        )
+        outer = _as_index_array(_read_blob_array(s, dtype_uint(little_endian, index_item_size)))
+        inner = _as_index_array(_read_blob_array(s, dtype_uint(little_endian, index_item_size)))
+        data = _read_blob_array(s, dtype_float(little_endian, scalar_item_size))
 
         return csr_array((data, inner, outer), shape=(rows, cols))
 
@@ -143,6 +153,17 @@ def mir_make_matrix(
     else:
         raise ValueError("mir_make_matrix: output grid or lats/lons must be provided.")
 
+    for key, val in kwargs.items():
+        job.set(key, val)
+
+    if output is None:
+        # the matrix is only returned, MIR still has to write it into a file
+        with tempfile.TemporaryDirectory() as tmp:
+            mat = Path(tmp) / "matrix.mat"
+            job.set("interpolation-matrix", str(mat))
+            _execute_make_matrix(job, input, mat)
+            return mir_cached_matrix_to_array(mat)
+
     mat = Path(output)
     if ext == ".mat":
         job.set("interpolation-matrix", str(mat))
@@ -150,24 +171,25 @@ def mir_make_matrix(
         mat = mat.with_name(mat.name + ".mat")  # later unlinked
         job.set("interpolation-matrix", str(mat))
 
-    for key, val in kwargs.items():
-        job.set(key, val)
+    _execute_make_matrix(job, input, mat)
+
+    if ext == ".npz":
+        mir_cached_matrix_to_file(str(mat), output)
+        mat.unlink()
+        assert Path(output).exists()
+
+
+def _execute_make_matrix(job, input, mat):
+    import mir
 
     try:
         job.execute(input, mir.EmptyOutput())
     except Exception as e:
         raise RuntimeError(f"mir_make_matrix: error: {e}.") from e
 
-    if ext and not mat.exists():
+    if not mat.exists():
         raise FileNotFoundError(f"mir_make_matrix: matrix file '{mat}' not found.")
 
-    if ext == ".npz":
-        mir_cached_matrix_to_file(str(mat), output)
-        mat.unlink()
-        assert Path(output).exists()
-    elif not ext:
-        return mir_cached_matrix_to_array(mat)
-
 
 if __name__ == "__main__":
     import argparse
@@ -0,0 +1,299 @@
+# (C) Copyright 2023 ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+#
+
+import atexit
+import getpass
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+LOG = logging.getLogger(__name__)
+
+# CSR arrays and the suffix of their segment names
+_ARRAYS = {"data": "d", "indices": "i", "indptr": "p"}
+_SEGMENT_PREFIX = "ekr"
+
+
+def _open_segment(name, create=False, size=0):
+    """Open the segment ``name`` without registering it with the resource tracker.
+
+    The resource tracker would unlink the segment when this process exits, even if
+    other processes are still using it. The lifetime of the segments is managed by
+    the registry instead.
+    """
+    from multiprocessing import shared_memory
+
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+
+    shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+    if os.name == "posix":
+        # before Python 3.13 every process creating or attaching to a segment registers it
+        try:
+            from multiprocessing import resource_tracker
+
+            resource_tracker.unregister("/" + shm.name, "shared_memory")
+        except Exception:
+            pass
+    return shm
+
+
+class _Segment:
+    """Keep a segment mapped as long as the arrays created from it are alive.
+
+    The arrays created by ``numpy.asarray()`` refer to this object, which owns the
+    SharedMemory. The segment is closed when the last array is garbage collected.
+    """
+
+    def __init__(self, name, dtype, count):
+        import numpy as np
+
+        self.shm = _open_segment(name)
+        dtype = np.dtype(dtype)
+        # the temporary array only provides the address of the data
+        address = np.frombuffer(self.shm.buf, dtype=dtype, count=count).ctypes.data
+        self.__array_interface__ = {
+            "shape": (count,),
+            "typestr": dtype.str,
+            "data": (address, True),
+            "version": 3,
+        }
+
+
+class SharedMatrixStore:
+    """Registry of interpolation matrices published in shared memory.
+
+    The first process loading a matrix publishes its CSR arrays into
+    ``multiprocessing.shared_memory`` segments and records them in a small
+    registry file. The other processes attach to the segments without copying
+    the data. The total size of the published matrices is bounded by the
+    ``max_mem`` passed to :meth:`publish`; when it is exceeded the matrices
+    published first are unlinked. The registry is only written when matrices are
+    published or unlinked, attaching to a matrix only reads it. The matrices are
+    unlinked when the process that published them exits. Processes already
+    attached to an unlinked matrix can use it until they drop all the references
+    to it.
+
+    Parameters
+    ----------
+    name: str, None
+        Name of the registry. Processes using the same name share the matrices.
+        When None a per-user default name is used.
+    """
+
+    def __init__(self, name=None):
+        if name is None:
+            name = f"earthkit-regrid-shm-{getpass.getuser()}"
+        self.name = name
+        self.path = os.path.join(tempfile.gettempdir(), name + ".json")
+        self._lock = threading.Lock()
+        self._published = set()
+
+    def _read_registry(self):
+        # the registry is replaced atomically so it can be read without locking
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception:
+            LOG.warning(f"Ignoring invalid shared memory registry={self.path}")
+            return {}
+
+    @contextmanager
+    def _registry(self):
+        from filelock import FileLock
+
+        with self._lock, FileLock(self.path + ".lock"):
+            registry = self._read_registry()
+
+            yield registry
+
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(registry, f)
+            os.replace(tmp, self.path)
+
+    @staticmethod
+    def segment_name(key, array):
+        return f"{_SEGMENT_PREFIX}{key[:16]}{_ARRAYS[array]}"
+
+    def attach(self, key):
+        """Return the matrix published with ``key`` or None if it is not available.
+
+        Returns
+        -------
+        tuple, None
+            The matrix and the shape of the output grid.
+        """
+        item = self._read_registry().get(key)
+        if item is None:
+            return None
+
+        try:
+            return self._attach(key, item)
+        except FileNotFoundError:
+            # the segments are gone, e.g. the machine was rebooted
+            LOG.debug(f"Shared memory segments for {key=} not found")
+
+        with self._registry() as registry:
+            if registry.get(key) == item:
+                registry.pop(key)
+        return None
+
+    def publish(self, key, z, shape, max_mem):
+        """Publish the matrix ``z`` and attach to it.
+
+        Returns
+        -------
+        tuple, None
+            The matrix backed by shared memory and the shape of the output grid.
+            None is returned when the matrix cannot fit into ``max_mem``.
+        """
+        from scipy.sparse import csr_array
+
+        z = csr_array(z)
+        size = sum(getattr(z, a).nbytes for a in _ARRAYS)
+        if max_mem is not None and size > max_mem:
+            return None
+
+        with self._registry() as registry:
+            if key in registry:
+                # another process published it in the meantime
+                try:
+                    return self._attach(key, registry[key])
+                except FileNotFoundError:
+                    registry.pop(key, None)
+
+            if max_mem is not None:
+                self._reduce(registry, max_mem - size)
+
+            item = {
+                "arrays": {},
+                "shape": list(z.shape),
+                "out_shape": shape,
+                "size": size,
+            }
+            for a in _ARRAYS:
+                v = getattr(z, a)
+                name = self.segment_name(key, a)
+                shm = self._create_segment(name, max(v.nbytes, 1))
+                try:
+                    self._as_array(shm.buf, v.dtype.str, v.size)[:] = v
+                finally:
+                    shm.close()
+                item["arrays"][a] = {
+                    "name": name,
+                    "dtype": v.dtype.str,
+                    "count": int(v.size),
+                }
+
+            item["last"] = time.time()
+            item["pid"] = os.getpid()
+            registry[key] = item
+
+            if not self._published:
+                atexit.register(self.close)
+            self._published.add(key)
+
+            return self._attach(key, item)
+
+    def size(self):
+        """Total size of the published matrices in bytes."""
+        with self._registry() as registry:
+            return sum(v["size"] for v in registry.values())
+
+    def purge(self):
+        """Unlink all the published matrices."""
+        with self._registry() as registry:
+            self._reduce(registry, 0)
+
+    def close(self):
+        """Unlink the matrices published by this process.
+
+        Called when the process exits. Processes already attached to the matrices
+        can use them until they drop all the references to them.
+        """
+        if not self._published:
+            return
+
+        pid = os.getpid()
+        with self._registry() as registry:
+            for key in self._published:
+                item = registry.get(key)
+                # e.g. evicted and published again by another process
+                if item is not None and item.get("pid") == pid:
+                    self._unlink(item)
+                    del registry[key]
+        self._published.clear()
+
+    def _reduce(self, registry, target_size):
+        # must be called with the registry locked
+        total = sum(v["size"] for v in registry.values())
+        for key, item in sorted(registry.items(), key=lambda x: x[1]["last"]):
+            if total <= target_size:
+                break
+            self._unlink(item)
+            total -= item["size"]
+            del registry[key]
+
+    def _attach(self, key, item):
+        import numpy as np
+        from scipy.sparse import csr_array
+
+        arrays = {}
+        for a in _ARRAYS:
+            d = item["arrays"][a]
+            # read-only arrays
+            arrays[a] = np.asarray(_Segment(d["name"], d["dtype"], d["count"]))
+
+        z = csr_array(
+            (arrays["data"], arrays["indices"], arrays["indptr"]),
+            shape=tuple(item["shape"]),
+            copy=False,
+        )
+        z.has_canonical_format = True
+        return z, item["out_shape"]
+
+    @staticmethod
+    def _as_array(buf, dtype, count):
+        import numpy as np
+
+        return np.frombuffer(buf, dtype=np.dtype(dtype), count=count)
+
+    @staticmethod
+    def _create_segment(name, size):
+        from multiprocessing import shared_memory
+
+        try:
+            return _open_segment(name, create=True, size=size)
+        except FileExistsError:
+            # stale segment not in the registry
+            old = shared_memory.SharedMemory(name=name)
+            old.close()
+            old.unlink()
+            return _open_segment(name, create=True, size=size)
+
+    @staticmethod
+    def _unlink(item):
+        from multiprocessing import shared_memory
+
+        for d in item["arrays"].values():
+            try:
+                # unlink() also unregisters the segment from the resource tracker
+                shm = shared_memory.SharedMemory(name=d["name"])
+                shm.close()
+                shm.unlink()
+            except FileNotFoundError:
+                pass
@@ -35,6 +35,8 @@ TAG_EOF = 20
 TAG_LARGE_BLOB = 21  # For blobs >= 2Gb
 LAST_TAG = 22
 
+READ_CHUNK_SIZE = 1024 * 1024 * 1024
+
 TAG_NAME = (
     "0",
     "start of object",
@@ -216,6 +218,32 @@ class Stream:
         len = unpack("!Q", self._read(8))[0]
         return self._read(len)
 
+    def read_large_blob_size(self):
+        """Read the header of a large blob and return the size of its data in bytes.
+
+        The data has to be read next, e.g. with :meth:`read_into`.
+        """
+        self.read_tag(TAG_LARGE_BLOB)
+        return unpack("!Q", self._read(8))[0]
+
+    def read_into(self, buffer, chunk_size=READ_CHUNK_SIZE):
+        """Fill ``buffer`` (a writable bytes-like object) from the stream without
+        intermediate copies. The data is read in chunks since a single read
+        is limited to about 2GB on some platforms."""
+        view = memoryview(buffer).cast("B")
+        pos = 0
+        while pos < len(view):
+            n = self.stream.readinto(view[pos : pos + chunk_size])
+            if not n:
+                raise EOFError(f"Unexpected end of stream after {pos} bytes, expected {len(view)}")
+            pos += n
+
+    def write_large_blob(self, data):
+        self.write_tag(TAG_LARGE_BLOB)
+        data = memoryview(data).cast("B")
+        self._write(pack("!Q", len(data)), 8)
+        self._write(data, len(data))
+
     def start_object(self):
         self.write_tag(TAG_START_OBJ)
 
@@ -326,7 +326,7 @@ def test_local_memcache_ensure_strict_1(monkeypatch):
         assert MEMORY_CACHE.misses == 0
         assert MEMORY_CACHE.info() == (0, 0, max_mem, 0, 0, policy)
 
-        def _estimate_memory(entry):
+        def _estimate_memory(entry, dtype=None):
             return max_mem + 1
 
         from earthkit.regrid.utils import memcache
@@ -360,7 +360,7 @@ def test_local_memcache_strict_2(monkeypatch):
         assert MEMORY_CACHE.misses == 0
         assert MEMORY_CACHE.info() == (0, 0, max_mem, 0, 0, policy)
 
-        def _estimate_memory(entry):
+        def _estimate_memory(entry, dtype=None):
             return max_mem - 1
 
         from earthkit.regrid.utils import memcache
@@ -393,3 +393,32 @@ def test_local_memcache_strict_2(monkeypatch):
         info = MEMORY_CACHE.info()
         assert info.currsize < mem_first
         assert MEMORY_CACHE.info() == (1, 2, max_mem, MEMORY_CACHE.curr_mem, 1, policy)
+
+
+def test_local_memcache_largest_equal_sizes():
+    """Test that items of equal sizes with keys that cannot be ordered are evicted"""
+    from earthkit.regrid import config
+    from earthkit.regrid.gridspec import GridSpec
+    from earthkit.regrid.utils.memcache import MemoryCache
+
+    policy = "largest"
+    max_mem = 25
+
+    with config.temporary():
+        config.set("weights-memory-cache-policy", policy)
+        config.set("maximum-weights-memory-cache-size", max_mem)
+
+        cache = MemoryCache(max_mem=max_mem, size_fn=len, policy=policy, shards=1)
+
+        def _create(*args):
+            return ("x" * 10, None)
+
+        # gridspec keys and a sha key from an unhashable argument
+        cache.get(GridSpec.from_dict({"grid": "O32"}), "linear", create=_create)
+        cache.get(GridSpec.from_dict({"grid": "O64"}), "linear", create=_create)
+        cache.get({"grid": [1, 1]}, "linear", create=_create)
+
+        # the least recently used item is evicted
+        assert cache.info() == (0, 3, max_mem, 20, 2, policy)
+        cache.get(GridSpec.from_dict({"grid": "O64"}), "linear", create=_create)
+        assert cache.hits == 1
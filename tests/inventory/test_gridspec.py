@@ -132,3 +132,130 @@ def test_gridspec_bad(gs_in, gs_out, err):
     else:
         r = SYS_DB.find_entry(gs_in, gs_out, "linear")
         assert r is None, f"gs_in={gs_in} gs_out={gs_out}"
+
+
+@pytest.mark.parametrize(
+    "gs1,gs2",
+    [
+        ({"grid": [0.2815, 0.2815]}, {"grid": [0.2815002, 0.2815002]}),
+        ({"grid": [10, 10]}, {"grid": [10.00005, 9.99995]}),
+        ({"grid": "O32"}, {"grid": "o32"}),
+        ({"grid": "H4", "order": "nested"}, {"grid": "h4", "order": "nested"}),
+    ],
+)
+def test_gridspec_index_keys(gs1, gs2):
+    from earthkit.regrid.gridspec import GridSpec
+
+    gs1 = GridSpec.from_dict(gs1)
+    gs2 = GridSpec.from_dict(gs2)
+    assert gs1 == gs2
+    assert gs1.index_keys()[0] == gs1.index_key()
+    assert gs1.index_key() in gs2.index_keys()
+    assert gs2.index_key() in gs1.index_keys()
+
+
+@pytest.mark.parametrize(
+    "gs1,gs2",
+    [
+        ({"grid": [0.25, 0.25]}, {"grid": (0.25, 0.25)}),
+        ({"grid": [10, 10], "area": [90, 0, -90, 350]}, {"area": (90, 0, -90, 350), "grid": [10, 10]}),
+        ({"grid": "O32"}, {"grid": "O32", "i_scans_negatively": 0}),
+        ({"grid": "H4", "order": "nested"}, {"grid": "H4", "ordering": "nested"}),
+    ],
+)
+def test_gridspec_key(gs1, gs2):
+    from earthkit.regrid.gridspec import GridSpec
+
+    gs1 = GridSpec.from_dict(gs1)
+    gs2 = GridSpec.from_dict(gs2)
+    assert gs1.key() == gs2.key()
+    assert {gs1.key(): 1}[gs2.key()] == 1
+    assert {(gs1.key(), "linear"): 1}[(gs2.key(), "linear")] == 1
+    assert gs1 != "O32"
+
+    # the gridspecs are mutable so cannot be hashed
+    with pytest.raises(TypeError):
+        hash(gs1)
+
+
+def test_gridspec_key_tolerance():
+    from earthkit.regrid.gridspec import GridSpec
+
+    # equal within the tolerance but with different keys
+    gs1 = GridSpec.from_dict({"grid": [0.2815, 0.2815]})
+    gs2 = GridSpec.from_dict({"grid": [0.2815002, 0.2815002]})
+    assert gs1 == gs2
+    assert gs1.key() != gs2.key()
+
+
+def test_gridspec_from_dict_interned():
+    from earthkit.regrid.gridspec import GridSpec
+
+    gs = GridSpec.from_dict({"grid": [1, 1], "area": [90, 0, -90, 359]})
+    assert GridSpec.from_dict({"area": [90, 0, -90, 359], "grid": [1, 1]}) == gs
+    assert GridSpec.from_dict({"grid": (1, 1), "area": (90, 0, -90, 359)}).key() == gs.key()
+    r = GridSpec.from_dict(gs)
+    assert r == gs and r is not gs
+    r["grid"][0] = 3
+    assert gs["grid"] == [1, 1]
+    assert GridSpec.from_dict({"grid": [2, 2]}) != gs
+    assert isinstance(gs["grid"], list)
+
+    # modifying a gridspec does not change the interned one
+    gs["grid"][0] = 2
+    gs["area"] = [10, 0, -10, 359]
+    r = GridSpec.from_dict({"grid": [1, 1], "area": [90, 0, -90, 359]})
+    assert r["grid"] == [1, 1]
+    assert r["area"] == [90, 0, -90, 359]
+    assert type(r) is type(gs)
+
+
+@pytest.mark.parametrize(
+    "gs",
+    [
+        {"grid": "O32", "x": {"a": 1}},
+        {"grid": "O32", "x": [[1, 2], [3, 4]]},
+    ],
+)
+def test_gridspec_from_dict_unhashable(gs):
+    from earthkit.regrid.gridspec import GridSpec
+
+    r = GridSpec.from_dict(gs)
+    assert r["x"] == gs["x"]
+    assert r == GridSpec.from_dict({"grid": "O32"})
+
+
+def test_gridspec_key_after_modification():
+    from earthkit.regrid.gridspec import GridSpec
+
+    gs = GridSpec.from_dict({"grid": [1, 1]})
+    key, index_key = gs.key(), gs.index_key()
+
+    gs["grid"] = [2, 2]
+    assert gs.key() != key
+    assert gs.index_key() != index_key
+    assert gs.index_key() == GridSpec.from_dict({"grid": [2, 2]}).index_key()
+    assert gs.index_key() == gs.index_keys()[0]
+
+
+@pytest.mark.parametrize(
+    "gs,err",
+    [
+        ("O32", ValueError),
+        (None, TypeError),
+        ({"grid": {"a": 1}}, ValueError),
+        ({"grid": [[1, 2]]}, ValueError),
+        ({"grid": None}, ValueError),
+    ],
+)
+def test_gridspec_from_dict_invalid(gs, err):
+    from earthkit.regrid.gridspec import GridSpec
+
+    with pytest.raises(err):
+        GridSpec.from_dict(gs)
+
+
+def test_gridspec_from_dict_pairs():
+    from earthkit.regrid.gridspec import GridSpec
+
+    assert GridSpec.from_dict([("grid", "O32")]) == GridSpec.from_dict({"grid": "O32"})
@@ -0,0 +1,138 @@
+# (C) Copyright 2023 ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from earthkit.regrid.array import aregrid as array_aregrid
+from earthkit.regrid.utils.testing import LOCAL_MATRIX_BACKEND_NAME
+from earthkit.regrid.utils.testing import NO_EKD
+from earthkit.regrid.utils.testing import SYSTEM_MATRIX_BACKEND_NAME
+from earthkit.regrid.utils.testing import earthkit_test_data_path
+
+if not NO_EKD:
+    from earthkit.data import from_source  # noqa
+
+DB_PATH = earthkit_test_data_path("local", "db")
+DATA_PATH = earthkit_test_data_path("local")
+
+
+def _load(name):
+    return np.load(os.path.join(DATA_PATH, name))["arr_0"]
+
+
+def _aregrid(v_in, in_grid, out_grid, interpolation="linear", **kwargs):
+    return array_aregrid(
+        v_in,
+        in_grid,
+        out_grid,
+        interpolation=interpolation,
+        backend=LOCAL_MATRIX_BACKEND_NAME,
+        inventory=DB_PATH,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("interpolation", ["linear", "nearest-neighbour"])
+def test_aregrid_array(interpolation):
+    v_in = _load("in_O32.npz")
+    v_ref = _load(f"out_O32_10x10_{interpolation}.npz")
+    out_grid = {"grid": [10, 10]}
+
+    v_res, grid_res = asyncio.run(_aregrid(v_in, {"grid": "O32"}, out_grid, interpolation))
+
+    assert v_res.shape == (19, 36)
+    assert grid_res == out_grid
+    assert np.allclose(v_res.flatten(), v_ref)
+
+
+def test_aregrid_array_shared_load(monkeypatch):
+    from earthkit import regrid as ekr
+    from earthkit.regrid.backends.db import MatrixDb
+
+    calls = []
+    find_entry_ori = MatrixDb.find_entry
+    event = threading.Event()
+
+    def _find_entry(self, *args):
+        calls.append(args)
+        # wait until all the coroutines are waiting for the matrix
+        event.wait(timeout=10)
+        return find_entry_ori(self, *args)
+
+    monkeypatch.setattr(MatrixDb, "find_entry", _find_entry)
+
+    v_in = _load("in_N32.npz")
+    v_ref = _load("out_N32_10x10_linear.npz")
+
+    async def _run():
+        tasks = [asyncio.ensure_future(_aregrid(v_in, {"grid": "N32"}, {"grid": [10, 10]})) for _ in range(8)]
+        await asyncio.sleep(0.1)
+        event.set()
+        return await asyncio.gather(*tasks)
+
+    with ekr.config.temporary():
+        ekr.config.set("weights-memory-cache-policy", "off")
+        res = asyncio.run(_run())
+
+    assert len(calls) == 1
+    assert len(res) == 8
+    for v_res, _ in res:
+        assert np.allclose(v_res.flatten(), v_ref)
+
+
+def test_aregrid_array_executor(monkeypatch):
+    from earthkit.regrid.backends.precomputed import MatrixBackend
+
+    threads = []
+    apply_matrix_ori = MatrixBackend.apply_matrix
+
+    def _apply_matrix(*args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return apply_matrix_ori(*args, **kwargs)
+
+    monkeypatch.setattr(MatrixBackend, "apply_matrix", staticmethod(_apply_matrix))
+
+    v_in = _load("in_5x5.npz")
+    v_ref = _load("out_5x5_10x10_linear.npz")
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="aregrid-test") as executor:
+        v_res, _ = asyncio.run(_aregrid(v_in, {"grid": [5, 5]}, {"grid": [10, 10]}, executor=executor))
+
+    assert len(threads) == 1
+    assert threads[0].startswith("aregrid-test")
+    assert np.allclose(v_res.flatten(), v_ref)
+
+
+def test_aregrid_array_missing():
+    v_in = _load("in_O32.npz")
+    with pytest.raises(ValueError):
+        asyncio.run(_aregrid(v_in, {"grid": "O64"}, {"grid": [10, 10]}))
+
+
+@pytest.mark.tmp_cache
+@pytest.mark.skipif(NO_EKD, reason="No access to earthkit-data")
+def test_aregrid_fieldlist():
+    from earthkit.regrid import aregrid
+    from earthkit.regrid import regrid
+
+    ds = from_source("sample", "O32_t2.grib2").to_fieldlist()
+
+    r = asyncio.run(aregrid(ds, grid={"grid": [10, 10]}, backend=SYSTEM_MATRIX_BACKEND_NAME))
+    r_ref = regrid(ds, grid={"grid": [10, 10]}, backend=SYSTEM_MATRIX_BACKEND_NAME)
+
+    assert len(r) == len(ds)
+    assert r.metadata("step") == ds.metadata("step")
+    for f, f_ref in zip(r, r_ref):
+        assert f.shape == (19, 36)
+        assert np.allclose(f.values, f_ref.values)
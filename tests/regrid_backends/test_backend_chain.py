@@ -0,0 +1,193 @@
+# (C) Copyright 2023 ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import asyncio
+import os
+
+import numpy as np
+import pytest
+
+from earthkit.regrid.array import aregrid as array_aregrid
+from earthkit.regrid.array import regrid as array_regrid
+from earthkit.regrid.backends import MAKER
+from earthkit.regrid.backends import Backend
+from earthkit.regrid.backends import get_backend
+from earthkit.regrid.utils.testing import LOCAL_MATRIX_BACKEND_NAME
+from earthkit.regrid.utils.testing import earthkit_test_data_path
+
+DB_PATH = earthkit_test_data_path("local", "db")
+DATA_PATH = earthkit_test_data_path("local")
+
+
+class _FallbackBackend(Backend):
+    name = "test-fallback"
+
+    def __init__(self, *args, **kwargs):
+        self.calls = []
+
+    def regrid(self, values, in_grid, out_grid, interpolation="linear"):
+        self.calls.append((in_grid, out_grid, interpolation))
+        return np.zeros((2, 2)), out_grid
+
+
+@pytest.fixture
+def chain(monkeypatch):
+    from earthkit.regrid.backends.precomputed import MatrixBackend
+
+    monkeypatch.setitem(MAKER.BACKENDS, _FallbackBackend.name, _FallbackBackend)
+    monkeypatch.setattr(MAKER, "BACKEND_OBJECTS", {})
+
+    checks = []
+    supports = MatrixBackend.supports
+
+    def _supports(self, *args):
+        checks.append(args)
+        return supports(self, *args)
+
+    monkeypatch.setattr(MatrixBackend, "supports", _supports)
+    return [LOCAL_MATRIX_BACKEND_NAME, _FallbackBackend.name], checks
+
+
+def _regrid(v_in, in_grid, out_grid, backend):
+    return array_regrid(v_in, in_grid, out_grid, interpolation="linear", backend=backend, inventory=DB_PATH)
+
+
+def test_backend_chain_routing(chain):
+    names, checks = chain
+    b = get_backend(names, inventory=DB_PATH)
+    assert get_backend(names, inventory=DB_PATH) is b
+    assert b.name == names
+    fallback = b.backends[1]
+
+    v_in = np.load(os.path.join(DATA_PATH, "in_O32.npz"))["arr_0"]
+    v_ref = np.load(os.path.join(DATA_PATH, "out_O32_10x10_linear.npz"))["arr_0"]
+
+    # precomputed weights are available
+    for _ in range(3):
+        v_res, _ = _regrid(v_in, {"grid": "O32"}, {"grid": [10, 10]}, names)
+        assert np.allclose(v_res.flatten(), v_ref)
+    assert fallback.calls == []
+
+    # no precomputed weights, the fallback backend is used
+    for _ in range(3):
+        v_res, grid_res = _regrid(v_in, {"grid": "O32"}, {"grid": [1, 1]}, names)
+        assert v_res.shape == (2, 2)
+        assert grid_res == {"grid": [1, 1]}
+    assert len(fallback.calls) == 3
+
+    # the precomputed backend is asked on every call since its inventory can change
+    assert len(checks) == 6
+
+
+class _StaticBackend(_FallbackBackend):
+    name = "test-static"
+
+    def supports(self, in_grid, out_grid, interpolation):
+        self.checks = getattr(self, "checks", 0) + 1
+        return in_grid["grid"] != "O32"
+
+
+def test_backend_chain_routes(monkeypatch):
+    from earthkit.regrid.backends import BackendChain
+
+    static = _StaticBackend()
+    fallback = _FallbackBackend()
+    b = BackendChain([static, fallback])
+
+    for _ in range(3):
+        assert b.select({"grid": "O32"}, {"grid": [1, 1]}, "linear") is fallback
+        assert b.select({"grid": "N32"}, {"grid": [1, 1]}, "linear") is static
+    # the decision is only made once per grid pair
+    assert static.checks == 2
+
+    # the least recently used routes are dropped
+    monkeypatch.setattr(BackendChain, "ROUTES_SIZE", 2)
+    b.select({"grid": "O48"}, {"grid": [1, 1]}, "linear")
+    assert len(b._routes) == 2
+    assert static.checks == 3
+
+
+def test_backend_chain_inventory_update(monkeypatch):
+    from earthkit.regrid.backends import BackendChain
+    from earthkit.regrid.backends.precomputed import MatrixBackend
+
+    available = []
+    monkeypatch.setattr(MatrixBackend, "supports", lambda self, *args: bool(available))
+
+    matrix = get_backend(LOCAL_MATRIX_BACKEND_NAME, inventory=DB_PATH)
+    fallback = _FallbackBackend()
+    b = BackendChain([matrix, fallback])
+
+    assert b.select({"grid": "O32"}, {"grid": [1, 1]}, "linear") is fallback
+    # weights added to the inventory are used without any delay
+    available.append(True)
+    assert b.select({"grid": "O32"}, {"grid": [1, 1]}, "linear") is matrix
+
+
+def test_backend_chain_out(chain):
+    names, _ = chain
+    v_in = np.load(os.path.join(DATA_PATH, "in_O32.npz"))["arr_0"]
+    v_ref = np.load(os.path.join(DATA_PATH, "out_O32_10x10_linear.npz"))["arr_0"]
+
+    # written in place by the precomputed backend
+    out = np.full((19, 36), np.nan)
+    v_res, _ = array_regrid(
+        v_in, {"grid": "O32"}, {"grid": [10, 10]}, backend=names, inventory=DB_PATH, out=out
+    )
+    assert v_res is out
+    assert np.allclose(out.flatten(), v_ref)
+
+    # copied into out for the backends not accepting it
+    out = np.full((2, 2), np.nan)
+    v_res, _ = array_regrid(
+        v_in, {"grid": "O32"}, {"grid": [1, 1]}, backend=names, inventory=DB_PATH, out=out
+    )
+    assert v_res is out
+    assert np.array_equal(out, np.zeros((2, 2)))
+
+    out = np.full((2, 2), np.nan)
+    v_res, _ = asyncio.run(
+        array_aregrid(v_in, {"grid": "O32"}, {"grid": [1, 1]}, backend=names, inventory=DB_PATH, out=out)
+    )
+    assert v_res is out
+
+    with pytest.raises(ValueError):
+        array_regrid(
+            v_in, {"grid": "O32"}, {"grid": [1, 1]}, backend=names, inventory=DB_PATH, out=np.empty(4)
+        )
+
+
+def test_backend_chain_aregrid(chain):
+    names, _ = chain
+    v_in = np.load(os.path.join(DATA_PATH, "in_O32.npz"))["arr_0"]
+    v_ref = np.load(os.path.join(DATA_PATH, "out_O32_10x10_linear.npz"))["arr_0"]
+
+    v_res, _ = asyncio.run(
+        array_aregrid(v_in, {"grid": "O32"}, {"grid": [10, 10]}, backend=names, inventory=DB_PATH)
+    )
+    assert np.allclose(v_res.flatten(), v_ref)
+
+    v_res, _ = asyncio.run(
+        array_aregrid(v_in, {"grid": "O32"}, {"grid": [1, 1]}, backend=names, inventory=DB_PATH)
+    )
+    assert v_res.shape == (2, 2)
+
+
+def test_backend_chain_unsupported(chain):
+    v_in = np.load(os.path.join(DATA_PATH, "in_O32.npz"))["arr_0"]
+    backend = [LOCAL_MATRIX_BACKEND_NAME]
+
+    assert not get_backend(backend, inventory=DB_PATH).supports({"grid": "O32"}, {"grid": [1, 1]}, "linear")
+    with pytest.raises(ValueError):
+        _regrid(v_in, {"grid": "O32"}, {"grid": [1, 1]}, backend)
+
+    # unsupported gridspecs are not an error for the selection
+    assert not get_backend(backend, inventory=DB_PATH).supports({"grid": "foo"}, {"grid": [1, 1]}, "linear")
+
+    with pytest.raises(ValueError):
+        get_backend([])
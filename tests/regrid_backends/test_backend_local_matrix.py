@@ -31,7 +31,7 @@ def get_local_db():
     return MatrixDb.from_path(DB_PATH)
 
 
-def run_regrid(v_in, in_grid, out_grid, interpolation):
+def run_regrid(v_in, in_grid, out_grid, interpolation, **kwargs):
     return array_regrid(
         v_in,
         in_grid,
@@ -39,6 +39,7 @@ def run_regrid(v_in, in_grid, out_grid, interpolation):
         interpolation=interpolation,
         backend=LOCAL_MATRIX_BACKEND_NAME,
         inventory=DB_PATH,
+        **kwargs,
     )
 
 
@@ -153,6 +154,155 @@ def test_regrid_local_matrix_nested_to_ll(interpolation):
     assert np.allclose(v_res.flatten(), v_ref)
 
 
+@pytest.mark.parametrize("interpolation", INTERPOLATIONS)
+@pytest.mark.parametrize(
+    "in_file,in_grid,in_shape",
+    [
+        ("in_5x5.npz", {"grid": [5, 5]}, (37, 72)),
+        ("in_5x5.npz", {"grid": [5, 5]}, (37 * 72,)),
+        ("in_O32.npz", {"grid": "O32"}, (5248,)),
+    ],
+)
+@pytest.mark.parametrize("leading", [(1,), (3,), (2, 4)])
+def test_regrid_local_matrix_leading_dims(interpolation, in_file, in_grid, in_shape, leading):
+    v_in = np.load(file_in_testdir(in_file))["arr_0"].reshape(in_shape)
+
+    scale = np.arange(1, np.prod(leading) + 1, dtype=float).reshape(*leading, *([1] * len(in_shape)))
+    v_stack = v_in * scale
+    assert v_stack.shape == (*leading, *in_shape)
+
+    v_ref, _ = run_regrid(v_in, in_grid=in_grid, out_grid={"grid": [10, 10]}, interpolation=interpolation)
+    v_res, _ = run_regrid(v_stack, in_grid=in_grid, out_grid={"grid": [10, 10]}, interpolation=interpolation)
+
+    assert v_res.shape == (*leading, 19, 36)
+    for idx in np.ndindex(*leading):
+        k = np.ravel_multi_index(idx, leading) + 1
+        assert np.allclose(v_res[idx], k * v_ref)
+
+
+def test_regrid_local_matrix_bad_shape():
+    v_in = np.load(file_in_testdir("in_O32.npz"))["arr_0"]
+    with pytest.raises(ValueError):
+        run_regrid(v_in[:-1], in_grid={"grid": "O32"}, out_grid={"grid": [10, 10]}, interpolation="linear")
+
+
+@pytest.mark.parametrize("interpolation", INTERPOLATIONS)
+def test_regrid_local_matrix_out(interpolation):
+    v_in = np.load(file_in_testdir("in_O32.npz"))["arr_0"]
+    v_ref = np.load(file_in_testdir(f"out_O32_10x10_{interpolation}.npz"))["arr_0"]
+
+    # the result is written into a field of a preallocated time series
+    buffer = np.full((3, 19, 36), np.nan)
+
+    for i in range(3):
+        v_res, _ = run_regrid(
+            v_in * (i + 1),
+            in_grid={"grid": "O32"},
+            out_grid={"grid": [10, 10]},
+            interpolation=interpolation,
+            out=buffer[i],
+        )
+        assert np.shares_memory(v_res, buffer)
+
+    for i in range(3):
+        assert np.allclose(buffer[i].flatten(), (i + 1) * v_ref)
+
+
+@pytest.mark.parametrize(
+    "in_shape,out",
+    [
+        ((5248,), np.empty((19, 36), dtype=np.float32)),
+        ((5248,), np.empty((36, 19)).T),
+        ((2, 5248), np.empty((2, 19, 36))),
+        ((2, 5248), np.empty((4, 19, 36))[::2]),
+    ],
+)
+def test_regrid_local_matrix_out_copy(in_shape, out):
+    v_in = np.load(file_in_testdir("in_O32.npz"))["arr_0"]
+    v_in = np.broadcast_to(v_in, in_shape).copy()
+
+    v_ref, _ = run_regrid(v_in, in_grid={"grid": "O32"}, out_grid={"grid": [10, 10]}, interpolation="linear")
+    v_res, _ = run_regrid(
+        v_in, in_grid={"grid": "O32"}, out_grid={"grid": [10, 10]}, interpolation="linear", out=out
+    )
+
+    assert v_res is out
+    assert np.allclose(out, v_ref, atol=1e-5)
+
+
+def test_regrid_local_matrix_out_bad_shape():
+    v_in = np.load(file_in_testdir("in_O32.npz"))["arr_0"]
+    with pytest.raises(ValueError):
+        run_regrid(
+            v_in,
+            in_grid={"grid": "O32"},
+            out_grid={"grid": [10, 10]},
+            interpolation="linear",
+            out=np.empty(19 * 36),
+        )
+
+
+@pytest.mark.parametrize("matrix_format", ["mmap", "npz"])
+def test_regrid_local_matrix_format(tmp_path, matrix_format):
+    import json
+
+    DB = get_local_db()
+    filters = [{"input": {"grid": "O32"}, "output": {"grid": [10, 10]}, "method": m} for m in INTERPOLATIONS]
+    index = DB.subset_index(filters)
+    assert len(index) == len(INTERPOLATIONS)
+
+    for name, entry in list(index.items()):
+        DB.copy_matrix_file(entry, tmp_path, matrix_format=matrix_format)
+        index[name] = DB.converted_entry(entry, matrix_format)
+
+    with open(tmp_path / "index.json", "w") as f:
+        json.dump(index.to_raw(), f)
+
+    ext = ".mmap" if matrix_format == "mmap" else ".npz"
+    assert len(list(tmp_path.glob(f"*/*{ext}"))) == len(INTERPOLATIONS)
+
+    from earthkit.regrid.backends.db import MatrixDb
+    from earthkit.regrid.utils.memcache import MEMORY_CACHE
+
+    MEMORY_CACHE.clear()
+
+    target_db = MatrixDb.from_path(str(tmp_path))
+    z = target_db.load_matrix(target_db.find_entry({"grid": "O32"}, {"grid": [10, 10]}, "linear"))
+    base = z.data
+    while base is not None and not isinstance(base, np.memmap):
+        base = base.base
+    assert (base is not None) == (matrix_format == "mmap")
+    assert z.indices.dtype == z.indptr.dtype == np.int32
+    assert z.has_canonical_format
+
+    v_in = np.load(file_in_testdir("in_O32.npz"))["arr_0"]
+    for interpolation in INTERPOLATIONS:
+        v_ref = np.load(file_in_testdir(f"out_O32_10x10_{interpolation}.npz"))["arr_0"]
+        v_res, _ = array_regrid(
+            v_in,
+            {"grid": "O32"},
+            {"grid": [10, 10]},
+            interpolation=interpolation,
+            backend=LOCAL_MATRIX_BACKEND_NAME,
+            inventory=str(tmp_path),
+        )
+        assert v_res.shape == (19, 36)
+        assert np.allclose(v_res.flatten(), v_ref)
+
+        out = np.empty((19, 36))
+        v_res, _ = array_regrid(
+            v_in,
+            {"grid": "O32"},
+            {"grid": [10, 10]},
+            interpolation=interpolation,
+            backend=LOCAL_MATRIX_BACKEND_NAME,
+            inventory=str(tmp_path),
+            out=out,
+        )
+        assert v_res is out
+        assert np.allclose(out.flatten(), v_ref)
+
+
 @pytest.mark.parametrize("interpolation", ["linear"])
 def test_regrid_local_matrix_orca_to_ogg(interpolation):
     f_in = get_test_data("in_eORCA025_T.npz", subfolder="orca")
@@ -292,3 +442,45 @@ def test_local_matrix_gridspec_bad(gs_in, gs_out, err):
     else:
         r = DB.find_entry(gs_in, gs_out, "linear")
         assert r is None, f"gs_in={gs_in} gs_out={gs_out}"
+
+
+def test_local_matrix_has_matrix(tmp_path, monkeypatch):
+    import json
+    import shutil
+
+    from earthkit.regrid.backends.db import MatrixDb
+
+    shutil.copyfile(os.path.join(DB_PATH, "index.json"), tmp_path / "index.json")
+    db = MatrixDb.from_path(str(tmp_path))
+
+    assert db.has_matrix({"grid": "O32"}, {"grid": [10, 10]}, "linear")
+    assert db.has_matrix({"grid": "O32"}, {"grid": [10, 10]}, "nn")
+    assert not db.has_matrix({"grid": "O32"}, {"grid": [1, 1]}, "linear")
+
+    # a miss is remembered, neither the index nor the memory cache is used again
+    lookups = []
+    find_in_index = MatrixDb._find_in_index
+
+    def _find_in_index(self, *args):
+        lookups.append(args)
+        return find_in_index(self, *args)
+
+    monkeypatch.setattr(MatrixDb, "_find_in_index", _find_in_index)
+
+    for _ in range(3):
+        assert not db.has_matrix({"grid": "O32"}, {"grid": [1, 1]}, "linear")
+        assert db.find({"grid": "O32"}, {"grid": [1, 1]}, "linear") == (None, None)
+    assert lookups == []
+
+    # the miss is forgotten when the index file changes
+    with open(tmp_path / "index.json") as f:
+        index = json.load(f)
+    for entry in index["matrix"].values():
+        if entry["input"].get("grid") == "O32" and entry["interpolation"]["method"] == "linear":
+            entry["output"]["grid"] = [1, 1]
+    with open(tmp_path / "index.json", "w") as f:
+        json.dump(index, f)
+    db._clear_index()
+
+    assert db.has_matrix({"grid": "O32"}, {"grid": [1, 1]}, "linear")
+    assert len(lookups) == 1
@@ -327,7 +327,7 @@ def test_local_memcache_ensure_strict_1(monkeypatch):
         assert MEMORY_CACHE.misses == 0
         assert MEMORY_CACHE.info() == (0, 0, max_mem, 0, 0, policy)
 
-        def _estimate_memory(entry):
+        def _estimate_memory(entry, dtype=None):
             return max_mem + 1
 
         from earthkit.regrid.utils import memcache
@@ -360,7 +360,7 @@ def test_local_memcache_strict_2(monkeypatch):
         assert MEMORY_CACHE.misses == 0
         assert MEMORY_CACHE.info() == (0, 0, max_mem, 0, 0, policy)
 
-        def _estimate_memory(entry):
+        def _estimate_memory(entry, dtype=None):
             return max_mem - 1
 
         from earthkit.regrid.utils import memcache
@@ -393,3 +393,400 @@ def test_local_memcache_strict_2(monkeypatch):
         info = MEMORY_CACHE.info()
         assert info.currsize < mem_first
         assert MEMORY_CACHE.info() == (1, 2, max_mem, MEMORY_CACHE.curr_mem, 1, policy)
+
+
+@pytest.mark.parametrize("policy", ["largest", "lru", "unlimited"])
+def test_local_memcache_threads(monkeypatch, policy):
+    """Concurrent requests for the same weights must share a single load, while
+    requests for cached weights must not wait for it."""
+    import threading
+
+    from earthkit.regrid import config
+    from earthkit.regrid.backends.db import MatrixDb
+    from earthkit.regrid.backends.db import MatrixIndex
+    from earthkit.regrid.utils.memcache import MEMORY_CACHE
+
+    loads = []
+    release = threading.Event()
+    load_matrix = MatrixDb.load_matrix
+
+    def _load_matrix(self, entry, **kwargs):
+        loads.append(entry["_name"])
+        if MatrixIndex.interpolation_method_name(entry) == "linear":
+            assert release.wait(10)
+        return load_matrix(self, entry, **kwargs)
+
+    monkeypatch.setattr(MatrixDb, "load_matrix", _load_matrix)
+
+    max_mem = None if policy == "unlimited" else 300 * 1024 * 1024
+    with config.temporary():
+        config.set("weights-memory-cache-policy", policy)
+        config.set("maximum-weights-memory-cache-size", max_mem)
+
+        MEMORY_CACHE.clear()
+
+        run_regrid("nearest-neighbour")
+        assert len(loads) == 1
+
+        errors = []
+
+        def _run(mode):
+            try:
+                run_regrid(mode)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=_run, args=("linear",)) for _ in range(4)]
+        for t in threads:
+            t.start()
+
+        # the cached weights are available while the others are being loaded
+        run_regrid("nearest-neighbour")
+        assert MEMORY_CACHE.hits >= 1
+
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert not errors
+        assert len(loads) == 2
+        info = MEMORY_CACHE.info()
+        assert info.misses == 2
+        assert info.hits == 4
+        assert info.count == 2
+
+
+@pytest.fixture
+def shared_store(monkeypatch):
+    import uuid
+
+    from earthkit.regrid.utils.memcache import SharedPolicy
+    from earthkit.regrid.utils.shm import SharedMatrixStore
+
+    store = SharedMatrixStore(name=f"earthkit-regrid-test-{uuid.uuid4().hex}")
+    monkeypatch.setattr(SharedPolicy, "_store", store)
+    yield store
+    store.purge()
+    for f in (store.path, store.path + ".lock"):
+        if os.path.exists(f):
+            os.unlink(f)
+
+
+def test_local_memcache_shared(monkeypatch, shared_store):
+    """Weights published by a process must be reused without loading them from disk."""
+    from earthkit.regrid import config
+    from earthkit.regrid.backends.db import MatrixDb
+    from earthkit.regrid.utils.memcache import MEMORY_CACHE
+
+    max_mem = 300 * 1024 * 1024
+    with config.temporary():
+        config.set("weights-memory-cache-policy", "shared")
+        config.set("maximum-weights-memory-cache-size", max_mem)
+
+        MEMORY_CACHE.clear()
+
+        run_regrid("linear")
+        assert MEMORY_CACHE.info() == (
+            0,
+            1,
+            max_mem,
+            MEMORY_CACHE.curr_mem,
+            1,
+            "shared",
+        )
+        assert shared_store.size() > 0
+
+        # simulate another process: the local cache is empty and the
+        # weights cannot be loaded from disk
+        MEMORY_CACHE.clear()
+
+        def _load_matrix(self, entry, **kwargs):
+            raise AssertionError("weights must be attached from shared memory")
+
+        monkeypatch.setattr(MatrixDb, "load_matrix", _load_matrix)
+
+        v_in = np.load(file_in_testdir("in_N32.npz"))["arr_0"]
+        v_ref = np.load(file_in_testdir("out_N32_10x10_linear.npz"))["arr_0"]
+        v_res, _ = regrid_array(
+            v_in,
+            {"grid": "N32"},
+            {"grid": [10, 10]},
+            interpolation="linear",
+            backend="precomputed",
+            inventory=DB_PATH,
+        )
+        assert np.allclose(v_res.flatten(), v_ref.flatten())
+        assert MEMORY_CACHE.info().count == 1
+
+
+def test_local_memcache_shared_subprocess(shared_store):
+    import subprocess
+    import sys
+
+    from scipy.sparse import csr_array
+
+    z = csr_array(np.array([[1.0, 0.0, 2.0], [0.0, 3.0, 0.0]]))
+    z_shared, shape = shared_store.publish("abcd" * 10, z, [2], None)
+    assert shape == [2]
+    assert np.array_equal(z_shared.toarray(), z.toarray())
+
+    code = f"""
+import numpy as np
+from earthkit.regrid.utils.shm import SharedMatrixStore
+z, shape = SharedMatrixStore(name={shared_store.name!r}).attach({"abcd" * 10!r})
+assert shape == [2]
+assert np.array_equal(z @ np.ones(3), [3.0, 3.0])
+"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in sys.path if p)
+    subprocess.run([sys.executable, "-c", code], check=True, env=env)
+
+    # the segments must survive the exit of the other process
+    assert shared_store.attach("abcd" * 10) is not None
+
+
+def test_local_memcache_shared_attach_read_only(shared_store):
+    from scipy.sparse import csr_array
+
+    z = csr_array(np.array([[1.0, 0.0, 2.0], [0.0, 3.0, 0.0]]))
+    shared_store.publish("abcd" * 10, z, [2], None)
+    st = os.stat(shared_store.path)
+
+    # attaching must not rewrite the registry
+    for _ in range(3):
+        assert shared_store.attach("abcd" * 10) is not None
+    assert shared_store.attach("efgh" * 10) is None
+
+    st_attach = os.stat(shared_store.path)
+    assert (st_attach.st_ino, st_attach.st_mtime_ns) == (st.st_ino, st.st_mtime_ns)
+
+
+def test_local_memcache_shared_released(shared_store):
+    import subprocess
+    import sys
+    from multiprocessing import shared_memory
+
+    from scipy.sparse import csr_array
+
+    code = f"""
+import numpy as np
+from scipy.sparse import csr_array
+from earthkit.regrid.utils.shm import SharedMatrixStore
+z = csr_array(np.array([[1.0, 0.0, 2.0], [0.0, 3.0, 0.0]]))
+assert SharedMatrixStore(name={shared_store.name!r}).publish({"abcd" * 10!r}, z, [2], None) is not None
+"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in sys.path if p)
+    subprocess.run([sys.executable, "-c", code], check=True, env=env)
+
+    # the segments are unlinked when the publishing process exits
+    assert shared_store.size() == 0
+    assert shared_store.attach("abcd" * 10) is None
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=shared_store.segment_name("abcd" * 10, "data"))
+
+    # and when the store is closed in this process
+    z = csr_array(np.eye(3))
+    shared_store.publish("abcd" * 10, z, [2], None)
+    assert shared_store.size() > 0
+    shared_store.close()
+    assert shared_store.size() == 0
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=shared_store.segment_name("abcd" * 10, "data"))
+
+
+def test_local_memcache_shared_limit(shared_store):
+    from scipy.sparse import csr_array
+
+    z = csr_array(np.eye(100))
+    size = z.data.nbytes + z.indices.nbytes + z.indptr.nbytes
+
+    shared_store.publish("a" * 40, z, [100], 2 * size)
+    shared_store.publish("b" * 40, z, [100], 2 * size)
+    shared_store.publish("c" * 40, z, [100], 2 * size)
+
+    assert shared_store.size() == 2 * size
+    # the first published is evicted
+    assert shared_store.attach("a" * 40) is None
+    assert shared_store.attach("b" * 40) is not None
+
+    # too large to fit
+    assert shared_store.publish("d" * 40, z, [100], size - 1) is None
+
+
+@pytest.mark.filterwarnings("error::pytest.PytestUnraisableExceptionWarning")
+def test_local_memcache_shared_unlinked(shared_store):
+    import gc
+
+    from scipy.sparse import csr_array
+
+    z = csr_array(np.array([[1.0, 0.0, 2.0], [0.0, 3.0, 0.0]]))
+    shared_store.publish("abcd" * 10, z, [2], None)
+    z_shared, _ = shared_store.attach("abcd" * 10)
+    assert not z_shared.data.flags.writeable
+
+    # the attached matrix can be used until all the references to it are dropped
+    shared_store.purge()
+    assert shared_store.attach("abcd" * 10) is None
+    assert np.array_equal(z_shared @ np.ones(3), [3.0, 3.0])
+
+    data = z_shared.data[1:]
+    del z_shared
+    gc.collect()
+    assert np.array_equal(data, [2.0, 3.0])
+    del data
+    gc.collect()
+
+
+@pytest.mark.parametrize("policy", ["largest", "lru", "unlimited"])
+def test_local_memcache_create_only(policy):
+    """Items without an index entry must be cached with any policy."""
+    from earthkit.regrid import config
+    from earthkit.regrid.utils.memcache import MEMORY_CACHE
+
+    created = []
+
+    def _create(*args):
+        created.append(args)
+        return np.eye(4), [4]
+
+    max_mem = None if policy == "unlimited" else 300 * 1024 * 1024
+    with config.temporary():
+        config.set("weights-memory-cache-policy", policy)
+        config.set("maximum-weights-memory-cache-size", max_mem)
+
+        MEMORY_CACHE.clear()
+
+        for _ in range(3):
+            z, shape = MEMORY_CACHE.get("test", {"grid": "N32"}, create=_create)
+            assert shape == [4]
+
+        assert created == [("test", {"grid": "N32"})]
+        info = MEMORY_CACHE.info()
+        assert info.misses == 1
+        assert info.hits == 2
+        assert info.count == 1
+
+
+@pytest.mark.parametrize(
+    "policy,evicted,currsize",
+    [("lru", "b", 40), ("largest", "c", 30)],
+)
+@pytest.mark.parametrize("shards", [1, 4])
+def test_local_memcache_shards(policy, evicted, currsize, shards):
+    """Eviction must follow the policy across all the shards."""
+    from earthkit.regrid.utils.memcache import MemoryCache
+
+    class _Cache(MemoryCache):
+        # do not use the config
+        def update(self):
+            pass
+
+    sizes = {"a": 10, "b": 10, "c": 20, "d": 10}
+    created = []
+
+    def _create(name):
+        created.append(name)
+        return sizes[name], [1]
+
+    cache = _Cache(max_mem=45, size_fn=lambda x: x, policy=policy, shards=shards)
+
+    for name in ["a", "b", "c"]:
+        cache.get(name, create=_create)
+
+    # "a" becomes more recently used than "b"
+    cache.get("a", create=_create)
+    assert cache.info() == (1, 3, 45, 40, 3, policy)
+
+    cache.get("d", create=_create)
+    assert cache.info() == (1, 4, 45, currsize, 3, policy)
+
+    created.clear()
+    for name in sizes:
+        cache.get(name, create=_create)
+    assert created[0] == evicted
+
+
+def test_local_memcache_create_unlocked():
+    """Creating an item must not block the other keys of its shard."""
+    import threading
+
+    from earthkit.regrid.utils.memcache import MemoryCache
+
+    class _Cache(MemoryCache):
+        # do not use the config
+        def update(self):
+            pass
+
+    created = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def _create(name):
+        created.append(name)
+        if name == "a":
+            started.set()
+            assert release.wait(10)
+        return 1, [1]
+
+    # all the keys are in the same shard
+    cache = _Cache(max_mem=None, size_fn=lambda x: x, policy="unlimited", shards=1)
+    cache.get("b", create=_create)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get("a", create=_create))) for _ in range(3)
+    ]
+    for t in threads:
+        t.start()
+    assert started.wait(10)
+
+    # a hit and another miss complete while "a" is being created
+    assert cache.get("b", create=_create) == (1, [1])
+    assert cache.get("c", create=_create) == (1, [1])
+
+    release.set()
+    for t in threads:
+        t.join()
+
+    # "a" is created only once
+    assert results == [(1, [1])] * 3
+    assert sorted(created) == ["a", "b", "c"]
+    assert cache.info().misses == 3
+
+
+@pytest.mark.parametrize("in_dtype", [np.float32, np.float64])
+def test_local_memcache_weights_dtype(in_dtype):
+    """The float32 weights take less memory and the result keeps the input dtype."""
+    from earthkit.regrid import config
+    from earthkit.regrid.utils.memcache import MEMORY_CACHE
+
+    v_in = np.load(file_in_testdir("in_N32.npz"))["arr_0"].astype(in_dtype)
+    v_ref = np.load(file_in_testdir("out_N32_10x10_linear.npz"))["arr_0"]
+
+    def _regrid():
+        v_res, _ = regrid_array(
+            v_in,
+            {"grid": "N32"},
+            {"grid": [10, 10]},
+            interpolation="linear",
+            backend="precomputed",
+            inventory=DB_PATH,
+        )
+        return v_res
+
+    with config.temporary():
+        config.set("weights-memory-cache-policy", "largest")
+
+        size = {}
+        for dtype in ["float64", "float32"]:
+            config.set("weights-dtype", dtype)
+            MEMORY_CACHE.clear()
+
+            v_res = _regrid()
+            assert v_res.dtype == in_dtype
+            assert np.allclose(v_res.flatten(), v_ref, rtol=1e-5, atol=1e-5)
+            size[dtype] = MEMORY_CACHE.info().currsize
+
+        # the int32 indices are not affected
+        assert size["float32"] < 0.75 * size["float64"]
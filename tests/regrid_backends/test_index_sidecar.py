@@ -0,0 +1,179 @@
+# (C) Copyright 2023 ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import json
+import os
+import shutil
+
+import pytest
+
+from earthkit.regrid.backends.db import LocalAccessor
+from earthkit.regrid.backends.db import MatrixDb
+from earthkit.regrid.backends.db import MatrixIndex
+from earthkit.regrid.backends.db import MatrixIndexSidecar
+from earthkit.regrid.utils.testing import earthkit_test_data_path
+
+DB_PATH = earthkit_test_data_path("local", "db")
+
+
+class _SidecarAccessor(LocalAccessor):
+    def index_sidecar_path(self, index_path):
+        return os.path.join(self._path, "sidecar.sqlite")
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    path = os.path.join(tmp_path, "index.json")
+    shutil.copyfile(os.path.join(DB_PATH, "index.json"), path)
+    return path
+
+
+def _queries(index):
+    for entry in index.values():
+        raw = entry["_raw"]
+        yield raw["input"], raw["output"], MatrixIndex.interpolation_method_name(entry)
+
+
+def test_index_sidecar_find(index_path):
+    index = MatrixIndex()
+    index.load(index_path)
+
+    sidecar = MatrixIndexSidecar(index_path)
+    for gs_in, gs_out, method in _queries(index):
+        entry = sidecar.find(gs_in, gs_out, method)
+        assert entry is not None
+        assert entry["_name"] == index.find(gs_in, gs_out, method)["_name"]
+        assert entry["_raw"] == index[entry["_name"]]["_raw"]
+        # the same entry object is returned
+        assert sidecar.find(gs_in, gs_out, method) is entry
+
+    assert sidecar.find({"grid": "O1280"}, {"grid": [1, 1]}, "linear") is None
+    assert os.path.exists(index_path + ".sqlite")
+    sidecar.close()
+
+
+def _single_entry_index(index_path):
+    index = MatrixIndex()
+    index.load(index_path)
+
+    name, entry = next(iter(index.items()))
+    for k in list(index)[1:]:
+        del index[k]
+
+    raw = entry["_raw"]
+    query = (raw["input"], raw["output"], MatrixIndex.interpolation_method_name(entry))
+    return index, name, entry, query
+
+
+@pytest.mark.parametrize(
+    "remove",
+    [
+        lambda index, name: index.pop(name),
+        lambda index, name: index.popitem(),
+        lambda index, name: index.clear(),
+        lambda index, name: index.__delitem__(name),
+    ],
+)
+def test_index_lookup_invalidated_on_remove(index_path, remove):
+    index, name, entry, query = _single_entry_index(index_path)
+    assert index.find(*query) is entry
+
+    remove(index, name)
+    assert index.find(*query) is None
+
+
+@pytest.mark.parametrize(
+    "add",
+    [
+        lambda index, name, entry: index.update({name: entry}),
+        lambda index, name, entry: index.update([(name, entry)]),
+        lambda index, name, entry: index.setdefault(name, entry),
+        lambda index, name, entry: index.__ior__({name: entry}),
+        lambda index, name, entry: index.__setitem__(name, entry),
+    ],
+)
+def test_index_lookup_invalidated_on_add(index_path, add):
+    index, name, entry, query = _single_entry_index(index_path)
+    index.clear()
+    assert index.find(*query) is None
+
+    add(index, name, entry)
+    assert index.find(*query) is entry
+
+
+def test_index_sidecar_rebuild(index_path):
+    gs_in, gs_out = {"grid": "N32"}, {"grid": [10, 10]}
+
+    sidecar = MatrixIndexSidecar(index_path)
+    entry = sidecar.find(gs_in, gs_out, "linear")
+    assert entry is not None
+    sidecar.close()
+
+    # reused when the index file did not change
+    mtime = os.stat(sidecar.path).st_mtime_ns
+    sidecar = MatrixIndexSidecar(index_path)
+    assert sidecar.find(gs_in, gs_out, "linear")["_name"] == entry["_name"]
+    assert os.stat(sidecar.path).st_mtime_ns == mtime
+    sidecar.close()
+
+    with open(index_path, "r") as f:
+        index = json.load(f)
+    del index["matrix"][entry["_name"]]
+    with open(index_path, "w") as f:
+        json.dump(index, f)
+
+    sidecar = MatrixIndexSidecar(index_path)
+    assert sidecar.find(gs_in, gs_out, "linear") is None
+    sidecar.close()
+
+
+def test_index_sidecar_incremental(index_path, monkeypatch):
+    sidecar = MatrixIndexSidecar(index_path)
+    sidecar.open()
+    sidecar.close()
+
+    with open(index_path, "r") as f:
+        index = json.load(f)
+    names = list(index["matrix"])
+    del index["matrix"][names[0]]
+    index["matrix"]["added"] = index["matrix"][names[1]]
+    with open(index_path, "w") as f:
+        json.dump(index, f)
+
+    # only the added entry is parsed when the sidecar is rebuilt
+    parsed = []
+    make_entry = MatrixIndex.make_entry
+
+    def _make_entry(name, raw):
+        parsed.append(name)
+        return make_entry(name, raw)
+
+    monkeypatch.setattr(MatrixIndex, "make_entry", staticmethod(_make_entry))
+    sidecar = MatrixIndexSidecar(index_path)
+    sidecar.open()
+    assert parsed == ["added"]
+    monkeypatch.undo()
+
+    ref = MatrixIndex()
+    ref.load(index_path)
+    for gs_in, gs_out, method in _queries(ref):
+        assert sidecar.find(gs_in, gs_out, method)["_raw"] == ref.find(gs_in, gs_out, method)["_raw"]
+    sidecar.close()
+
+
+def test_index_sidecar_db(index_path):
+    db = MatrixDb(_SidecarAccessor(os.path.dirname(index_path)))
+    entry = db.find_entry({"grid": "N32"}, {"grid": [10, 10]}, "nn")
+    assert entry is not None
+    assert MatrixIndex.interpolation_method_name(entry) == "nearest-neighbour"
+    assert os.path.exists(os.path.join(os.path.dirname(index_path), "sidecar.sqlite"))
+    # the whole index is not loaded
+    assert db._index is None
+
+    assert len(db) == 16
+    assert db.find_entry({"grid": "N32"}, {"grid": [10, 10]}, "nn")["_name"] == entry["_name"]
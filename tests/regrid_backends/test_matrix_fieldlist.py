@@ -148,3 +148,33 @@ def test_regrid_matrix_single_field(_kwarg, interpolation, field_type):
     grid_ref = {"iDirectionIncrementInDegrees": 10.0, "jDirectionIncrementInDegrees": 10.0}
     for k, v in grid_ref.items():
         assert np.isclose(r.metadata(k), v), k
+
+
+@pytest.mark.tmp_cache
+@pytest.mark.skipif(NO_EKD, reason="No access to earthkit-data")
+def test_regrid_matrix_fieldlist_grouped(monkeypatch):
+    from earthkit.regrid.backends.precomputed import MatrixBackend
+
+    ds = from_source("sample", "O32_t2.grib2").to_fieldlist()
+    assert len(ds) == 2
+
+    calls = []
+    regrid_ori = MatrixBackend.regrid
+
+    def _regrid(self, values, *args, **kwargs):
+        calls.append(values.shape)
+        return regrid_ori(self, values, *args, **kwargs)
+
+    monkeypatch.setattr(MatrixBackend, "regrid", _regrid)
+
+    r = regrid(ds, grid={"grid": [10, 10]}, backend=SYSTEM_MATRIX_BACKEND_NAME)
+
+    # the fields share the same grid so they are interpolated in one call
+    assert calls == [(2, 5248)]
+    assert len(r) == 2
+    assert r.metadata("step") == ds.metadata("step")
+
+    for i in range(len(ds)):
+        r_ref = regrid(ds[i], grid={"grid": [10, 10]}, backend=SYSTEM_MATRIX_BACKEND_NAME)
+        assert r[i].shape == (19, 36)
+        assert np.allclose(r[i].values, r_ref.values)
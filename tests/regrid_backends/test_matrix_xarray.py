@@ -54,3 +54,38 @@ def test_regrid_matrix_xarray_from_h_nested(out_grid, dims):
     r = regrid(ds["2t"], grid=out_grid, interpolation="linear", backend="precomputed")
 
     compare_dims(r, dims, sizes=True)
+
+
+@pytest.mark.skipif(NO_EKD, reason="No earthkit.data available")
+@pytest.mark.skipif(NO_MIR, reason="No mir available")
+def test_regrid_matrix_xarray_leading_dims(monkeypatch):
+    import numpy as np
+    import xarray as xr
+
+    from earthkit.regrid.backends.precomputed import MatrixBackend
+
+    ds_in = from_source("sample", "O32_t2.grib2")
+    da = ds_in.to_xarray()["2t"]
+    da = xr.concat([da, da + 1, da + 2], dim="number")
+    assert da.dims[-1] == "values"
+
+    calls = []
+    regrid_ori = MatrixBackend.regrid
+
+    def _regrid(self, values, *args, **kwargs):
+        calls.append(values.shape)
+        return regrid_ori(self, values, *args, **kwargs)
+
+    monkeypatch.setattr(MatrixBackend, "regrid", _regrid)
+
+    r = regrid(da, grid={"grid": [10, 10]}, interpolation="linear", backend="precomputed")
+    compare_dims(r, {"number": 3, "step": 2, "latitude": 19, "longitude": 36}, sizes=True)
+
+    # all the fields are interpolated in a single call
+    assert len(calls) == 1
+    assert calls[0][0] == 6
+
+    ref = regrid(
+        da.isel(number=1, step=1), grid={"grid": [10, 10]}, interpolation="linear", backend="precomputed"
+    )
+    assert np.allclose(r.isel(number=1, step=1).values, ref.values)
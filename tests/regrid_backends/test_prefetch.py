@@ -0,0 +1,68 @@
+# (C) Copyright 2023 ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import os
+
+import pytest
+
+from earthkit.regrid import prefetch
+from earthkit.regrid.utils.testing import SYSTEM_MATRIX_BACKEND_NAME  # noqa: E402
+from earthkit.regrid.utils.testing import earthkit_test_data_path
+
+DB_PATH = earthkit_test_data_path("local", "db")
+
+
+@pytest.mark.parametrize("load", [False, True])
+def test_prefetch_local(load):
+    from earthkit.regrid import config
+    from earthkit.regrid.utils.memcache import MEMORY_CACHE
+
+    with config.temporary():
+        config.set("weights-memory-cache-policy", "largest")
+        MEMORY_CACHE.clear()
+
+        h = prefetch(
+            [
+                ({"grid": "N32"}, {"grid": [10, 10]}),
+                ({"grid": "N32"}, {"grid": [10, 10]}, "nearest-neighbour"),
+            ],
+            backend="precomputed",
+            inventory=DB_PATH,
+            load=load,
+        )
+
+        paths = h.wait(timeout=60)
+        assert h.done()
+        assert h.progress() == (2, 2, 0)
+        assert len(paths) == 2
+        assert all(os.path.exists(p) for p in paths)
+        assert paths[0] != paths[1]
+
+        assert MEMORY_CACHE.info().count == (2 if load else 0)
+
+
+def test_prefetch_missing():
+    h = prefetch([({"grid": "N32"}, {"grid": [3, 3]})], backend="precomputed", inventory=DB_PATH)
+
+    with pytest.raises(ValueError):
+        h.wait(timeout=60)
+
+    assert h.progress() == (1, 1, 1)
+
+
+def test_prefetch_bad_backend():
+    with pytest.raises(ValueError):
+        prefetch([({"grid": "N32"}, {"grid": [10, 10]})], backend="mir")
+
+
+@pytest.mark.download
+@pytest.mark.tmp_cache
+def test_prefetch_system():
+    h = prefetch([({"grid": "O32"}, {"grid": [10, 10]})], backend=SYSTEM_MATRIX_BACKEND_NAME)
+    (path,) = h.wait()
+    assert os.path.exists(path)
@@ -76,3 +76,55 @@ def test_regrid_remote_matrix_index_handling():
     st = os.stat(path)
     m_time = st.st_mtime_ns
     assert m_time > m_time_ref, (m_time, m_time_ref)
+
+
+def test_remote_index_check_interval(tmp_path, monkeypatch):
+    import shutil
+
+    from earthkit.regrid import config
+    from earthkit.regrid.backends.db import MatrixDb
+    from earthkit.regrid.backends.db import UrlAccessor
+    from earthkit.regrid.utils.testing import earthkit_test_data_path
+
+    index_path = str(tmp_path / "index.json")
+    shutil.copyfile(earthkit_test_data_path("local", "db", "index.json"), index_path)
+
+    checks = []
+
+    def _get_index(self, check_remote=False, force=False):
+        # simulate the remote check without accessing the network
+        if check_remote:
+            checks.append(self)
+            self._mark_checked()
+        return index_path
+
+    monkeypatch.setattr(UrlAccessor, "_get_index", _get_index)
+    monkeypatch.setattr(UrlAccessor, "index_sidecar_path", lambda self, path: None)
+
+    def _miss(db):
+        return db.find_entry({"grid": "O32"}, {"grid": [1000, 10000]}, "linear")
+
+    with config.temporary():
+        config.set("remote-index-check-interval", "1h")
+
+        db = MatrixDb(UrlAccessor("https://example.com/db"))
+        assert db.find_entry({"grid": "O32"}, {"grid": [10, 10]}, "linear") is not None
+        assert checks == []
+
+        # the remote index is only checked for the first miss
+        for _ in range(3):
+            assert _miss(db) is None
+        assert len(checks) == 1
+        assert db._accessor.checked_remote()
+
+        # another accessor sharing the cache (e.g. in another process) does not check again
+        other = MatrixDb(UrlAccessor("https://example.com/db"))
+        assert _miss(other) is None
+        assert len(checks) == 1
+        assert other._accessor.checked_remote()
+
+        # every miss checks the remote index
+        config.set("remote-index-check-interval", 0)
+        for _ in range(2):
+            assert _miss(db) is None
+        assert len(checks) == 3
@@ -131,3 +131,110 @@ def test_regrid_single_field(_kwarg, interpolation, field_type):
         assert np.isclose(r.metadata(k), v), k
 
     assert r.metadata("gridType") == "regular_ll"
+
+
+@pytest.mark.skipif(NO_MIR, reason="No mir available")
+@pytest.mark.skipif(NO_EKD, reason="No access to earthkit-data")
+@pytest.mark.parametrize("workers,chunk_size", [(2, None), (4, 1), (3, 2)])
+def test_regrid_fieldlist_workers(workers, chunk_size):
+    ds = from_source("sample", "O32_t2.grib2")
+    ds = ds + ds + ds
+    assert len(ds) == 6
+
+    r_ref = regrid(ds, grid={"grid": [10, 10]})
+    r = regrid(ds, grid={"grid": [10, 10]}, workers=workers, chunk_size=chunk_size)
+
+    assert len(r) == len(ds)
+    assert r.metadata("step") == ds.metadata("step")
+    for f, f_ref in zip(r, r_ref):
+        assert np.allclose(f.to_numpy(), f_ref.to_numpy())
+
+
+@pytest.mark.parametrize("cache_weights,grib", [(False, True), (True, False)])
+def test_regrid_fieldlist_cache_weights_kwarg(cache_weights, grib):
+    from earthkit.regrid.data.fieldlist import FieldListDataHandler
+
+    kwargs = {"backend": "mir", "grid": {"grid": [10, 10]}, "cache_weights": cache_weights}
+    _, grid, grib_res = FieldListDataHandler()._parse_kwargs(kwargs)
+    assert grid == {"grid": [10, 10]}
+    assert grib_res == grib
+    # an explicit False is not passed on to the backend
+    assert kwargs == ({"cache_weights": True} if cache_weights else {})
+
+
+@pytest.mark.skipif(NO_MIR, reason="No mir available")
+@pytest.mark.skipif(NO_EKD, reason="No access to earthkit-data")
+@pytest.mark.parametrize("interpolation", ["linear", "nearest-neighbour"])
+def test_regrid_fieldlist_cache_weights(interpolation):
+    import warnings
+
+    from earthkit.regrid import config
+    from earthkit.regrid.utils.memcache import MEMORY_CACHE
+
+    ds = from_source("sample", "O32_t2.grib2")
+    r_ref = regrid(ds, grid={"grid": [10, 10]}, interpolation=interpolation)
+
+    with config.temporary():
+        config.set("weights-memory-cache-policy", "largest")
+        MEMORY_CACHE.clear()
+
+        with warnings.catch_warnings():
+            # the output grid must be passed to mir as specified
+            warnings.simplefilter("error", DeprecationWarning)
+            for _ in range(2):
+                r = regrid(ds, grid={"grid": [10, 10]}, interpolation=interpolation, cache_weights=True)
+                assert len(r) == len(r_ref)
+                for f, f_ref in zip(r, r_ref):
+                    assert f.shape == (19, 36)
+                    assert np.allclose(f.to_numpy(), f_ref.to_numpy())
+
+        info = MEMORY_CACHE.info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+
+@pytest.mark.skipif(NO_MIR, reason="No mir available")
+@pytest.mark.skipif(NO_EKD, reason="No access to earthkit-data")
+def test_regrid_fieldlist_backend_chain():
+    import warnings
+
+    from earthkit.regrid.utils.testing import LOCAL_MATRIX_BACKEND_NAME
+    from earthkit.regrid.utils.testing import earthkit_test_data_path
+
+    ds = from_source("sample", "O32_t2.grib2")
+    r_ref = regrid(ds, grid={"grid": [1, 1]}, interpolation="linear", backend="mir")
+
+    with warnings.catch_warnings():
+        # the output grid must be passed to mir as specified
+        warnings.simplefilter("error", DeprecationWarning)
+        # no precomputed weights in the inventory, mir is used
+        r = regrid(
+            ds,
+            grid={"grid": [1, 1]},
+            interpolation="linear",
+            backend=[LOCAL_MATRIX_BACKEND_NAME, "mir"],
+            inventory=earthkit_test_data_path("local", "db"),
+        )
+
+    assert len(r) == len(r_ref)
+    for f, f_ref in zip(r, r_ref):
+        assert f.shape == (181, 360)
+        assert np.allclose(f.to_numpy(), f_ref.to_numpy())
+
+
+@pytest.mark.parametrize("chunk_size,expected", [(None, [[0, 2, 3], [1]]), (2, [[0, 2], [3], [1]])])
+def test_regrid_fieldlist_group_fields(chunk_size, expected):
+    from types import SimpleNamespace
+
+    from earthkit.regrid.data.fieldlist import FieldListDataHandler
+
+    grids = [{"grid": "O32"}, {"grid": [1, 1]}, {"grid": "O32"}, {"grid": "O32"}]
+    ds = [SimpleNamespace(metadata=lambda g=g: SimpleNamespace(gridspec=g)) for g in grids]
+
+    fields, groups = FieldListDataHandler()._group_fields(ds, {"grid": [10, 10]}, chunk_size)
+    assert fields == ds
+    assert [indices for _, indices in groups] == expected
+    assert [in_grid for in_grid, _ in groups] == [grids[i[0]] for i in expected]
+
+    with pytest.raises(ValueError):
+        FieldListDataHandler()._group_fields(ds, {"grid": [10, 10]}, 0)
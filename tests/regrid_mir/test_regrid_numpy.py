@@ -313,3 +313,77 @@ def test_regrid_numpy_any_to_any(interpolation, in_grid, in_shape, out_grid, res
     values = np.random.random(in_shape)
     res_v, _ = regrid_array(values, in_grid=in_grid, out_grid=out_grid, interpolation=interpolation)
     assert res_v.shape == res_shape, f"Expected shape {res_shape}, got {res_v.shape}"
+
+
+@pytest.mark.skipif(NO_MIR, reason="No mir available")
+@pytest.mark.parametrize("interpolation", BASE_INTERPOLATIONS)
+def test_regrid_numpy_cache_weights(interpolation):
+    from earthkit.regrid import config
+    from earthkit.regrid.utils.memcache import MEMORY_CACHE
+
+    v_in = np.random.default_rng(0).random((3, 6114))
+
+    with config.temporary():
+        config.set("weights-memory-cache-policy", "largest")
+        MEMORY_CACHE.clear()
+
+        v_ref, grid_ref = regrid_array(
+            v_in[0], {"grid": "N32"}, {"grid": [10, 10]}, interpolation=interpolation
+        )
+
+        for _ in range(2):
+            v_res, grid_res = regrid_array(
+                v_in,
+                {"grid": "N32"},
+                {"grid": [10, 10]},
+                interpolation=interpolation,
+                cache_weights=True,
+            )
+            assert v_res.shape == (3, 19, 36)
+            assert np.allclose(v_res[0], v_ref)
+            assert grid_res == grid_ref
+
+        info = MEMORY_CACHE.info()
+        assert info.misses == 1
+        assert info.hits == 1
+        assert info.count == 1
+
+
+@pytest.mark.skipif(NO_MIR, reason="No mir available")
+def test_regrid_numpy_unknown_grid_size(monkeypatch):
+    import mir
+
+    from earthkit.regrid.backends import mir as mir_backend
+
+    def _grid(**kwargs):
+        raise RuntimeError("unsupported grid")
+
+    monkeypatch.setattr(mir, "Grid", _grid)
+    monkeypatch.setattr(mir_backend, "_GRID_SIZES", {})
+
+    # a 2D array is passed to mir as a single field
+    assert mir_backend.MirBackend.leading_shape(np.zeros((19, 36)), {"grid": [10, 10]}) == ()
+
+    with pytest.raises(ValueError, match="Cannot determine the number of points"):
+        mir_backend.MirBackend.leading_shape(np.zeros((3, 1, 6114)), {"grid": "N32"})
+
+
+@pytest.mark.skipif(NO_MIR, reason="No mir available")
+@pytest.mark.parametrize("interpolation", BASE_INTERPOLATIONS)
+def test_regrid_numpy_leading_dims(monkeypatch, interpolation):
+    from earthkit.regrid.backends.mir import MirBackend
+
+    v_in = np.random.default_rng(0).random((2, 3, 6114))
+    v_ref = [
+        regrid_array(v, {"grid": "N32"}, {"grid": [10, 10]}, interpolation=interpolation)[0]
+        for v in v_in.reshape(6, -1)
+    ]
+
+    def _execute(*args):
+        raise AssertionError("the fields must be interpolated in one go")
+
+    monkeypatch.setattr(MirBackend, "_execute", staticmethod(_execute))
+
+    v_res, _ = regrid_array(v_in, {"grid": "N32"}, {"grid": [10, 10]}, interpolation=interpolation)
+    assert v_res.shape == (2, 3, 19, 36)
+    assert np.allclose(v_res.reshape(6, 19, 36), v_ref)
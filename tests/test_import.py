@@ -0,0 +1,64 @@
+# (C) Copyright 2023 ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+# these modules are only imported when first used
+HEAVY_MODULES = [
+    "earthkit.regrid.backends.db",
+    "earthkit.regrid.utils.caching",
+    "earthkit.regrid.utils.config",
+    "multiurl",
+    "numpy",
+    "scipy",
+    "sqlite3",
+    "tqdm",
+    "yaml",
+]
+
+# generous upper limit, the import normally takes a fraction of this
+IMPORT_TIME_BUDGET = 1.0
+
+
+def _run(code):
+    r = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    return json.loads(r.stdout)
+
+
+def test_import_lazy():
+    loaded = _run(
+        "import json, sys, time; t = time.perf_counter(); import earthkit.regrid; "
+        "t = time.perf_counter() - t; "
+        f"print(json.dumps([[m for m in {HEAVY_MODULES!r} if m in sys.modules], t]))"
+    )
+    modules, elapsed = loaded
+    assert modules == []
+    assert elapsed < IMPORT_TIME_BUDGET
+
+
+def test_import_lazy_attributes():
+    import earthkit.regrid
+
+    assert earthkit.regrid.config.get("cache-policy") is not None
+    assert callable(earthkit.regrid.clear_memory_cache)
+    assert "cache" in dir(earthkit.regrid)
+    with pytest.raises(AttributeError):
+        earthkit.regrid.no_such_attribute
+
+
+def test_import_lazy_backends():
+    modules = _run(
+        "import json, sys; from earthkit.regrid.backends import get_backend; "
+        "get_backend('mir'); "
+        "print(json.dumps([m for m in ('earthkit.regrid.backends.db', 'scipy') if m in sys.modules]))"
+    )
+    assert modules == []
@@ -271,3 +271,96 @@ def test_cache_force():
     st = os.stat(path4)
     m_time = st.st_mtime_ns
     assert m_time == m_time_ref
+
+
+def test_cache_database_bookkeeping():
+    import sqlite3
+
+    from earthkit.regrid.utils.caching import CACHE_DB
+
+    with temp_directory() as tmp_dir_path:
+        with config.temporary():
+            config.set({"cache-policy": "user", "user-cache-directory": tmp_dir_path})
+
+            data_size = 10 * 1024
+            paths = [_make_zeros_cache_file(size=data_size, n=n) for n in range(3)]
+
+            # cache hits only record the access, which is written in a batch
+            for _ in range(5):
+                assert _make_zeros_cache_file(size=data_size, n=0) == paths[0]
+
+            entries = {x["path"]: x for x in cache.entries()}
+            assert entries[paths[0]]["accesses"] == 6
+            assert entries[paths[0]]["last_access"] > entries[paths[2]]["last_access"]
+            assert entries[paths[1]]["accesses"] == 1
+
+            # the total size is maintained without summing the table
+            assert cache.size() == 3 * data_size
+            cache._decache_file(paths[1])
+            assert cache.size() == 2 * data_size
+
+            db = sqlite3.connect(os.path.join(tmp_dir_path, CACHE_DB))
+            try:
+                assert db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+                assert db.execute("SELECT SUM(size) FROM cache").fetchone()[0] == cache.size()
+            finally:
+                db.close()
+
+            cache.purge()
+            assert cache.size() == 0
+
+
+def test_cache_file_hit_fast_path(monkeypatch):
+    from earthkit.regrid.utils import caching
+
+    with temp_directory() as tmp_dir_path:
+        with config.temporary():
+            config.set({"cache-policy": "user", "user-cache-directory": tmp_dir_path})
+
+            data_size = 1024
+            path = _make_zeros_cache_file(size=data_size, n=0)
+
+            # a repeated call neither hashes the arguments nor calls the manager thread
+            def _fail(*args, **kwargs):
+                raise AssertionError("cache hit must use the fast path")
+
+            with monkeypatch.context() as m:
+                m.setattr(caching.hashlib, "sha256", _fail)
+                m.setattr(cache, "_register_cache_file", _fail)
+                m.setattr(cache, "_call_manager", _fail)
+                for _ in range(3):
+                    assert _make_zeros_cache_file(size=data_size, n=0) == path
+
+            assert [x["accesses"] for x in cache.entries()] == [4]
+
+            # the file is created again when removed from the cache
+            cache.purge()
+            assert not os.path.exists(path)
+            assert _make_zeros_cache_file(size=data_size, n=0) == path
+            assert os.path.exists(path)
+            assert len(cache.entries()) == 1
+
+
+def test_cache_housekeeping_wal():
+    from earthkit.regrid.utils.caching import CACHE_DB
+
+    with temp_directory() as tmp_dir_path:
+        with config.temporary():
+            config.set({"cache-policy": "user", "user-cache-directory": tmp_dir_path})
+
+            data_size = 1024
+            path = _make_zeros_cache_file(size=data_size, n=0)
+
+            # the WAL mode database files exist while the database is open
+            names = os.listdir(tmp_dir_path)
+            assert CACHE_DB + "-wal" in names
+            assert CACHE_DB + "-shm" in names
+
+            cache._housekeeping(clean=True)
+            entries = cache.entries()
+            assert [x["path"] for x in entries] == [path]
+            assert all(x["owner"] != "orphans" for x in entries)
+
+            cache.purge()
+            assert cache.size() == 0
+            assert os.path.exists(os.path.join(tmp_dir_path, CACHE_DB))
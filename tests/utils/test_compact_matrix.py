@@ -0,0 +1,82 @@
+# (C) Copyright 2023 ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import numpy as np
+import pytest
+from scipy.sparse import csr_array
+from scipy.sparse import csr_matrix
+from scipy.sparse import random_array
+
+from earthkit.regrid.utils.matrix import compact_matrix
+from earthkit.regrid.utils.matrix import load_matrix_mmap
+from earthkit.regrid.utils.matrix import matrix_memory_size
+from earthkit.regrid.utils.matrix import save_matrix_mmap
+
+
+def _matrix():
+    return random_array((50, 80), density=0.2, format="csr", rng=1)
+
+
+def _check(r, z, dtype=np.float64):
+    assert r.format == "csr"
+    assert r.dtype == dtype
+    assert r.indices.dtype == np.int32
+    assert r.indptr.dtype == np.int32
+    assert r.has_canonical_format
+    assert np.allclose(r.toarray(), z.toarray())
+
+
+@pytest.mark.parametrize("index_dtype", [np.int64, np.uint32])
+def test_compact_matrix_indices(index_dtype):
+    z = _matrix()
+    z64 = csr_array(
+        (z.data, z.indices.astype(index_dtype), z.indptr.astype(index_dtype)), shape=z.shape, copy=False
+    )
+
+    r = compact_matrix(z64)
+    _check(r, z)
+    assert matrix_memory_size(r) == z.data.nbytes + 4 * (z.nnz + z.shape[0] + 1)
+
+
+def test_compact_matrix_unchanged():
+    z = compact_matrix(_matrix())
+    assert compact_matrix(z) is z
+
+
+@pytest.mark.parametrize("z", [csr_matrix(_matrix()), _matrix().tocoo(), _matrix().toarray()])
+def test_compact_matrix_format(z):
+    _check(compact_matrix(z), _matrix())
+
+
+def test_compact_matrix_unsorted_read_only():
+    z = _matrix()
+    data, indices = z.data.copy(), z.indices.copy()
+    for i in range(z.shape[0]):
+        s = slice(z.indptr[i], z.indptr[i + 1])
+        data[s], indices[s] = data[s][::-1], indices[s][::-1]
+    data.flags.writeable = False
+    indices.flags.writeable = False
+
+    r = compact_matrix(csr_array((data, indices, z.indptr), shape=z.shape, copy=False))
+    _check(r, z)
+    assert np.all(np.diff(r.indices[r.indptr[0] : r.indptr[1]]) > 0)
+
+
+def test_compact_matrix_dtype():
+    z = _matrix()
+    r = compact_matrix(z, dtype="float32")
+    _check(r, z, dtype=np.float32)
+    assert matrix_memory_size(r) < matrix_memory_size(z)
+
+
+def test_compact_matrix_mmap_no_copy(tmp_path):
+    path = tmp_path / "matrix.mmap"
+    save_matrix_mmap(path, _matrix())
+
+    z = load_matrix_mmap(path)
+    assert compact_matrix(z) is z
@@ -0,0 +1,155 @@
+# (C) Copyright 2023 ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import threading
+import time
+
+import pytest
+
+from earthkit.regrid import config
+from earthkit.regrid.utils import download
+from earthkit.regrid.utils.temporary import temp_directory
+
+
+class _Bar:
+    def __init__(self, total=None, initial=0, desc=None):
+        self.total = total
+        self.n = initial
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def update(self, n):
+        self.n += n
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_download(monkeypatch):
+    import multiurl
+
+    state = dict(active={}, max_active={}, bars=[], downloads=[])
+    lock = threading.Lock()
+
+    class _Downloader:
+        def __init__(self, url, progress_bar=None, **kwargs):
+            self.url = url
+            self.progress_bar = progress_bar
+
+        def extension(self):
+            return ".cache"
+
+        def local_path(self):
+            return None
+
+        def out_of_date(self, path, cache_data):
+            return False
+
+        def cache_data(self):
+            return {}
+
+        def download(self, target):
+            host = self.url.split("/")[2]
+            with lock:
+                state["downloads"].append(self.url)
+                state["active"][host] = state["active"].get(host, 0) + 1
+                state["max_active"][host] = max(state["max_active"].get(host, 0), state["active"][host])
+
+            with self.progress_bar(total=10, initial=0, desc=self.url) as pbar:
+                time.sleep(0.01)
+                pbar.update(10)
+                pbar.close()
+
+            with open(target, "w") as f:
+                f.write(self.url)
+
+            with lock:
+                state["active"][host] -= 1
+
+    def _progress_bar(total=None, initial=0, desc=None):
+        bar = _Bar(total, initial, desc)
+        state["bars"].append(bar)
+        return bar
+
+    monkeypatch.setattr(multiurl, "Downloader", _Downloader)
+    monkeypatch.setattr(download, "progress_bar", _progress_bar)
+
+    with temp_directory() as tmp_dir_path:
+        with config.temporary():
+            config.set({"cache-policy": "user", "user-cache-directory": tmp_dir_path})
+            yield state, _progress_bar
+
+
+def test_download_many(fake_download):
+    state, progress_bar = fake_download
+    urls = [f"https://host{i % 2}/file{i}" for i in range(20)]
+
+    with config.temporary():
+        config.set("maximum-concurrent-downloads", 8)
+        config.set("maximum-connections-per-host", 2)
+
+        paths = download.download_many(urls, progress_bar=progress_bar)
+
+    for path, url in zip(paths, urls):
+        with open(path) as f:
+            assert f.read() == url
+    assert max(state["max_active"].values()) <= 2
+
+    # a single aggregated progress bar
+    assert len(state["bars"]) == 1
+    bar = state["bars"][0]
+    assert bar.total == 200
+    assert bar.n == 200
+    assert bar.closed
+
+
+def test_download_many_error(monkeypatch):
+    def _download_and_cache(url, **kwargs):
+        if url.endswith("2"):
+            raise ValueError(url)
+        return url
+
+    monkeypatch.setattr(download, "download_and_cache", _download_and_cache)
+
+    with pytest.raises(ValueError):
+        download.download_many([f"https://host/file{i}" for i in range(4)], progress_bar=_Bar)
+
+
+def test_download_many_empty():
+    assert download.download_many([]) == []
+
+
+def test_download_cached_no_host_slot(fake_download, monkeypatch):
+    from contextlib import contextmanager
+
+    state, progress_bar = fake_download
+    slots = []
+    host_slot = download.host_slot
+
+    @contextmanager
+    def _host_slot(url):
+        slots.append(url)
+        with host_slot(url):
+            yield
+
+    monkeypatch.setattr(download, "host_slot", _host_slot)
+
+    url = "https://host/file"
+    path = download.download_and_cache(url, progress_bar=progress_bar)
+    for _ in range(3):
+        assert download.download_and_cache(url, progress_bar=progress_bar) == path
+
+    # only the actual download waits for a connection to the host
+    assert state["downloads"] == [url]
+    assert slots == [url]
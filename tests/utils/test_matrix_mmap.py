@@ -0,0 +1,55 @@
+# (C) Copyright 2023 ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import numpy as np
+import pytest
+from scipy.sparse import csr_array
+from scipy.sparse import random_array
+
+from earthkit.regrid.utils.matrix import load_matrix_mmap
+from earthkit.regrid.utils.matrix import save_matrix_mmap
+
+
+def _memmap_base(a):
+    while a is not None and not isinstance(a, np.memmap):
+        a = a.base
+    return a
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+@pytest.mark.parametrize("shape", [(100, 300), (1, 1), (50, 20)])
+def test_matrix_mmap_roundtrip(tmp_path, dtype, shape):
+    z = random_array(shape, density=0.3, format="csr", dtype=dtype, rng=1)
+
+    path = tmp_path / "matrix.mmap"
+    save_matrix_mmap(path, z)
+
+    r = load_matrix_mmap(path)
+    assert isinstance(r, csr_array)
+    assert r.shape == z.shape
+    assert r.dtype == z.dtype
+    assert r.nnz == z.nnz
+    assert (r != z).nnz == 0
+
+    # the arrays are not copied into memory
+    for name in ("data", "indices", "indptr"):
+        a = getattr(r, name)
+        assert _memmap_base(a) is not None, name
+        assert not a.flags.writeable
+
+    v = np.arange(shape[1], dtype=dtype)
+    assert np.allclose(r @ v, z @ v)
+
+
+def test_matrix_mmap_bad_file(tmp_path):
+    path = tmp_path / "matrix.mmap"
+    with open(path, "wb") as f:
+        f.write(b"not a matrix file")
+
+    with pytest.raises(ValueError):
+        load_matrix_mmap(path)
@@ -0,0 +1,73 @@
+# (C) Copyright 2025- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+import io
+
+import numpy as np
+import pytest
+from scipy.sparse import csr_array
+from scipy.sparse import random_array
+
+from earthkit.regrid.utils.mir import mir_cached_matrix_to_array
+from earthkit.regrid.utils.stream import Stream
+
+
+def _write_mir_matrix(path, z, little_endian):
+    order = "<" if little_endian else ">"
+    with open(path, "wb") as f:
+        s = Stream(f)
+        s.write_unsigned_long(z.shape[0])
+        s.write_unsigned_long(z.shape[1])
+        s.write_unsigned_long(z.nnz)
+        s.write_int(1 if little_endian else 0)
+        s.write_unsigned_long(4)
+        s.write_unsigned_long(8)
+        s.write_unsigned_long(8)
+        s.write_large_blob(z.indptr.astype(order + "u4"))
+        s.write_large_blob(z.indices.astype(order + "u4"))
+        s.write_large_blob(z.data.astype(order + "f8"))
+
+
+@pytest.mark.parametrize("little_endian", [True, False])
+def test_mir_cached_matrix_to_array(tmp_path, little_endian):
+    z_ref = csr_array(random_array((50, 80), density=0.1, random_state=1))
+    path = tmp_path / "matrix.mat"
+    _write_mir_matrix(path, z_ref, little_endian)
+
+    z = mir_cached_matrix_to_array(path)
+
+    assert z.shape == z_ref.shape
+    assert z.data.dtype == np.float64
+    assert z.data.dtype.isnative
+    assert z.indices.dtype == np.int32
+    assert z.indptr.dtype == np.int32
+    assert np.array_equal(z.toarray(), z_ref.toarray())
+
+
+def test_mir_cached_matrix_to_array_truncated(tmp_path):
+    z_ref = csr_array(np.eye(10))
+    path = tmp_path / "matrix.mat"
+    _write_mir_matrix(path, z_ref, True)
+
+    data = path.read_bytes()
+    path.write_bytes(data[:-8])
+
+    with pytest.raises(EOFError):
+        mir_cached_matrix_to_array(path)
+
+
+def test_stream_read_into_chunks():
+    ref = np.arange(1000, dtype=np.float64)
+    f = io.BytesIO()
+    Stream(f).write_large_blob(ref)
+    f.seek(0)
+
+    s = Stream(f)
+    a = np.empty(s.read_large_blob_size() // 8)
+    s.read_into(a, chunk_size=100)
+    assert np.array_equal(a, ref)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# (C) Copyright 2023 ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+#
+
+import argparse
+import time
+
+from earthkit.regrid.backends.db import SYS_DB
+from earthkit.regrid.backends.db import MatrixDb
+from earthkit.regrid.backends.db import MatrixIndex
+from earthkit.regrid.gridspec import GridSpec
+
+"""Microbenchmark for MatrixIndex.find.
+
+Each entry of the index is looked up using its raw input and output gridspecs.
+The hashed lookup is compared against a linear scan over all the entries.
+"""
+
+
+def find_linear(index, gridspec_in, gridspec_out, method):
+    gridspec_in = GridSpec.from_dict(gridspec_in)
+    gridspec_out = GridSpec.from_dict(gridspec_out)
+    for _, entry in index.items():
+        if MatrixIndex.match(entry, gridspec_in, gridspec_out, method):
+            return entry
+    return None
+
+
+def add_synthetic_entries(index, count):
+    for i in range(count):
+        dx_in = round(0.01 * (i + 1), 6)
+        dx_out = round(dx_in * 2, 6)
+        raw = {
+            "input": {"grid": [dx_in, dx_in]},
+            "output": {"grid": [dx_out, dx_out]},
+            "interpolation": {"method": "linear", "engine": "mir", "version": 16},
+        }
+        entry = dict(**raw)
+        entry["input"] = GridSpec.from_dict(raw["input"])
+        entry["output"] = GridSpec.from_dict(raw["output"])
+        entry["_name"] = f"synthetic_{i}"
+        entry["_raw"] = raw
+        index[entry["_name"]] = entry
+
+
+def run(find, index, queries, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for gs_in, gs_out, method in queries:
+            find(gs_in, gs_out, method)
+    return (time.perf_counter() - start) / (repeat * len(queries))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--inventory", default=None, type=str, help="local inventory path (default: system)")
+    parser.add_argument("--repeat", default=10, type=int, help="number of passes over the index")
+    parser.add_argument(
+        "--synthetic",
+        default=0,
+        type=int,
+        help="add this number of synthetic regular_ll to regular_ll entries to the index",
+    )
+    args = parser.parse_args()
+
+    db = SYS_DB if args.inventory is None else MatrixDb.from_path(args.inventory)
+    index = db.index
+    add_synthetic_entries(index, args.synthetic)
+
+    queries = []
+    for entry in index.values():
+        raw = entry["_raw"]
+        queries.append((raw["input"], raw["output"], MatrixIndex.interpolation_method_name(entry)))
+
+    # warm up and check that both methods give the same result
+    for q in queries:
+        assert index.find(*q) is find_linear(index, *q)
+
+    t_hash = run(index.find, index, queries, args.repeat)
+    t_linear = run(lambda *q: find_linear(index, *q), index, queries, args.repeat)
+
+    print(f"entries={len(index)} queries={len(queries) * args.repeat}")
+    print(f"linear scan: {t_linear * 1e6:10.1f} us/find")
+    print(f"hashed     : {t_hash * 1e6:10.1f} us/find")
+    print(f"speed-up   : {t_linear / t_hash:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
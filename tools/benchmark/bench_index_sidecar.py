@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# (C) Copyright 2023 ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+#
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from earthkit.regrid.backends.db import MatrixIndex
+from earthkit.regrid.backends.db import MatrixIndexSidecar
+
+"""Benchmark for the time to the first lookup in an index file.
+
+Loading the whole index file with MatrixIndex is compared against querying
+the sidecar index file, which is built before the measurement.
+"""
+
+
+def write_index(path, count):
+    matrix = {}
+    for i in range(count):
+        dx_in = round(0.01 * (i + 1), 6)
+        dx_out = round(dx_in * 2, 6)
+        matrix[f"synthetic_{i}"] = {
+            "input": {"grid": [dx_in, dx_in], "shape": [10, 10]},
+            "output": {"grid": [dx_out, dx_out], "shape": [5, 5]},
+            "interpolation": {"method": "linear", "engine": "mir", "version": 16},
+        }
+    with open(path, "w") as f:
+        json.dump({"version": 1, "matrix": matrix}, f)
+
+
+def first_lookup_index(path, query):
+    index = MatrixIndex()
+    index.load(path)
+    return index.find(*query)
+
+
+def first_lookup_sidecar(path, query):
+    sidecar = MatrixIndexSidecar(path)
+    try:
+        return sidecar.find(*query)
+    finally:
+        sidecar.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", default=20000, type=int, help="number of entries in the index")
+    parser.add_argument("--repeat", default=5, type=int, help="number of measurements")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "index.json")
+        write_index(path, args.count)
+        i = args.count // 2
+        query = ({"grid": [round(0.01 * (i + 1), 6)] * 2}, {"grid": [round(0.02 * (i + 1), 6)] * 2}, "linear")
+
+        start = time.perf_counter()
+        first_lookup_sidecar(path, query)
+        print(f"build sidecar: {time.perf_counter() - start:.4f}s")
+
+        for name, f in [("index", first_lookup_index), ("sidecar", first_lookup_sidecar)]:
+            t = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                assert f(path, query) is not None
+                t.append(time.perf_counter() - start)
+            print(f"{name:>8}: first lookup={min(t):.4f}s")
+
+
+if __name__ == "__main__":
+    main()
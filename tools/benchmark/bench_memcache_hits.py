@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# (C) Copyright 2023 ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+#
+
+import argparse
+import threading
+import time
+
+import numpy as np
+from scipy.sparse import csr_array
+
+from earthkit.regrid.gridspec import GridSpec
+from earthkit.regrid.utils.memcache import MemoryCache
+from earthkit.regrid.utils.memcache import matrix_memory_size
+
+"""Microbenchmark for hits and misses in the in-memory weights cache.
+
+The cache is filled with small matrices, then each thread repeatedly gets
+them. The throughput is compared for different numbers of shards. For the
+misses each thread gets new matrices whose creation takes ``--create-time``
+seconds, e.g. to load them from disk. The cache settings are not read from
+the config.
+"""
+
+
+class _Cache(MemoryCache):
+    def update(self):
+        pass
+
+
+def make_cache(shards, count):
+    cache = _Cache(max_mem=None, size_fn=matrix_memory_size, policy="unlimited", shards=shards)
+    keys = []
+    for i in range(count):
+        dx = round(0.1 * (i + 1), 6)
+        gs_in = GridSpec.from_dict({"grid": [dx, dx]})
+        gs_out = GridSpec.from_dict({"grid": [2 * dx, 2 * dx]})
+        key = (gs_in, gs_out, "linear")
+        z = csr_array(np.eye(4))
+        cache.get(*key, create=lambda *args, z=z: (z, [4]))
+        keys.append(key)
+    return cache, keys
+
+
+def run(cache, keys, threads, repeat):
+    barrier = threading.Barrier(threads + 1)
+
+    def _run(offset):
+        barrier.wait()
+        n = len(keys)
+        for i in range(repeat):
+            cache.get(*keys[(i + offset) % n])
+
+    workers = [threading.Thread(target=_run, args=(i,)) for i in range(threads)]
+    for w in workers:
+        w.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    return threads * repeat / elapsed
+
+
+def run_misses(shards, threads, count, create_time):
+    cache = _Cache(max_mem=None, size_fn=matrix_memory_size, policy="unlimited", shards=shards)
+    z = csr_array(np.eye(4))
+    barrier = threading.Barrier(threads + 1)
+
+    def _create(*args):
+        # sleeping releases the GIL like reading the matrix files does
+        time.sleep(create_time)
+        return z, [4]
+
+    def _run(offset):
+        barrier.wait()
+        for i in range(count):
+            cache.get("miss", offset, i, create=_create)
+
+    workers = [threading.Thread(target=_run, args=(i,)) for i in range(threads)]
+    for w in workers:
+        w.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    assert cache.info().misses == threads * count
+    return threads * count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=32, help="number of threads (default=32)")
+    parser.add_argument("--repeat", type=int, default=20000, help="gets per thread (default=20000)")
+    parser.add_argument("--count", type=int, default=64, help="number of cached matrices (default=64)")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 16], help="shard counts to compare")
+    parser.add_argument(
+        "--create-time", type=float, default=0.01, help="seconds to create a matrix on a miss (default=0.01)"
+    )
+    parser.add_argument("--misses", type=int, default=20, help="misses per thread (default=20)")
+    args = parser.parse_args()
+
+    for shards in args.shards:
+        cache, keys = make_cache(shards, args.count)
+        for threads in sorted({1, args.threads}):
+            rate = run(cache, keys, threads, args.repeat)
+            print(f"shards={shards:<3} threads={threads:<3} hits/s={rate:12.0f}")
+        info = cache.info()
+        assert info.misses == args.count
+
+    # the matrices are created without holding the lock of their shard
+    for shards in args.shards:
+        for threads in sorted({1, args.threads}):
+            rate = run_misses(shards, threads, args.misses, args.create_time)
+            print(f"shards={shards:<3} threads={threads:<3} misses/s={rate:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,7 +15,7 @@ import sys
 
 import yaml
 
-from earthkit.regrid.db import SYS_DB as DB
+from earthkit.regrid.backends.db import SYS_DB as DB
 
 LOG = logging.getLogger(__name__)
 
@@ -23,7 +23,9 @@ LOG = logging.getLogger(__name__)
 """Build a local matrix inventory by subsetting the default (remotely hosted) inventory."""
 
 
-def subset_remote_db(conf_file, out_dir, strict=True, fail_on_missing=True, dry_run=False):
+def subset_remote_db(
+    conf_file, out_dir, strict=True, fail_on_missing=True, dry_run=False, matrix_format=None
+):
     index_file = os.path.join(out_dir, "index.json")
 
     if not dry_run:
@@ -41,9 +43,18 @@ def subset_remote_db(conf_file, out_dir, strict=True, fail_on_missing=True, dry_
 
     index = DB.subset_index(items, fail_on_missing=fail_on_missing)
 
-    # copy matrices
-    for _, entry in index.items():
-        matrix_path = DB.copy_matrix_file(entry, out_dir, exist_ok=(not strict), dry_run=dry_run)
+    # copy matrices, the remote files are downloaded concurrently
+    names = list(index.keys())
+    matrix_paths = DB.copy_matrix_files(
+        [index[name] for name in names],
+        out_dir,
+        exist_ok=(not strict),
+        dry_run=dry_run,
+        matrix_format=matrix_format,
+    )
+    for name, matrix_path in zip(names, matrix_paths):
+        if matrix_format is not None:
+            index[name] = DB.converted_entry(index[name], matrix_format)
 
         LOG.info(f"  matrix_file: {os.path.relpath(matrix_path, out_dir)}")
         LOG.info("  matrix copied to out_dir")
@@ -73,6 +84,13 @@ def main():
         action="store_true",
         help="fail when out_dir is not empty",
     )
+    parser.add_argument(
+        "--matrix-format",
+        dest="matrix_format",
+        choices=["npz", "mmap"],
+        default=None,
+        help="format of the copied matrix files (default=same as in the remote inventory)",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -116,6 +134,7 @@ def main():
         strict=args.strict,
         fail_on_missing=not args.allow_missing,
         dry_run=args.dry_run,
+        matrix_format=args.matrix_format,
     )
 
     LOG.info("DONE")